@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Check whether many closeout anchors are reachable from an upstream ref in one pass.
+
+This answers `git merge-base --is-ancestor <anchor> <upstream>` for every anchor with a
+single walk from the upstream commit. The walk reads parents and generation numbers from
+the repository's commit-graph in-process, visits commits highest generation first, and
+stops once no unresolved anchor can still be below it. Repositories without a usable
+commit-graph share one streamed `git rev-list` walk across all anchors instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+from pathlib import Path
+import struct
+import subprocess
+import sys
+import tempfile
+from typing import Any
+import zlib
+
+from git_objects import GitRepository, GitUnsupported
+from git_sessions import GitSessionPool
+from read_delivery_contract import open_git_reader
+
+
+GENERATION_INFINITY = 1 << 32
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Check that delivery anchors are reachable from an upstream ref."
+    )
+    parser.add_argument(
+        "--repo",
+        type=Path,
+        default=Path.cwd(),
+        help="Git repository to inspect. Defaults to the current working directory.",
+    )
+    parser.add_argument(
+        "--upstream",
+        default="@{u}",
+        help="Ref the anchors must be reachable from. Defaults to @{u}.",
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Also read anchor revisions from stdin, one per line.",
+    )
+    parser.add_argument(
+        "--git-reader",
+        choices=("auto", "sessions"),
+        default="auto",
+        help=(
+            "How history is walked. auto uses the commit-graph in-process when present and "
+            "falls back to one git rev-list walk; sessions resolves anchors through git "
+            "cat-file sessions and always walks with git rev-list."
+        ),
+    )
+    parser.add_argument("anchors", nargs="*", metavar="ANCHOR", help="Anchor revisions to check.")
+    args = parser.parse_args()
+    if args.stdin:
+        args.anchors.extend(line.strip() for line in sys.stdin if line.strip())
+    if not args.anchors:
+        parser.error("at least one anchor revision is required")
+    return args
+
+
+def reachable_by_graph(
+    repository: GitRepository,
+    upstream_sha: str,
+    anchor_shas: set[str],
+) -> set[str]:
+    """Walk from `upstream_sha` highest generation first and return the anchors it reaches.
+
+    Commits newer than the commit-graph have no generation and are always walked; an
+    anchor without one disables the early stop, since nothing bounds how deep it sits.
+    """
+    if repository.commit_graph() is None:
+        raise GitUnsupported("repository has no commit-graph")
+    floors: dict[str, int] = {}
+    for sha in anchor_shas:
+        generation, _ = repository.commit_parents(sha)
+        floors[sha] = 0 if generation is None else generation
+    found: set[str] = set()
+    floor = min(floors.values())
+    seen = {upstream_sha}
+    heap: list[tuple[int, str, list[str]]] = []
+
+    def push(sha: str) -> None:
+        generation, parents = repository.commit_parents(sha)
+        key = GENERATION_INFINITY if generation is None else generation
+        heapq.heappush(heap, (-key, sha, parents))
+
+    push(upstream_sha)
+    while heap:
+        negative_generation, sha, parents = heapq.heappop(heap)
+        if -negative_generation < floor:
+            break
+        if sha in floors:
+            found.add(sha)
+            del floors[sha]
+            if not floors:
+                break
+            floor = min(floors.values())
+        for parent in parents:
+            if parent not in seen:
+                seen.add(parent)
+                push(parent)
+    return found
+
+
+def reachable_by_rev_list(repo: Path, upstream_sha: str, anchor_shas: set[str]) -> set[str]:
+    """Stream `git rev-list` from `upstream_sha` once, stopping when every anchor is seen.
+
+    stderr goes to a temporary file rather than a pipe, so git can never block on a full
+    stderr pipe while this loop is still waiting for stdout.
+    """
+    found: set[str] = set()
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            proc = subprocess.Popen(
+                ["git", "rev-list", upstream_sha, "--"],
+                cwd=repo,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+            )
+        except OSError as err:
+            raise ValueError(f"failed to run git in {repo}: {err}") from err
+        with proc:
+            for line in proc.stdout:
+                sha = line.decode("ascii").strip()
+                if sha in anchor_shas:
+                    found.add(sha)
+                    if len(found) == len(anchor_shas):
+                        proc.terminate()
+                        return found
+        if proc.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", "replace")
+            raise ValueError(stderr.strip() or "git command failed")
+    return found
+
+
+def anchor_result(
+    anchor: str,
+    *,
+    commit_sha: str | None,
+    upstream: str,
+    upstream_sha: str | None,
+) -> dict[str, Any]:
+    return {
+        "ok": False,
+        "anchor": anchor,
+        "commit_sha": commit_sha,
+        "upstream": upstream,
+        "upstream_sha": upstream_sha,
+        "reachable": None,
+        "method": None,
+        "errors": [],
+    }
+
+
+def check_anchors(args: argparse.Namespace, sessions: GitSessionPool) -> list[dict[str, Any]]:
+    """Return one result per anchor, in the order the anchors were given."""
+    try:
+        git = open_git_reader(args, sessions)
+    except ValueError as err:
+        results = []
+        for anchor in args.anchors:
+            result = anchor_result(
+                anchor, commit_sha=None, upstream=args.upstream, upstream_sha=None
+            )
+            result["errors"] = [str(err)]
+            results.append(result)
+        return results
+    with git:
+        try:
+            upstream_sha = git.resolve_commit(args.upstream)
+            upstream_error = None
+        except ValueError as err:
+            upstream_sha, upstream_error = None, str(err)
+        results = []
+        for anchor in args.anchors:
+            try:
+                commit_sha = git.resolve_commit(anchor)
+                errors = []
+            except ValueError as err:
+                commit_sha, errors = None, [str(err)]
+            result = anchor_result(
+                anchor, commit_sha=commit_sha, upstream=args.upstream, upstream_sha=upstream_sha
+            )
+            if upstream_error is not None:
+                errors.append(upstream_error)
+            result["errors"] = errors
+            results.append(result)
+        if upstream_sha is None:
+            return results
+        anchor_shas = {result["commit_sha"] for result in results if not result["errors"]}
+        if not anchor_shas:
+            return results
+        method = "rev-list"
+        found: set[str] | None = None
+        if git.native is not None:
+            try:
+                found = reachable_by_graph(git.native, upstream_sha, anchor_shas)
+                method = "commit-graph"
+            except (GitUnsupported, OSError, struct.error, zlib.error):
+                found = None
+        if found is None:
+            try:
+                found = reachable_by_rev_list(git.repo, upstream_sha, anchor_shas)
+            except ValueError as err:
+                for result in results:
+                    if not result["errors"]:
+                        result["errors"] = [str(err)]
+                return results
+    for result in results:
+        if result["errors"]:
+            continue
+        result["method"] = method
+        result["reachable"] = result["commit_sha"] in found
+        result["ok"] = result["reachable"]
+    return results
+
+
+def main() -> int:
+    args = parse_args()
+    with GitSessionPool() as sessions:
+        results = check_anchors(args, sessions)
+    for result in results:
+        sys.stdout.write(json.dumps(result, sort_keys=True))
+        sys.stdout.write("\n")
+    if any(result["errors"] for result in results):
+        return 2
+    return 0 if all(result["reachable"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""Read git refs and commit objects in-process, without spawning `git`.
+
+Covers the repository layouts the closeout helpers meet in practice: loose and packed refs,
+symbolic HEAD, linked worktrees, loose objects, version 2 pack indexes with their packs,
+including offset and ref deltas, and a single-file commit-graph. Anything else raises
+`GitUnsupported` so callers can fall back to the `git` binary, which also owns every
+user-facing error message.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from pathlib import Path
+import re
+import struct
+from typing import Iterator
+import zlib
+
+
+OBJECT_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+OFS_DELTA = 6
+REF_DELTA = 7
+IDX_MAGIC = b"\377tOc"
+PACK_MAGIC = b"PACK"
+GRAPH_MAGIC = b"CGPH"
+GRAPH_PARENT_NONE = 0x70000000
+GRAPH_EXTRA_EDGES = 0x80000000
+GRAPH_LAST_EDGE = 0x80000000
+GRAPH_GENERATION_MAX = 0x3FFFFFFF
+INFLATE_CHUNK_BYTES = 64 * 1024
+MAX_DELTA_CHAIN = 10000
+HEX_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+REV_RE = re.compile(r"^(?P<base>[^~^]+)(?P<ops>(?:[~^][0-9]*)*)$")
+REV_OP_RE = re.compile(r"([~^])([0-9]*)")
+PSEUDOREF_RE = re.compile(r"^[A-Z_]+$")
+REFNAME_CHARS_RE = re.compile(r"^[A-Za-z0-9._+/-]+$")
+# Any of these changes which object or ref git would answer with.
+UNSUPPORTED_ENV = (
+    "GIT_DIR",
+    "GIT_COMMON_DIR",
+    "GIT_OBJECT_DIRECTORY",
+    "GIT_ALTERNATE_OBJECT_DIRECTORIES",
+    "GIT_NAMESPACE",
+    "GIT_REPLACE_REF_BASE",
+    "GIT_CEILING_DIRECTORIES",
+    "GIT_DISCOVERY_ACROSS_FILESYSTEM",
+)
+UNSUPPORTED_CONFIG_RE = re.compile(
+    r"^\s*(?:objectformat\s*=\s*(?!sha1\s*$)|refstorage\s*=\s*(?!files\s*$))",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Refs git keeps per worktree instead of in the common directory.
+WORKTREE_REF_PREFIXES = ("refs/bisect/", "refs/worktree/", "refs/rewritten/")
+DWIM_REF_FORMATS = (
+    "refs/{}",
+    "refs/tags/{}",
+    "refs/heads/{}",
+    "refs/remotes/{}",
+    "refs/remotes/{}/HEAD",
+)
+
+
+class GitUnsupported(Exception):
+    """The in-process reader cannot answer; ask the `git` binary instead."""
+
+
+def read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    source_size, pos = read_varint(delta, 0)
+    target_size, pos = read_varint(delta, pos)
+    if source_size != len(base):
+        raise GitUnsupported("delta base size does not match")
+    out = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            offset = size = 0
+            for bit in range(4):
+                if opcode & (1 << bit):
+                    offset |= delta[pos] << (8 * bit)
+                    pos += 1
+            for bit in range(3):
+                if opcode & (0x10 << bit):
+                    size |= delta[pos] << (8 * bit)
+                    pos += 1
+            out += base[offset : offset + (size or 0x10000)]
+        elif opcode:
+            out += delta[pos : pos + opcode]
+            pos += opcode
+        else:
+            raise GitUnsupported("delta uses the reserved opcode 0")
+    if len(out) != target_size:
+        raise GitUnsupported("delta result size does not match")
+    return bytes(out)
+
+
+def commit_body_message(body: bytes) -> str:
+    """Return the message of a raw commit object as `git log --format=%B` prints it, stripped."""
+    headers, _, message = body.partition(b"\n\n")
+    for line in headers.split(b"\n"):
+        if line.startswith(b"encoding ") and line[9:].strip().lower() not in {b"utf-8", b"utf8"}:
+            raise GitUnsupported("commit message needs re-encoding")
+    try:
+        return message.decode("utf-8").strip()
+    except UnicodeDecodeError as err:
+        raise GitUnsupported("commit message is not UTF-8") from err
+
+
+def map_file(path: Path) -> mmap.mmap:
+    with path.open("rb") as handle:
+        try:
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as err:
+            raise GitUnsupported(f"{path.name} is empty") from err
+
+
+class PackIndex:
+    """A memory-mapped version 2 `.idx` file answering SHA -> pack offset lookups."""
+
+    def __init__(self, path: Path) -> None:
+        self.data = map_file(path)
+        if (
+            len(self.data) < 8 + 256 * 4
+            or self.data[:4] != IDX_MAGIC
+            or struct.unpack_from(">I", self.data, 4)[0] != 2
+        ):
+            self.data.close()
+            raise GitUnsupported(f"{path.name} is not a version 2 pack index")
+        self.fanout = struct.unpack_from(">256I", self.data, 8)
+        count = self.fanout[255]
+        self.names_at = 8 + 256 * 4
+        self.offsets_at = self.names_at + count * 24
+        self.large_offsets_at = self.offsets_at + count * 4
+
+    def find(self, sha: bytes) -> int | None:
+        low = self.fanout[sha[0] - 1] if sha[0] else 0
+        high = self.fanout[sha[0]]
+        data, names_at = self.data, self.names_at
+        while low < high:
+            middle = (low + high) // 2
+            start = names_at + middle * 20
+            name = data[start : start + 20]
+            if name < sha:
+                low = middle + 1
+            elif name > sha:
+                high = middle
+            else:
+                offset = struct.unpack_from(">I", data, self.offsets_at + middle * 4)[0]
+                if offset & 0x80000000:
+                    large_at = self.large_offsets_at + (offset & 0x7FFFFFFF) * 8
+                    offset = struct.unpack_from(">Q", data, large_at)[0]
+                return offset
+        return None
+
+    def close(self) -> None:
+        self.data.close()
+
+
+class Pack:
+    def __init__(self, index_path: Path) -> None:
+        self.index = PackIndex(index_path)
+        try:
+            self.data = map_file(index_path.with_suffix(".pack"))
+        except BaseException:
+            self.index.close()
+            raise
+        if self.data[:4] != PACK_MAGIC or struct.unpack_from(">I", self.data, 4)[0] not in {2, 3}:
+            self.close()
+            raise GitUnsupported(f"{index_path.stem}.pack has an unknown pack version")
+
+    def entry_header(self, offset: int) -> tuple[int, int, int]:
+        """Return an entry's type code, inflated size, and the offset just past its header."""
+        data = self.data
+        byte = data[offset]
+        kind = (byte >> 4) & 7
+        size = byte & 0x0F
+        shift = 4
+        pos = offset + 1
+        while byte & 0x80:
+            byte = data[pos]
+            pos += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+        return kind, size, pos
+
+    def inflate(self, pos: int, size: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        chunks: list[bytes] = []
+        while not decompressor.eof:
+            chunk = self.data[pos : pos + INFLATE_CHUNK_BYTES]
+            if not chunk:
+                raise GitUnsupported("pack entry is truncated")
+            chunks.append(decompressor.decompress(chunk))
+            pos += len(chunk)
+        inflated = b"".join(chunks)
+        if len(inflated) != size:
+            raise GitUnsupported("pack entry size does not match its header")
+        return inflated
+
+    def read(self, offset: int, repository: GitRepository) -> tuple[str, bytes]:
+        """Inflate the object at `offset`, resolving its delta chain without recursion."""
+        deltas: list[bytes] = []
+        while True:
+            if len(deltas) > MAX_DELTA_CHAIN:
+                raise GitUnsupported("pack delta chain is too long")
+            kind, size, pos = self.entry_header(offset)
+            if kind in OBJECT_TYPES:
+                object_type, body = OBJECT_TYPES[kind], self.inflate(pos, size)
+                break
+            if kind == OFS_DELTA:
+                byte = self.data[pos]
+                pos += 1
+                distance = byte & 0x7F
+                while byte & 0x80:
+                    byte = self.data[pos]
+                    pos += 1
+                    distance = ((distance + 1) << 7) | (byte & 0x7F)
+                deltas.append(self.inflate(pos, size))
+                offset -= distance
+                continue
+            if kind == REF_DELTA:
+                base_sha = bytes(self.data[pos : pos + 20])
+                deltas.append(self.inflate(pos + 20, size))
+                object_type, body = repository.read_object(base_sha.hex())
+                break
+            raise GitUnsupported(f"pack entry has unknown type {kind}")
+        for delta in reversed(deltas):
+            body = apply_delta(body, delta)
+        return object_type, body
+
+    def close(self) -> None:
+        self.index.close()
+        self.data.close()
+
+
+class CommitGraph:
+    """A memory-mapped `objects/info/commit-graph` answering parent and generation lookups.
+
+    Generations are the file's topological levels: a commit can only reach commits with a
+    strictly lower level, which is what lets a walk stop early.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.data = map_file(path)
+        try:
+            self.chunks = self.read_chunk_table(path)
+        except (GitUnsupported, struct.error):
+            self.data.close()
+            raise
+        self.fanout = struct.unpack_from(">256I", self.data, self.chunks[b"OIDF"])
+        self.names_at = self.chunks[b"OIDL"]
+        self.commits_at = self.chunks[b"CDAT"]
+        self.edges_at = self.chunks.get(b"EDGE")
+
+    def read_chunk_table(self, path: Path) -> dict[bytes, int]:
+        data = self.data
+        if data[:4] != GRAPH_MAGIC or data[4] != 1 or data[5] != 1:
+            raise GitUnsupported(f"{path.name} is not a version 1 SHA-1 commit-graph")
+        if data[7] != 0:
+            raise GitUnsupported(f"{path.name} is part of a split commit-graph chain")
+        chunks: dict[bytes, int] = {}
+        for index in range(data[6]):
+            chunk_id = bytes(data[8 + index * 12 : 12 + index * 12])
+            chunks[chunk_id] = struct.unpack_from(">Q", data, 12 + index * 12)[0]
+        if not {b"OIDF", b"OIDL", b"CDAT"} <= set(chunks):
+            raise GitUnsupported(f"{path.name} is missing a required chunk")
+        return chunks
+
+    def position(self, sha: str) -> int | None:
+        binary = bytes.fromhex(sha)
+        low = self.fanout[binary[0] - 1] if binary[0] else 0
+        high = self.fanout[binary[0]]
+        data, names_at = self.data, self.names_at
+        while low < high:
+            middle = (low + high) // 2
+            name = data[names_at + middle * 20 : names_at + middle * 20 + 20]
+            if name < binary:
+                low = middle + 1
+            elif name > binary:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def name(self, position: int) -> str:
+        start = self.names_at + position * 20
+        return self.data[start : start + 20].hex()
+
+    def commit(self, position: int) -> tuple[int | None, list[str]]:
+        """Return a commit's generation (None when the file does not record one) and parents."""
+        first, second, level = struct.unpack_from(
+            ">III", self.data, self.commits_at + position * 36 + 20
+        )
+        parents: list[int] = []
+        if first != GRAPH_PARENT_NONE:
+            parents.append(first)
+        if second & GRAPH_EXTRA_EDGES:
+            if self.edges_at is None:
+                raise GitUnsupported("commit-graph refers to a missing EDGE chunk")
+            edge_at = self.edges_at + (second & ~GRAPH_EXTRA_EDGES) * 4
+            while True:
+                edge = struct.unpack_from(">I", self.data, edge_at)[0]
+                parents.append(edge & ~GRAPH_LAST_EDGE)
+                if edge & GRAPH_LAST_EDGE:
+                    break
+                edge_at += 4
+        elif second != GRAPH_PARENT_NONE:
+            parents.append(second)
+        generation = level >> 2
+        # Level 0 predates generation numbers, and the maximum only means "at least this".
+        if generation == 0 or generation >= GRAPH_GENERATION_MAX:
+            return None, [self.name(parent) for parent in parents]
+        return generation, [self.name(parent) for parent in parents]
+
+    def close(self) -> None:
+        self.data.close()
+
+
+def find_git_dir(start: Path) -> Path:
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text(encoding="utf-8").strip()
+            if not content.startswith("gitdir: "):
+                raise GitUnsupported(".git file does not name a gitdir")
+            return (directory / content[len("gitdir: ") :]).resolve()
+        if (directory / "HEAD").is_file() and (directory / "objects").is_dir():
+            return directory
+    raise GitUnsupported(f"no git repository at or above {start}")
+
+
+class GitRepository:
+    """Resolve revisions and read objects from one repository's on-disk layout."""
+
+    def __init__(self, git_dir: Path) -> None:
+        self.git_dir = git_dir
+        common_file = git_dir / "commondir"
+        if common_file.is_file():
+            self.common_dir = (git_dir / common_file.read_text(encoding="utf-8").strip()).resolve()
+        else:
+            self.common_dir = git_dir
+        self.objects_dir = self.common_dir / "objects"
+        self.packs: list[Pack] | None = None
+        self.packed_refs: dict[str, str] | None = None
+        self.graph: CommitGraph | None = None
+        self.graph_loaded = False
+
+    def close(self) -> None:
+        for pack in self.packs or []:
+            pack.close()
+        self.packs = None
+        if self.graph is not None:
+            self.graph.close()
+        self.graph = None
+        self.graph_loaded = False
+
+    def __enter__(self) -> GitRepository:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def check_supported(self) -> None:
+        if any(os.environ.get(name) for name in UNSUPPORTED_ENV):
+            raise GitUnsupported("git environment overrides are set")
+        if self.git_dir.stat().st_uid != os.getuid():
+            # Leave safe.directory ownership rules to git.
+            raise GitUnsupported("repository is owned by another user")
+        try:
+            config = (self.common_dir / "config").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            config = ""
+        if UNSUPPORTED_CONFIG_RE.search(config):
+            raise GitUnsupported("repository uses a non-default object format or ref storage")
+        if (self.common_dir / "info" / "grafts").exists():
+            raise GitUnsupported("repository uses grafts")
+        if (self.common_dir / "refs" / "replace").is_dir() and any(
+            (self.common_dir / "refs" / "replace").iterdir()
+        ):
+            raise GitUnsupported("repository has replace refs")
+        if any(name.startswith("refs/replace/") for name in self.load_packed_refs()):
+            raise GitUnsupported("repository has replace refs")
+
+    def load_packed_refs(self) -> dict[str, str]:
+        if self.packed_refs is None:
+            refs: dict[str, str] = {}
+            try:
+                lines = (self.common_dir / "packed-refs").read_text(encoding="utf-8").splitlines()
+            except FileNotFoundError:
+                lines = []
+            for line in lines:
+                if not line or line.startswith(("#", "^")):
+                    continue
+                sha, _, name = line.partition(" ")
+                if not HEX_SHA_RE.match(sha):
+                    raise GitUnsupported("packed-refs has an unexpected line")
+                refs[name] = sha
+            self.packed_refs = refs
+        return self.packed_refs
+
+    def ref_path(self, name: str) -> Path:
+        if "/" not in name or name.startswith(WORKTREE_REF_PREFIXES):
+            return self.git_dir / name
+        return self.common_dir / name
+
+    def read_ref(self, name: str) -> str | None:
+        """Follow `name` through symbolic refs to an object SHA, or None when it is absent."""
+        for _ in range(10):
+            try:
+                content = self.ref_path(name).read_text(encoding="utf-8").strip()
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+                return self.load_packed_refs().get(name)
+            if content.startswith("ref: "):
+                name = content[len("ref: ") :]
+                continue
+            if not HEX_SHA_RE.match(content):
+                raise GitUnsupported(f"{name} does not hold a plain object id")
+            return content
+        raise GitUnsupported("symbolic refs nest too deeply")
+
+    def resolve_name(self, name: str) -> str:
+        if HEX_SHA_RE.match(name):
+            return name
+        # Plain ref names only; this also keeps lookups inside the refs namespace.
+        if (
+            not REFNAME_CHARS_RE.match(name)
+            or ".." in name
+            or name.endswith(".lock")
+            or any(not part or part.startswith(".") for part in name.split("/"))
+        ):
+            raise GitUnsupported(f"revision syntax {name!r} is not supported")
+        candidates = [name] if PSEUDOREF_RE.match(name) or name.startswith("refs/") else []
+        candidates.extend(template.format(name) for template in DWIM_REF_FORMATS)
+        for candidate in candidates:
+            sha = self.read_ref(candidate)
+            if sha is not None:
+                return sha
+        raise GitUnsupported(f"revision {name!r} is not a full SHA or known ref")
+
+    def rev_parse(self, rev: str) -> str:
+        """Resolve `rev` like `git rev-parse`: refs, full SHAs, and `~N`/`^N` suffixes."""
+        match = REV_RE.match(rev)
+        if match is None:
+            raise GitUnsupported(f"revision syntax {rev!r} is not supported")
+        sha = self.resolve_name(match["base"])
+        for operator, digits in REV_OP_RE.findall(match["ops"]):
+            count = int(digits) if digits else 1
+            sha = self.peel_to_commit(sha)
+            if operator == "~":
+                for _ in range(count):
+                    sha = self.parent(sha, 1)
+            elif count:
+                sha = self.parent(sha, count)
+        return sha
+
+    def parent(self, sha: str, number: int) -> str:
+        _, parents = self.commit_parents(sha)
+        if number > len(parents):
+            raise GitUnsupported(f"{sha} has no parent {number}")
+        return parents[number - 1]
+
+    def peel_to_commit(self, sha: str) -> str:
+        for _ in range(10):
+            object_type, body = self.read_object(sha)
+            if object_type == "commit":
+                return sha
+            if object_type != "tag" or not body.startswith(b"object "):
+                raise GitUnsupported(f"{sha} does not point at a commit")
+            sha = body[len(b"object ") : len(b"object ") + 40].decode("ascii")
+        raise GitUnsupported("tags nest too deeply")
+
+    def commit_headers(self, sha: str) -> list[bytes]:
+        _, body = self.read_object(sha)
+        headers, _, _ = body.partition(b"\n\n")
+        return headers.split(b"\n")
+
+    def commit_message(self, rev: str) -> str:
+        """Return the message `git log -1 --format=%B <rev>` prints, without trailing space."""
+        sha = self.peel_to_commit(self.rev_parse(rev))
+        _, body = self.read_object(sha)
+        return commit_body_message(body)
+
+    def commit_graph(self) -> CommitGraph | None:
+        """Return the repository's single-file commit-graph, or None when it has none."""
+        if not self.graph_loaded:
+            # git ignores the commit-graph in shallow clones.
+            if not (self.common_dir / "shallow").exists():
+                try:
+                    self.graph = CommitGraph(self.objects_dir / "info" / "commit-graph")
+                except FileNotFoundError:
+                    self.graph = None
+            self.graph_loaded = True
+        return self.graph
+
+    def commit_parents(self, sha: str) -> tuple[int | None, list[str]]:
+        """Return a commit's generation and parents, from the commit-graph when it has them."""
+        graph = self.commit_graph()
+        if graph is not None:
+            position = graph.position(sha)
+            if position is not None:
+                return graph.commit(position)
+        parents = [
+            line[len(b"parent ") :].decode("ascii")
+            for line in self.commit_headers(sha)
+            if line.startswith(b"parent ")
+        ]
+        return None, parents
+
+    def iter_packs(self) -> Iterator[Pack]:
+        if self.packs is None:
+            packs: list[Pack] = []
+            try:
+                for index_path in sorted((self.objects_dir / "pack").glob("pack-*.idx")):
+                    packs.append(Pack(index_path))
+            except BaseException as err:
+                # A partial pack set would silently miss objects; let the caller fall back.
+                for pack in packs:
+                    pack.close()
+                if isinstance(err, (OSError, ValueError, struct.error)):
+                    raise GitUnsupported(f"pack could not be opened: {err}") from err
+                raise
+            self.packs = packs
+        yield from self.packs
+
+    def read_object(self, sha: str) -> tuple[str, bytes]:
+        try:
+            return self.read_loose(sha) or self.read_packed(sha)
+        except (IndexError, struct.error, zlib.error, ValueError) as err:
+            raise GitUnsupported(f"object {sha} could not be decoded: {err}") from err
+
+    def read_loose(self, sha: str) -> tuple[str, bytes] | None:
+        try:
+            raw = (self.objects_dir / sha[:2] / sha[2:]).read_bytes()
+        except FileNotFoundError:
+            return None
+        inflated = zlib.decompress(raw)
+        header, _, body = inflated.partition(b"\0")
+        object_type, _, size = header.decode("ascii").partition(" ")
+        if int(size) != len(body):
+            raise GitUnsupported(f"loose object {sha} has the wrong size")
+        return object_type, body
+
+    def read_packed(self, sha: str) -> tuple[str, bytes]:
+        binary = bytes.fromhex(sha)
+        for pack in self.iter_packs():
+            offset = pack.index.find(binary)
+            if offset is not None:
+                return pack.read(offset, self)
+        # Alternates, promisor remotes, and missing objects are all left to git.
+        raise GitUnsupported(f"object {sha} is not in a local pack or loose object")
+
+
+def open_repository(path: Path) -> GitRepository:
+    """Open the repository containing `path`, or raise `GitUnsupported`."""
+    repository = GitRepository(find_git_dir(path.resolve()))
+    try:
+        repository.check_supported()
+    except BaseException:
+        repository.close()
+        raise
+    return repository
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Long-lived `git cat-file` sessions shared across many object and revision lookups.
+
+A session keeps one `git cat-file --batch` or `--batch-check` process open per repository
+and answers each lookup over its pipes, so a batch of queries costs one process instead of
+one per query. `GitSessionPool` bounds how many sessions stay alive and closes them all on
+exit.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+import subprocess
+import threading
+
+
+BATCH = "--batch"
+BATCH_CHECK = "--batch-check"
+DEFAULT_MAX_SESSIONS = 4
+SHUTDOWN_TIMEOUT_SECONDS = 2.0
+
+
+class GitSessionError(Exception):
+    """The session cannot answer; callers fall back to a one-shot `git` command."""
+
+
+class CatFileSession:
+    """One `git cat-file` process whose requests and responses are paired under a lock."""
+
+    def __init__(self, repo: Path, mode: str) -> None:
+        self.mode = mode
+        try:
+            self.proc = subprocess.Popen(
+                ["git", "cat-file", mode],
+                cwd=repo,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as err:
+            raise GitSessionError(f"failed to start git cat-file in {repo}: {err}") from err
+        self.lock = threading.Lock()
+
+    def query(self, name: str) -> tuple[str, str, bytes | None] | None:
+        """Return the object's SHA, type, and (for `--batch`) contents, or None when missing."""
+        if "\n" in name or not name:
+            raise GitSessionError("object names must be a single non-empty line")
+        with self.lock:
+            try:
+                self.proc.stdin.write(f"{name}\n".encode("utf-8"))
+                self.proc.stdin.flush()
+                header = self.proc.stdout.readline()
+                if not header:
+                    raise GitSessionError("git cat-file exited")
+                # Unknown names echo back as "<name> missing", and may contain spaces.
+                if header.endswith((b" missing\n", b" ambiguous\n")):
+                    return None
+                sha, object_type, size = header.decode("ascii").split()
+                body = None
+                if self.mode == BATCH:
+                    body = self.proc.stdout.read(int(size))
+                    if len(body) != int(size) or self.proc.stdout.read(1) != b"\n":
+                        raise GitSessionError("git cat-file output was truncated")
+            except (OSError, ValueError) as err:
+                raise GitSessionError(f"git cat-file session failed: {err}") from err
+        return sha, object_type, body
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=SHUTDOWN_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc.stdout.close()
+
+
+class GitSessionPool:
+    """At most `max_sessions` live sessions keyed by repository and mode, evicted LRU."""
+
+    def __init__(self, *, max_sessions: int = DEFAULT_MAX_SESSIONS) -> None:
+        self.max_sessions = max_sessions
+        self.sessions: OrderedDict[tuple[Path, str], CatFileSession] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __enter__(self) -> GitSessionPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def session(self, repo: Path, mode: str) -> CatFileSession:
+        key = (repo.resolve(), mode)
+        evicted: list[CatFileSession] = []
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is not None and session.proc.poll() is None:
+                self.sessions.move_to_end(key)
+                return session
+            if session is not None:
+                evicted.append(self.sessions.pop(key))
+            session = CatFileSession(key[0], mode)
+            self.sessions[key] = session
+            while len(self.sessions) > self.max_sessions:
+                evicted.append(self.sessions.popitem(last=False)[1])
+        for stale in evicted:
+            stale.close()
+        return session
+
+    def rev_parse(self, repo: Path, rev: str) -> str | None:
+        """Resolve `rev` to the object it names, like `git rev-parse`, or None when unknown.
+
+        This asks the `--batch` session that `read_object` uses, so a read that resolves a
+        revision and then loads its commit keeps a single process per repository.
+        """
+        found = self.session(repo, BATCH).query(rev)
+        return None if found is None else found[0]
+
+    def read_object(self, repo: Path, name: str) -> tuple[str, bytes] | None:
+        found = self.session(repo, BATCH).query(name)
+        if found is None or found[2] is None:
+            return None
+        return found[1], found[2]
+
+    def close(self) -> None:
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
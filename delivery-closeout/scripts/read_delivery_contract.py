@@ -1,19 +1,44 @@
 #!/usr/bin/env python3
-"""Read and validate a delivery/1 contract from git, stdin, or a file."""
+"""Read and validate a delivery/1 contract from git, stdin, or a file.
+
+`--range A..B` validates the contract of every commit in a range and prints one JSON line
+per commit. Results read from git are cached by commit SHA, since a commit's message can
+never change. Single-revision reads and range walks resolve refs and read commits in-process
+through `git_objects.py`; anything it does not support goes through one shared
+`git cat-file --batch` session from `git_sessions.py`, and only errors reach a one-shot
+`git`.
+"""
 
 from __future__ import annotations
 
 import argparse
+from dataclasses import dataclass
+import hashlib
+import heapq
 import json
+import os
 from pathlib import Path
 import re
 import subprocess
 import sys
-from typing import Any
+import tempfile
+from typing import Any, Callable, Iterable, Iterator
+import zlib
+
+from git_objects import GitRepository, GitUnsupported, commit_body_message, open_repository
+from git_sessions import GitSessionError, GitSessionPool
 
 
 LINEAR_REF_RE = re.compile(r"^[A-Z][A-Z0-9]*-\d+$")
 GITHUB_REPO_RE = re.compile(r"^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$")
+GIT_LOG_CHUNK_BYTES = 64 * 1024
+# Extra commits a range walk reads past the point where only excluded commits remain,
+# matching git's allowance for commits whose dates are out of order.
+RANGE_WALK_SLOP = 5
+FULL_SHA_RE = re.compile(r"^(?:[0-9a-f]{40}|[0-9a-f]{64})$")
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+CACHE_ENTRY_SUFFIX = ".json"
+SOURCE_FIELDS = ("commit_sha", "contract_source", "contract_rev", "contract_file")
 TOP_LEVEL_KEYS = {
     "schema",
     "type",
@@ -41,10 +66,9 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--rev",
-        default="HEAD",
         help=(
             "Git revision whose commit message carries the contract when not using "
-            "--stdin or --contract-file. Defaults to HEAD."
+            "--stdin, --contract-file, or --range. Defaults to HEAD."
         ),
     )
     source_group = parser.add_mutually_exclusive_group()
@@ -58,6 +82,29 @@ def parse_args() -> argparse.Namespace:
         type=Path,
         help="Read the delivery/1 contract from a file instead of git log.",
     )
+    source_group.add_argument(
+        "--range",
+        metavar="A..B",
+        help=(
+            "Validate the contract of every commit in this git revision range and emit one "
+            "JSON line per commit, each anchored at its own commit."
+        ),
+    )
+    parser.add_argument(
+        "--git-reader",
+        choices=("auto", "sessions"),
+        default="auto",
+        help=(
+            "How revisions and ranges are read. auto reads refs and objects in-process and "
+            "falls back to one git cat-file --batch session for anything unsupported; "
+            "sessions always uses the cat-file session."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the commit-SHA keyed cache of validated contracts read from git.",
+    )
     parser.add_argument(
         "--anchor-rev",
         help=(
@@ -65,7 +112,14 @@ def parse_args() -> argparse.Namespace:
             "when reading from git. Required for --stdin/--contract-file."
         ),
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.range is not None:
+        if args.rev is not None:
+            parser.error("--rev cannot be combined with --range")
+        if args.anchor_rev is not None:
+            parser.error("--anchor-rev cannot be combined with --range")
+    args.rev = args.rev or "HEAD"
+    return args
 
 
 def run_git(repo: Path, *args: str) -> str:
@@ -93,20 +147,359 @@ def resolve_repo(repo_arg: Path) -> Path:
     return repo
 
 
-def resolve_commit_sha(repo: Path, rev: str) -> str:
-    return run_git(repo, "rev-parse", rev)
+class GitReader:
+    """Answer rev-parse and commit-message queries with the cheapest reader that can.
+
+    Queries try the in-process object reader, then a pooled `git cat-file` session, and
+    finally a one-shot `git` command, whose message is what every error reports.
+    """
+
+    def __init__(self, repo: Path, *, native: bool, sessions: GitSessionPool | None) -> None:
+        self.repo = repo
+        self.sessions = sessions
+        self.native: GitRepository | None = None
+        if native:
+            try:
+                self.native = open_repository(repo)
+            except (GitUnsupported, OSError):
+                self.native = None
+
+    def __enter__(self) -> GitReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self.native is not None:
+            self.native.close()
+
+    def rev_parse(self, rev: str) -> str:
+        if self.native is not None:
+            try:
+                return self.native.rev_parse(rev)
+            except (GitUnsupported, OSError, zlib.error):
+                pass
+        if self.sessions is not None and not rev.startswith("-"):
+            try:
+                sha = self.sessions.rev_parse(self.repo, rev)
+            except GitSessionError:
+                sha = None
+            if sha is not None:
+                return sha
+        return run_git(self.repo, "rev-parse", rev)
+
+    def verify_commit(self, sha: str) -> str:
+        """Return `sha` when it names a commit, or a tag of one, present in this repository."""
+        if self.native is not None:
+            try:
+                self.native.peel_to_commit(sha)
+                return sha
+            except (GitUnsupported, OSError, zlib.error):
+                pass
+        if self.sessions is not None:
+            try:
+                found = self.sessions.rev_parse(self.repo, f"{sha}^{{commit}}")
+            except GitSessionError:
+                found = None
+            if found is not None:
+                return sha
+        run_git(self.repo, "rev-parse", "--verify", f"{sha}^{{commit}}")
+        return sha
+
+    def resolve_commit(self, rev: str) -> str:
+        """Resolve `rev` to the commit it names, peeling tags like `<rev>^{commit}`."""
+        if self.native is not None:
+            try:
+                return self.native.peel_to_commit(self.native.rev_parse(rev))
+            except (GitUnsupported, OSError, zlib.error):
+                pass
+        return self.rev_parse(f"{rev}^{{commit}}")
+
+    def read_commit(self, sha: str) -> bytes | None:
+        """Return the raw commit object `sha`, or None when neither reader can load it."""
+        if self.native is not None:
+            try:
+                object_type, body = self.native.read_object(sha)
+                if object_type == "commit":
+                    return body
+            except (GitUnsupported, OSError, zlib.error):
+                pass
+        if self.sessions is not None:
+            try:
+                found = self.sessions.read_object(self.repo, sha)
+            except GitSessionError:
+                found = None
+            if found is not None and found[0] == "commit":
+                return found[1]
+        return None
+
+    def commit_message(self, rev: str) -> str:
+        if self.native is not None:
+            try:
+                return self.native.commit_message(rev)
+            except (GitUnsupported, OSError, zlib.error):
+                pass
+        if self.sessions is not None and not rev.startswith("-"):
+            try:
+                found = self.sessions.read_object(self.repo, f"{rev}^{{commit}}")
+                if found is not None:
+                    return commit_body_message(found[1])
+            except (GitSessionError, GitUnsupported):
+                pass
+        return run_git(self.repo, "log", "-1", "--format=%B", rev)
+
+
+def open_git_reader(args: argparse.Namespace, sessions: GitSessionPool | None) -> GitReader:
+    return GitReader(
+        resolve_repo(args.repo),
+        native=args.git_reader == "auto",
+        sessions=sessions,
+    )
+
+
+class RangeWalkUnsupported(Exception):
+    """The range cannot be walked through the object readers; `git log` reads it instead."""
+
+
+def commit_date_and_parents(body: bytes) -> tuple[int, list[str]]:
+    headers, _, _ = body.partition(b"\n\n")
+    commit_date = 0
+    parents: list[str] = []
+    for line in headers.split(b"\n"):
+        if line.startswith(b"parent "):
+            parents.append(line[len(b"parent ") :].decode("ascii"))
+        elif line.startswith(b"committer "):
+            commit_date = int(line.rsplit(b" ", 2)[1])
+    return commit_date, parents
+
+
+def walk_range_messages(git: GitReader, commit_range: str) -> list[tuple[str, str]]:
+    """Return each commit's SHA and message in `A..B`, in the order `git log` prints them.
+
+    This replays git's limited revision walk: commits are visited newest commit date first,
+    ties in the order they were found, and exclusion spreads from `A` to every ancestor
+    reached. The walk ends once only excluded commits remain, after the same slop git
+    allows, so each commit is read through `git` once.
+    """
+    base, separator, tip = commit_range.partition("..")
+    if not separator or tip.startswith(".") or ".." in tip:
+        raise RangeWalkUnsupported(f"{commit_range!r} is not an A..B range")
+    try:
+        starts = [
+            (git.resolve_commit(base or "HEAD"), True),
+            (git.resolve_commit(tip or "HEAD"), False),
+        ]
+    except ValueError as err:
+        raise RangeWalkUnsupported(str(err)) from err
+
+    commits: dict[str, tuple[int, list[str], bytes]] = {}
+    excluded: set[str] = set()
+    queue: list[tuple[int, int, str]] = []
+
+    def exclude(sha: str) -> None:
+        pending = [sha]
+        while pending:
+            current = pending.pop()
+            if current in excluded:
+                continue
+            excluded.add(current)
+            if current in commits:
+                pending.extend(commits[current][1])
+
+    def visit(sha: str) -> None:
+        if sha in commits:
+            return
+        body = git.read_commit(sha)
+        if body is None:
+            raise RangeWalkUnsupported(f"commit {sha} could not be read")
+        commit_date, parents = commit_date_and_parents(body)
+        commits[sha] = (commit_date, parents, body)
+        heapq.heappush(queue, (-commit_date, len(commits), sha))
+
+    for sha, is_excluded in starts:
+        visit(sha)
+        if is_excluded:
+            exclude(sha)
+    order: list[str] = []
+    last_date: int | None = None
+    slop = RANGE_WALK_SLOP
+    while queue:
+        commit_date, _, sha = heapq.heappop(queue)
+        commit_date = -commit_date
+        parents = commits[sha][1]
+        for parent in parents:
+            if sha in excluded:
+                exclude(parent)
+            visit(parent)
+        if sha in excluded:
+            if not queue:
+                break
+            if (last_date is not None and last_date <= -queue[0][0]) or any(
+                queued not in excluded for _, _, queued in queue
+            ):
+                slop = RANGE_WALK_SLOP
+            else:
+                slop -= 1
+                if not slop:
+                    break
+            continue
+        last_date = commit_date
+        order.append(sha)
+    try:
+        return [
+            (sha, commit_body_message(commits[sha][2])) for sha in order if sha not in excluded
+        ]
+    except GitUnsupported as err:
+        raise RangeWalkUnsupported(str(err)) from err
+
+
+def iter_range_messages(repo: Path, commit_range: str) -> Iterator[tuple[str, str]]:
+    """Yield each commit's SHA and message in `commit_range` from one `git log` pipe.
+
+    With `-z` every commit is written as its SHA and message, each terminated by a NUL, so
+    complete pairs are yielded as soon as they arrive instead of after the walk finishes.
+    stderr goes to a temporary file, so git cannot block on it while stdout is being read.
+    """
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            proc = subprocess.Popen(
+                ["git", "log", "-z", "--format=%H%x00%B", commit_range, "--"],
+                cwd=repo,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+            )
+        except OSError as err:
+            raise ValueError(f"failed to run git in {repo}: {err}") from err
+        with proc:
+            pending = b""
+            fields: list[bytes] = []
+            for chunk in iter(lambda: proc.stdout.read(GIT_LOG_CHUNK_BYTES), b""):
+                *complete, pending = (pending + chunk).split(b"\0")
+                fields.extend(complete)
+                for index in range(0, len(fields) - 1, 2):
+                    yield (
+                        fields[index].decode("ascii"),
+                        fields[index + 1].decode("utf-8", "replace"),
+                    )
+                del fields[: len(fields) - len(fields) % 2]
+        if proc.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", "replace")
+            raise ValueError(stderr.strip() or "git command failed")
+
+
+def default_cache_dir() -> Path:
+    override = os.environ.get("DELIVERY_CONTRACT_CACHE_DIR")
+    if override:
+        return Path(override)
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    base = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return base / "delivery-contract"
+
+
+_VALIDATOR_VERSION: str | None = None
+
+
+def validator_version() -> str:
+    # The reader source is part of the key so cached results never outlive a rule change.
+    global _VALIDATOR_VERSION
+    if _VALIDATOR_VERSION is None:
+        _VALIDATOR_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    return _VALIDATOR_VERSION
+
+
+@dataclass(frozen=True)
+class ResultCache:
+    """Validated results keyed by commit SHA, which never needs invalidation.
+
+    A commit's message is fixed by its SHA, so an entry stays correct for as long as the
+    validator is unchanged; only the size bound ever removes entries.
+    """
+
+    root: Path
+    max_bytes: int = CACHE_MAX_BYTES
+
+    def entry_path(self, sha: str) -> Path:
+        digest = hashlib.sha256(f"{validator_version()}\0{sha}".encode("ascii")).hexdigest()
+        return self.root / f"{digest}{CACHE_ENTRY_SUFFIX}"
+
+    def load(self, sha: str) -> dict[str, Any] | None:
+        path = self.entry_path(sha)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        expected_keys = set(empty_result(**dict.fromkeys(SOURCE_FIELDS))) - set(SOURCE_FIELDS)
+        if not isinstance(payload, dict) or set(payload) != expected_keys:
+            return None
+        return payload
+
+    def store(self, sha: str, result: dict[str, Any]) -> None:
+        payload = {key: value for key, value in result.items() if key not in SOURCE_FIELDS}
+        path = self.entry_path(sha)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        entries: list[tuple[float, int, str]] = []
+        total = 0
+        try:
+            with os.scandir(self.root) as scan:
+                for entry in scan:
+                    if not entry.name.endswith(CACHE_ENTRY_SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return
+        # Hits refresh mtime, so the oldest mtime is the least recently used entry.
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                return
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def open_result_cache(*, enabled: bool) -> ResultCache | None:
+    if not enabled:
+        return None
+    max_bytes = CACHE_MAX_BYTES
+    override = os.environ.get("DELIVERY_CONTRACT_CACHE_MAX_BYTES")
+    if override:
+        try:
+            max_bytes = max(0, int(override))
+        except ValueError:
+            pass
+    return ResultCache(root=default_cache_dir(), max_bytes=max_bytes)
 
 
 def read_contract_text(
     args: argparse.Namespace,
+    sessions: GitSessionPool | None = None,
 ) -> tuple[str | None, str | None, str | None, str | None, str]:
-    repo: Path | None = None
+    """Read an explicitly supplied contract; git-hosted contracts go through `build_git_result`."""
     if args.stdin:
         contract_source = "stdin"
         contract_rev = None
         contract_file = None
         raw_text = sys.stdin.read()
-    elif args.contract_file is not None:
+    else:
         contract_source = "file"
         contract_rev = None
         contract_path = args.contract_file.expanduser().resolve()
@@ -121,27 +514,14 @@ def read_contract_text(
             raise ValueError(
                 f"failed to read delivery contract file {contract_path}: {err}"
             ) from err
-    else:
-        contract_source = "git"
-        contract_rev = args.rev
-        contract_file = None
-        repo = resolve_repo(args.repo)
-        raw_text = run_git(repo, "log", "-1", "--format=%B", args.rev)
 
-    anchor_rev = args.anchor_rev
-    if anchor_rev is None and contract_source in {"stdin", "file"}:
+    if args.anchor_rev is None:
         raise ValueError(
             "anchor rev is required when reading a delivery/1 contract from stdin "
             "or --contract-file"
         )
-    if anchor_rev is None and contract_source == "git":
-        anchor_rev = args.rev
-    commit_sha = None
-    if anchor_rev is not None:
-        if repo is None:
-            repo = resolve_repo(args.repo)
-        commit_sha = resolve_commit_sha(repo, anchor_rev)
-
+    with open_git_reader(args, sessions) as git:
+        commit_sha = git.rev_parse(args.anchor_rev)
     return commit_sha, contract_source, contract_rev, contract_file, raw_text
 
 
@@ -319,7 +699,11 @@ def empty_result(
     }
 
 
-def build_result(args: argparse.Namespace) -> tuple[dict[str, Any], int]:
+def build_result(
+    args: argparse.Namespace,
+    cache: ResultCache | None = None,
+    sessions: GitSessionPool | None = None,
+) -> tuple[dict[str, Any], int]:
     result = empty_result(
         commit_sha=None,
         contract_source=None,
@@ -327,13 +711,83 @@ def build_result(args: argparse.Namespace) -> tuple[dict[str, Any], int]:
         contract_file=None,
     )
     try:
+        if not args.stdin and args.contract_file is None:
+            return build_git_result(args, cache, sessions)
         commit_sha, contract_source, contract_rev, contract_file, raw_message = (
-            read_contract_text(args)
+            read_contract_text(args, sessions)
         )
     except ValueError as err:
         result["errors"] = [str(err)]
         return result, 2
 
+    return result_for_message(
+        raw_message,
+        commit_sha=commit_sha,
+        contract_source=contract_source,
+        contract_rev=contract_rev,
+        contract_file=contract_file,
+    )
+
+
+def build_git_result(
+    args: argparse.Namespace,
+    cache: ResultCache | None,
+    sessions: GitSessionPool | None = None,
+) -> tuple[dict[str, Any], int]:
+    """Read the contract on `--rev`, skipping the message read for cached revisions."""
+    with open_git_reader(args, sessions) as git:
+        # The cache is shared across repositories, so even a full SHA must exist here.
+        if FULL_SHA_RE.match(args.rev):
+            message_sha = git.verify_commit(args.rev)
+        else:
+            message_sha = git.rev_parse(args.rev)
+        anchor_rev = args.anchor_rev if args.anchor_rev is not None else args.rev
+        commit_sha = message_sha if anchor_rev == args.rev else git.rev_parse(anchor_rev)
+        return cached_result_for_commit(
+            message_sha,
+            lambda: git.commit_message(message_sha),
+            cache=cache,
+            commit_sha=commit_sha,
+            contract_source="git",
+            contract_rev=args.rev,
+            contract_file=None,
+        )
+
+
+def cached_result_for_commit(
+    message_sha: str,
+    read_message: Callable[[], str],
+    *,
+    cache: ResultCache | None,
+    commit_sha: str | None,
+    contract_source: str | None,
+    contract_rev: str | None,
+    contract_file: str | None,
+) -> tuple[dict[str, Any], int]:
+    source = {
+        "commit_sha": commit_sha,
+        "contract_source": contract_source,
+        "contract_rev": contract_rev,
+        "contract_file": contract_file,
+    }
+    if cache is not None:
+        cached = cache.load(message_sha)
+        if cached is not None:
+            return {**cached, **source}, 0 if cached["ok"] else 2
+    result, exit_code = result_for_message(read_message(), **source)
+    if cache is not None:
+        cache.store(message_sha, result)
+    return result, exit_code
+
+
+def result_for_message(
+    raw_message: str,
+    *,
+    commit_sha: str | None,
+    contract_source: str | None,
+    contract_rev: str | None,
+    contract_file: str | None,
+) -> tuple[dict[str, Any], int]:
     payload, errors = load_contract(raw_message)
     result = empty_result(
         commit_sha=commit_sha,
@@ -372,9 +826,63 @@ def build_result(args: argparse.Namespace) -> tuple[dict[str, Any], int]:
     return result, 0
 
 
+def iter_range_results(
+    args: argparse.Namespace,
+    cache: ResultCache | None,
+    sessions: GitSessionPool | None = None,
+) -> Iterator[tuple[dict[str, Any], int]]:
+    """Yield a `build_result` payload per commit in `--range`, then one for any git failure.
+
+    The range is walked through the same readers as a single revision; only a range they
+    cannot walk, or one that fails, is read from a `git log` pipe instead.
+    """
+    try:
+        with open_git_reader(args, sessions) as git:
+            try:
+                messages: Iterable[tuple[str, str]] = walk_range_messages(git, args.range)
+            except RangeWalkUnsupported:
+                messages = iter_range_messages(git.repo, args.range)
+            for commit_sha, raw_message in messages:
+                yield cached_result_for_commit(
+                    commit_sha,
+                    lambda: raw_message,
+                    cache=cache,
+                    commit_sha=commit_sha,
+                    contract_source="git",
+                    contract_rev=commit_sha,
+                    contract_file=None,
+                )
+    except ValueError as err:
+        result = empty_result(
+            commit_sha=None,
+            contract_source="git",
+            contract_rev=args.range,
+            contract_file=None,
+        )
+        result["errors"] = [str(err)]
+        yield result, 2
+
+
+def run_range(
+    args: argparse.Namespace,
+    cache: ResultCache | None,
+    sessions: GitSessionPool | None = None,
+) -> int:
+    exit_code = 0
+    for payload, result_exit_code in iter_range_results(args, cache, sessions):
+        sys.stdout.write(json.dumps(payload, sort_keys=True))
+        sys.stdout.write("\n")
+        exit_code = max(exit_code, result_exit_code)
+    return exit_code
+
+
 def main() -> int:
     args = parse_args()
-    payload, exit_code = build_result(args)
+    cache = open_result_cache(enabled=not args.no_cache)
+    with GitSessionPool() as sessions:
+        if args.range is not None:
+            return run_range(args, cache, sessions)
+        payload, exit_code = build_result(args, cache, sessions)
     json.dump(payload, sys.stdout, indent=2, sort_keys=True)
     sys.stdout.write("\n")
     return exit_code
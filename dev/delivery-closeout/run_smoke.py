@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
+import shutil
 import subprocess
 import tempfile
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 READER = REPO_ROOT / "delivery-closeout" / "scripts" / "read_delivery_contract.py"
+REACHABILITY = REPO_ROOT / "delivery-closeout" / "scripts" / "check_anchor_reachability.py"
 GENERATOR = (
     REPO_ROOT / "delivery-prepare" / "scripts" / "build_delivery_contract.py"
 )
@@ -83,6 +86,8 @@ def build_contract(refs: object, *, schema: str = "delivery/1", delivery_mode: s
 def main() -> None:
     with tempfile.TemporaryDirectory(prefix="delivery-closeout-smoke-") as tmp_dir:
         temp_root = Path(tmp_dir)
+        cache_dir = temp_root / "delivery-cache"
+        os.environ["DELIVERY_CONTRACT_CACHE_DIR"] = str(cache_dir)
 
         repo_ok = temp_root / "repo-ok"
         repo_ok.mkdir()
@@ -661,6 +666,412 @@ def main() -> None:
         )
         print("OK: missing repo returns structured JSON")
 
+        repo_range = temp_root / "repo-range"
+        repo_range.mkdir()
+        init_repo(repo_range)
+        range_base = commit_message(repo_range, "base commit before the audited range")
+        range_shas = [
+            commit_message(
+                repo_range,
+                build_contract(refs=[{"system": "linear", "id": "PUB-582", "role": "authority"}]),
+            ),
+            commit_message(repo_range, "not a delivery contract\n\nwith a body"),
+            commit_message(repo_range, build_contract(refs=[], delivery_mode="status-only")),
+        ]
+        range_proc = run(
+            ["python3", str(READER), "--repo", str(repo_range), "--range", f"{range_base}..HEAD"],
+            cwd=REPO_ROOT,
+            check=False,
+        )
+        assert_equal(range_proc.returncode, 2, "a range with an invalid commit should fail")
+        range_payloads = [json.loads(line) for line in range_proc.stdout.splitlines()]
+        assert_equal(
+            [payload["commit_sha"] for payload in range_payloads],
+            list(reversed(range_shas)),
+            "range mode should emit one line per commit, newest first",
+        )
+        for payload in range_payloads:
+            single_proc = run(
+                ["python3", str(READER), "--repo", str(repo_range), "--rev", payload["commit_sha"]],
+                cwd=REPO_ROOT,
+                check=False,
+            )
+            assert_equal(
+                payload,
+                json.loads(single_proc.stdout),
+                f"range result for {payload['commit_sha']} should match a single-rev read",
+            )
+        assert_equal(
+            [payload["ok"] for payload in range_payloads],
+            [True, False, True],
+            "range results should validate each commit independently",
+        )
+        bad_range_proc = run(
+            ["python3", str(READER), "--repo", str(repo_range), "--range", "missing..HEAD"],
+            cwd=REPO_ROOT,
+            check=False,
+        )
+        assert_equal(bad_range_proc.returncode, 2, "a bad range should fail")
+        bad_range_payload = json.loads(bad_range_proc.stdout)
+        assert_true(
+            bad_range_payload["errors"] and "missing..HEAD" in bad_range_payload["errors"][0],
+            "a bad range should report the git error",
+        )
+        print("OK: --range reads every commit in the range and matches single-rev reads")
+
+        repo_empty = temp_root / "repo-empty"
+        repo_empty.mkdir()
+        init_repo(repo_empty)
+        cached_cmd = ["python3", str(READER), "--repo", str(repo_ok), "--rev", commit_sha]
+        cache_entries = sorted(cache_dir.glob("*.json"))
+        for entry in cache_entries:
+            marked = json.loads(entry.read_text(encoding="utf-8"))
+            entry.write_text(json.dumps({**marked, "delivery_mode": "cached"}), encoding="utf-8")
+        assert_equal(
+            json.loads(run(cached_cmd, cwd=REPO_ROOT).stdout),
+            {**ok_payload, "contract_rev": commit_sha, "delivery_mode": "cached"},
+            "a cached full SHA should be answered from the cache",
+        )
+        assert_equal(
+            json.loads(run([*cached_cmd, "--no-cache"], cwd=REPO_ROOT).stdout),
+            {**ok_payload, "contract_rev": commit_sha},
+            "--no-cache should read the commit from git",
+        )
+        foreign_proc = run(
+            ["python3", str(READER), "--repo", str(repo_empty), "--rev", commit_sha],
+            cwd=REPO_ROOT,
+            check=False,
+        )
+        assert_equal(foreign_proc.returncode, 2, "a full SHA missing from the repo should fail")
+        foreign_payload = json.loads(foreign_proc.stdout)
+        assert_true(
+            not foreign_payload["ok"] and foreign_payload["errors"],
+            "a cache entry from another repository should not vouch for a missing commit",
+        )
+        assert_true(cache_entries, "git reads should populate the cache")
+        assert_true(
+            all("contract_source" not in json.loads(entry.read_text()) for entry in cache_entries),
+            "cache entries should drop the per-read source fields",
+        )
+        for entry in cache_entries:
+            entry.write_text("{not json", encoding="utf-8")
+        assert_equal(
+            json.loads(run(["python3", str(READER), "--repo", str(repo_ok)], cwd=REPO_ROOT).stdout),
+            ok_payload,
+            "corrupt cache entries should be ignored and rewritten",
+        )
+        commit_message(repo_empty, build_contract(refs=[]))
+        os.environ["DELIVERY_CONTRACT_CACHE_MAX_BYTES"] = "0"
+        try:
+            run(["python3", str(READER), "--repo", str(repo_empty)], cwd=REPO_ROOT)
+        finally:
+            del os.environ["DELIVERY_CONTRACT_CACHE_MAX_BYTES"]
+        assert_equal(list(cache_dir.glob("*.json")), [], "a zero size bound should evict everything")
+        print("OK: git reads are cached by commit SHA, verified against the repo, and stay bounded")
+
+        repo_native = temp_root / "repo-native"
+        repo_native.mkdir()
+        init_repo(repo_native)
+        for index in range(6):
+            commit_message(
+                repo_native,
+                build_contract(
+                    refs=[{"system": "linear", "id": f"PUB-{600 + index}", "role": "authority"}]
+                ),
+            )
+        run(["git", "tag", "-a", "release", "-m", "release", "HEAD~2"], cwd=repo_native)
+        git_log = temp_root / "git-calls.log"
+        shim_dir = temp_root / "git-shim"
+        shim_dir.mkdir()
+        shim = shim_dir / "git"
+        shim.write_text(
+            f'#!/bin/sh\necho "$*" >> "{git_log}"\nexec "{shutil.which("git")}" "$@"\n',
+            encoding="utf-8",
+        )
+        shim.chmod(0o755)
+
+        def run_counting_git(*extra: str) -> tuple[str, list[str]]:
+            git_log.write_text("", encoding="utf-8")
+            original_path = os.environ["PATH"]
+            os.environ["PATH"] = f"{shim_dir}{os.pathsep}{original_path}"
+            try:
+                proc = run(
+                    ["python3", str(READER), "--repo", str(repo_native), "--no-cache", *extra],
+                    cwd=REPO_ROOT,
+                    check=False,
+                )
+            finally:
+                os.environ["PATH"] = original_path
+            return proc.stdout, git_log.read_text(encoding="utf-8").splitlines()
+
+        def read_counting_git(*extra: str) -> tuple[dict[str, object], list[str]]:
+            stdout, calls = run_counting_git(*extra)
+            return json.loads(stdout), calls
+
+        for layout in ("loose", "packed"):
+            if layout == "packed":
+                run(["git", "pack-refs", "--all"], cwd=repo_native)
+                run(["git", "repack", "-adf", "--window=50", "--depth=50"], cwd=repo_native)
+            for rev_args in (
+                ["--rev", "HEAD~1"],
+                ["--rev", "release"],
+                ["--rev", "master", "--anchor-rev", "release^0"],
+            ):
+                native_payload, native_calls = read_counting_git(*rev_args)
+                sessions_payload, sessions_calls = read_counting_git(
+                    *rev_args, "--git-reader", "sessions"
+                )
+                assert_equal(
+                    native_payload,
+                    sessions_payload,
+                    f"in-process reads of {rev_args} from {layout} objects should match git",
+                )
+                assert_equal(native_calls, [], f"{layout} {rev_args} should not spawn git")
+                assert_equal(
+                    sessions_calls,
+                    ["cat-file --batch"],
+                    f"{rev_args} should be answered by one cat-file session",
+                )
+        pack_dir = repo_native / ".git" / "objects" / "pack"
+        corrupt_index = pack_dir / f"pack-{'f' * 40}.idx"
+        packed_payload, _ = read_counting_git("--rev", "HEAD~1")
+        corrupt_index.write_bytes(b"not an index")
+        corrupt_payload, corrupt_calls = read_counting_git("--rev", "HEAD~1")
+        corrupt_index.unlink()
+        assert_equal(
+            corrupt_payload,
+            packed_payload,
+            "a corrupt pack index next to valid packs should fall back to git",
+        )
+        assert_true(corrupt_calls, "a partially opened pack set should not be searched")
+        for index_path in pack_dir.glob("*.idx"):
+            # Version 1 indexes are valid for git but outside what the in-process reader reads.
+            index_path.unlink()
+            run(
+                ["git", "index-pack", "--index-version=1", str(index_path.with_suffix(".pack"))],
+                cwd=repo_native,
+            )
+        fallback_payload, fallback_calls = read_counting_git("--rev", "HEAD~1")
+        expected_payload, _ = read_counting_git("--rev", "HEAD~1", "--git-reader", "sessions")
+        assert_equal(
+            fallback_payload,
+            expected_payload,
+            "an unsupported pack index version should fall back to git",
+        )
+        assert_true(fallback_calls, "unsupported packs should be read through git")
+        print("OK: the in-process git reader matches git on loose and packed objects and falls back")
+
+        range_output, range_calls = run_counting_git(
+            "--range", "HEAD~5..HEAD", "--git-reader", "sessions"
+        )
+        assert_equal(len(range_output.splitlines()), 5, "the range should cover five commits")
+        assert_equal(
+            range_calls,
+            ["cat-file --batch"],
+            "range mode should read every commit through one cat-file session",
+        )
+        _, anchored_calls = read_counting_git(
+            "--rev", "HEAD~1", "--anchor-rev", "HEAD~2", "--git-reader", "sessions"
+        )
+        assert_equal(
+            anchored_calls,
+            ["cat-file --batch"],
+            "every single-rev lookup should share one cat-file session",
+        )
+        _, bad_range_calls = run_counting_git("--range", "missing..HEAD")
+        assert_equal(
+            bad_range_calls[-1:],
+            ["log -z --format=%H%x00%B missing..HEAD --"],
+            "only a range the session cannot walk should reach git log",
+        )
+        print("OK: one cat-file session serves every lookup in a single-rev or range read")
+
+        repo_graph = temp_root / "repo-graph"
+        repo_graph.mkdir()
+        init_repo(repo_graph)
+        for index in range(12):
+            commit_message(repo_graph, f"main {index}")
+        for branch, base, count in (("side", "master~6", 4), ("other", "side~2", 3)):
+            run(["git", "checkout", "-q", "-b", branch, base], cwd=repo_graph)
+            for index in range(count):
+                commit_message(repo_graph, f"{branch} {index}")
+        run(["git", "checkout", "-q", "master"], cwd=repo_graph)
+        run(["git", "merge", "-q", "--no-edit", "-m", "octopus", "side", "other"], cwd=repo_graph)
+        commit_message(repo_graph, "after merge")
+        run(["git", "branch", "stray", "HEAD~1"], cwd=repo_graph)
+        run(["git", "checkout", "-q", "stray"], cwd=repo_graph)
+        commit_message(repo_graph, "stray")
+        run(["git", "checkout", "-q", "master"], cwd=repo_graph)
+        run(["git", "tag", "-a", "anchor-tag", "-m", "anchor", "side~1"], cwd=repo_graph)
+        anchors = [
+            *run(["git", "rev-list", "--all"], cwd=repo_graph).stdout.split(),
+            "anchor-tag",
+        ]
+
+        def check_reachability(upstream: str, *extra: str) -> tuple[int, list[dict[str, object]]]:
+            proc = run(
+                [
+                    "python3",
+                    str(REACHABILITY),
+                    "--repo",
+                    str(repo_graph),
+                    "--upstream",
+                    upstream,
+                    *anchors,
+                    *extra,
+                ],
+                cwd=REPO_ROOT,
+                check=False,
+            )
+            return proc.returncode, [json.loads(line) for line in proc.stdout.splitlines()]
+
+        def expected_reachability(upstream: str) -> list[bool]:
+            return [
+                run(
+                    ["git", "merge-base", "--is-ancestor", anchor, upstream],
+                    cwd=repo_graph,
+                    check=False,
+                ).returncode
+                == 0
+                for anchor in anchors
+            ]
+
+        for with_graph in (False, True):
+            if with_graph:
+                run(["git", "checkout", "-q", "master~1"], cwd=repo_graph)
+                run(["git", "commit-graph", "write", "--reachable"], cwd=repo_graph)
+                run(["git", "checkout", "-q", "master"], cwd=repo_graph)
+                # Commits newer than the commit-graph are read from their objects.
+                commit_message(repo_graph, "newer than the graph")
+                anchors.append(run(["git", "rev-parse", "HEAD"], cwd=repo_graph).stdout.strip())
+            for upstream in ("master", "master~1", "side", "other", "stray", "master~8"):
+                exit_code, results = check_reachability(upstream)
+                sessions_exit_code, sessions_results = check_reachability(
+                    upstream, "--git-reader", "sessions"
+                )
+                expected = expected_reachability(upstream)
+                assert_equal(
+                    [result["reachable"] for result in results],
+                    expected,
+                    f"reachability from {upstream} should match git merge-base",
+                )
+                assert_equal(
+                    {result["method"] for result in results},
+                    {"commit-graph" if with_graph else "rev-list"},
+                    "the commit-graph should be used exactly when it exists",
+                )
+                assert_equal(
+                    [result["reachable"] for result in sessions_results],
+                    expected,
+                    f"the rev-list walk from {upstream} should match git merge-base",
+                )
+                assert_equal(exit_code, 0 if all(expected) else 1, "unreachable anchors exit 1")
+                assert_equal(sessions_exit_code, exit_code, "both walks should exit alike")
+        tag_result = next(result for result in results if result["anchor"] == "anchor-tag")
+        assert_equal(
+            tag_result["commit_sha"],
+            run(["git", "rev-parse", "side~1"], cwd=repo_graph).stdout.strip(),
+            "annotated tag anchors should peel to their commit",
+        )
+        missing_exit_code, missing_results = check_reachability("master", "missing-anchor")
+        assert_equal(missing_exit_code, 2, "an unknown anchor should fail")
+        assert_true(
+            missing_results[-1]["errors"] and missing_results[-1]["reachable"] is None,
+            "an unknown anchor should report the git error",
+        )
+        assert_true(
+            all(result["reachable"] is not None for result in missing_results[:-1]),
+            "an unknown anchor should not stop the other anchors being checked",
+        )
+        noisy_shim_dir = temp_root / "noisy-git-shim"
+        noisy_shim_dir.mkdir()
+        noisy_shim = noisy_shim_dir / "git"
+        noisy_shim.write_text(
+            "#!/bin/sh\n"
+            'case "$1" in rev-list|log) head -c 262144 /dev/zero | tr "\\0" x >&2;; esac\n'
+            f'exec "{shutil.which("git")}" "$@"\n',
+            encoding="utf-8",
+        )
+        noisy_shim.chmod(0o755)
+        try:
+            noisy_proc = subprocess.run(
+                [
+                    "python3",
+                    str(REACHABILITY),
+                    "--repo",
+                    str(repo_graph),
+                    "--upstream",
+                    "master",
+                    *anchors,
+                    "--git-reader",
+                    "sessions",
+                ],
+                cwd=REPO_ROOT,
+                env={**os.environ, "PATH": f"{noisy_shim_dir}{os.pathsep}{os.environ['PATH']}"},
+                text=True,
+                capture_output=True,
+                timeout=60,
+            )
+        except subprocess.TimeoutExpired as err:
+            raise AssertionError("rev-list stderr filling its pipe should not deadlock") from err
+        assert_equal(
+            [json.loads(line)["reachable"] for line in noisy_proc.stdout.splitlines()],
+            expected_reachability("master"),
+            "a rev-list walk with a full stderr pipe should still finish",
+        )
+        print("OK: batched anchor reachability matches git merge-base with and without a commit-graph")
+
+        for commit_range in (
+            "master~8..master",
+            "side..master",
+            "master..stray",
+            "other~1..master",
+            "anchor-tag..side",
+            "..master",
+            "master...side",
+        ):
+            expected_shas = run(
+                ["git", "log", "--format=%H", commit_range, "--"], cwd=repo_graph
+            ).stdout.split()
+            for reader in ("auto", "sessions"):
+                proc = run(
+                    [
+                        "python3",
+                        str(READER),
+                        "--repo",
+                        str(repo_graph),
+                        "--no-cache",
+                        "--range",
+                        commit_range,
+                        "--git-reader",
+                        reader,
+                    ],
+                    cwd=REPO_ROOT,
+                    check=False,
+                )
+                assert_equal(
+                    [json.loads(line)["commit_sha"] for line in proc.stdout.splitlines()],
+                    expected_shas,
+                    f"{reader} range walk of {commit_range} should match git log",
+                )
+        try:
+            noisy_range_proc = subprocess.run(
+                ["python3", str(READER), "--repo", str(repo_graph), "--range", "master...side"],
+                cwd=REPO_ROOT,
+                env={**os.environ, "PATH": f"{noisy_shim_dir}{os.pathsep}{os.environ['PATH']}"},
+                text=True,
+                capture_output=True,
+                timeout=60,
+            )
+        except subprocess.TimeoutExpired as err:
+            raise AssertionError("git log stderr filling its pipe should not deadlock") from err
+        assert_equal(
+            [json.loads(line)["commit_sha"] for line in noisy_range_proc.stdout.splitlines()],
+            run(["git", "log", "--format=%H", "master...side", "--"], cwd=repo_graph).stdout.split(),
+            "a git log range with a full stderr pipe should still finish",
+        )
+        print("OK: range walks through merges match git log order")
+
 
 if __name__ == "__main__":
     main()
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import copy
+import fcntl
 import json
+import os
 from pathlib import Path
+import socket
 import subprocess
 import tempfile
+import time
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -13,8 +18,15 @@ SKILL_PATH = REPO_ROOT / "plan-execution" / "SKILL.md"
 FORMATTER = REPO_ROOT / "plan-writing" / "scripts" / "format_plan_contract.py"
 VALIDATOR = REPO_ROOT / "plan-writing" / "scripts" / "validate_plan_contract.py"
 READER = REPO_ROOT / "plan-execution" / "scripts" / "read_plan_contract.py"
+TRANSITIONER = REPO_ROOT / "plan-execution" / "scripts" / "transition_plan_contract.py"
+COMPACTOR = REPO_ROOT / "plan-execution" / "scripts" / "compact_plan_journal.py"
+SERVER = REPO_ROOT / "plan-execution" / "scripts" / "plan_contract_server.py"
+CLIENT = REPO_ROOT / "plan-execution" / "scripts" / "plan_contract_client.py"
+INDEXER = REPO_ROOT / "plan-execution" / "scripts" / "index_plan_contracts.py"
+PLAN_WRITER = REPO_ROOT / "plan-writing" / "scripts" / "write_plan_contract.py"
 WRITER_HELPER = REPO_ROOT / "plan-writing" / "scripts" / "plan_contract.py"
 READER_HELPER = REPO_ROOT / "plan-execution" / "scripts" / "plan_contract.py"
+SHARED_HELPERS = ("plan_contract.py", "plan_scheduler.py")
 
 
 def run(
@@ -129,15 +141,18 @@ def main() -> None:
     print("OK: plan-execution clarifies plan-local done semantics")
     print("OK: plan-execution makes the plan filename slug style explicit")
 
-    assert_equal(
-        READER_HELPER.read_text(encoding="utf-8"),
-        WRITER_HELPER.read_text(encoding="utf-8"),
-        "plan contract helpers should stay byte-identical across the pair",
-    )
+    for helper in SHARED_HELPERS:
+        assert_equal(
+            (READER_HELPER.parent / helper).read_text(encoding="utf-8"),
+            (WRITER_HELPER.parent / helper).read_text(encoding="utf-8"),
+            f"{helper} should stay byte-identical across the pair",
+        )
     print("OK: plan contract helpers stay synchronized across both skills")
 
     with tempfile.TemporaryDirectory(prefix="plan-execution-smoke-") as tmp_dir:
         temp_root = Path(tmp_dir)
+        cache_dir = temp_root / "cache"
+        os.environ["PLAN_CONTRACT_CACHE_DIR"] = str(cache_dir)
         plan_path = temp_root / "docs" / "plans" / "2026-03-13_plan-execution-smoke.json"
 
         contract = build_contract()
@@ -149,8 +164,42 @@ def main() -> None:
         assert_true(ready_payload["ok"], "reader should accept a valid ready contract")
         assert_equal(ready_payload["phase"], "ready", "reader phase")
         assert_equal(ready_payload["next_task_id"], "task-1", "reader next task")
+        assert_equal(ready_payload["ready_task_ids"], ["task-1"], "reader ready set")
+        assert_equal(
+            ready_payload["ready_queue"],
+            [{"critical_path": 2, "id": "task-1"}],
+            "reader should rank the ready queue by remaining critical path",
+        )
         print("OK: writer-compatible contract flows directly into reader")
 
+        cache_entries = sorted(cache_dir.glob("*.marshal"))
+        assert_true(cache_entries, "reader should populate the content-hash cache")
+        cached_reader = run(["python3", str(READER), "--path", str(plan_path)])
+        assert_equal(cached_reader.stdout, ready_reader.stdout, "cached reads should match fresh reads")
+        assert_equal(
+            sorted(cache_dir.glob("*.marshal")),
+            cache_entries,
+            "repeat reads of unchanged content should reuse the cache entry",
+        )
+        uncached_reader = run(["python3", str(READER), "--path", str(plan_path), "--no-cache"])
+        assert_equal(uncached_reader.stdout, ready_reader.stdout, "--no-cache reads should match")
+        for entry in cache_entries:
+            entry.write_bytes(b"corrupt")
+        corrupt_reader = run(["python3", str(READER), "--path", str(plan_path)])
+        assert_equal(corrupt_reader.stdout, ready_reader.stdout, "corrupt cache entries should be ignored")
+        bounded = dict(os.environ, PLAN_CONTRACT_CACHE_MAX_BYTES="0")
+        subprocess.run(
+            ["python3", str(READER), "--stdin"],
+            cwd=REPO_ROOT,
+            env=bounded,
+            check=True,
+            capture_output=True,
+            text=True,
+            input=plan_path.read_text(encoding="utf-8") + "\n",
+        )
+        assert_equal(list(cache_dir.glob("*.marshal")), [], "size-bounded eviction should drop entries")
+        print("OK: reader reuses a size-bounded content-hash cache with a --no-cache escape hatch")
+
         contract["spec"]["tasks"][0]["status"] = "in_progress"  # type: ignore[index]
         contract["state"]["phase"] = "executing"  # type: ignore[index]
         contract["state"]["current_task_id"] = "task-1"  # type: ignore[index]
@@ -166,6 +215,11 @@ def main() -> None:
             "task-1",
             "current task should follow the in-progress task",
         )
+        assert_equal(
+            executing_payload["ready_task_ids"],
+            [],
+            "dependents of the in-progress task should not be ready",
+        )
         print("OK: executing state is accepted")
 
         contract["spec"]["tasks"][0]["status"] = "blocked"  # type: ignore[index]
@@ -224,7 +278,7 @@ def main() -> None:
         standalone_root = temp_root / "standalone"
         standalone_scripts = standalone_root / "plan-execution" / "scripts"
         standalone_scripts.mkdir(parents=True, exist_ok=True)
-        for source in (READER.parent / "read_plan_contract.py", READER.parent / "plan_contract.py"):
+        for source in sorted(READER.parent.glob("*.py")):
             (standalone_scripts / source.name).write_text(source.read_text(encoding="utf-8"), encoding="utf-8")
         standalone_payload = json.loads(
             run(
@@ -234,6 +288,691 @@ def main() -> None:
         assert_true(standalone_payload["ok"], "standalone plan-execution reader should work without plan-writing")
         print("OK: plan-execution reader remains self-contained")
 
+        parallel_contract = build_contract()
+        parallel_spec = parallel_contract["spec"]  # type: ignore[index]
+        parallel_state = parallel_contract["state"]  # type: ignore[index]
+        parallel_spec["schema"] = "plan/2"
+        parallel_spec["max_parallel"] = 2
+        parallel_spec["tasks"][1]["depends_on"] = []
+        parallel_spec["tasks"][0]["status"] = "in_progress"
+        parallel_spec["tasks"][1]["status"] = "in_progress"
+        parallel_state["phase"] = "executing"
+        parallel_state["current_task_ids"] = ["task-1", "task-2"]
+        parallel_state["next_task_id"] = None
+        del parallel_state["current_task_id"]
+        parallel_path = temp_root / "docs" / "plans" / "2026-03-13_parallel-lanes.json"
+        write_plan(parallel_path, parallel_contract)
+        parallel_payload = json.loads(
+            run(["python3", str(READER), "--path", str(parallel_path)]).stdout
+        )
+        assert_equal(parallel_payload["schema"], "plan/2", "reader should report the schema")
+        assert_equal(parallel_payload["max_parallel"], 2, "reader should report max_parallel")
+        assert_equal(
+            parallel_payload["current_task_ids"],
+            ["task-1", "task-2"],
+            "reader should report every active lane",
+        )
+        assert_equal(
+            parallel_payload["current_task_id"],
+            None,
+            "multiple active lanes should not collapse into a single current task",
+        )
+        print("OK: reader reports parallel plan/2 lanes")
+
+        fork_contract = build_contract()
+        fork_tasks = fork_contract["spec"]["tasks"]  # type: ignore[index]
+        fork_tasks[1]["depends_on"] = []
+        fork_tasks.append(dict(fork_tasks[1], id="task-3", depends_on=["task-2"]))
+        fork_contract["state"]["next_task_id"] = "task-1"  # type: ignore[index]
+        fork_path = temp_root / "docs" / "plans" / "2026-03-13_critical-path.json"
+        write_plan(fork_path, fork_contract)
+        fork_payload = json.loads(run(["python3", str(READER), "--path", str(fork_path)]).stdout)
+        assert_equal(
+            [entry["id"] for entry in fork_payload["ready_queue"]],
+            ["task-2", "task-1"],
+            "the head of a longer chain should rank ahead of a leaf task",
+        )
+        print("OK: reader ranks the ready queue by longest remaining downstream path")
+
+        transition_path = temp_root / "docs" / "plans" / "2026-03-13_transitions.json"
+        write_plan(transition_path, build_contract())
+        transition_cmd = ["python3", str(TRANSITIONER), "--path", str(transition_path)]
+        started = json.loads(
+            run([*transition_cmd, "--kind", "start", "--last-updated", "2026-03-13T01:00:00Z"]).stdout
+        )
+        assert_equal(started["phase"], "executing", "start should enter executing")
+        assert_equal(started["current_task_ids"], ["task-1"], "start should activate next_task_id")
+        completed = json.loads(
+            run([*transition_cmd, "--kind", "complete", "--evidence", "task-1 verified"]).stdout
+        )
+        assert_equal(completed["phase"], "ready", "completing a non-final task should return to ready")
+        assert_equal(completed["next_task_id"], "task-2", "the unblocked dependent should be next")
+        stale_proc = run(
+            [*transition_cmd, "--kind", "start", "--spec-fingerprint", "sha256:stale"],
+            check=False,
+        )
+        assert_equal(stale_proc.returncode, 2, "spec fingerprint drift should stop the transition")
+        stale_hash_proc = run(
+            [*transition_cmd, "--kind", "start", "--expect-hash", started["content_hash"]],
+            check=False,
+        )
+        assert_true(json.loads(stale_hash_proc.stdout)["stale"], "stale content hashes should fail fast")
+        completed_read = json.loads(run(["python3", str(READER), "--path", str(transition_path)]).stdout)
+        assert_equal(
+            completed_read["content_hash"],
+            completed["content_hash"],
+            "the reader should report the hash the last writer produced",
+        )
+        assert_equal(
+            (completed_read["spec_fingerprint"], completed_read["state_fingerprint"]),
+            (completed["spec_fingerprint"], completed["state_fingerprint"]),
+            "the reader should report the fingerprints the last transition returned",
+        )
+        assert_true(
+            completed["state_fingerprint"] != started["state_fingerprint"]
+            and completed["spec_fingerprint"] != started["spec_fingerprint"],
+            "a completed task should move both fingerprints",
+        )
+        run([*transition_cmd, "--kind", "start", "--spec-fingerprint", completed["spec_fingerprint"]])
+        run([*transition_cmd, "--kind", "block", "--blocker", "verification command is missing"])
+        replanned = json.loads(
+            run([*transition_cmd, "--kind", "replan", "--replan-reason", "task-2 needs a new check"]).stdout
+        )
+        assert_equal(replanned["phase"], "needs_replan", "replan should record needs_replan")
+        illegal_proc = run([*transition_cmd, "--kind", "complete"], check=False)
+        assert_equal(illegal_proc.returncode, 2, "transitions outside the allowed pairs should fail")
+        transition_payload = json.loads(
+            run(["python3", str(READER), "--path", str(transition_path), "--no-cache"]).stdout
+        )
+        assert_true(transition_payload["ok"], "transitioned plans should pass full validation")
+        assert_equal(
+            transition_payload["contract"]["state"]["evidence"],
+            ["task-1 verified"],
+            "transitions should append evidence",
+        )
+        assert_equal(
+            run(["python3", str(READER), "--path", str(transition_path)]).stdout,
+            run(["python3", str(READER), "--path", str(transition_path), "--no-cache"]).stdout,
+            "the cache entry seeded by a transition should match a full parse",
+        )
+        rejected_plan = temp_root / "docs" / "plans" / "2026-03-13_rejected.json"
+        write_plan(rejected_plan, build_contract())
+        rejected_check = (
+            "import json, sys\n"
+            "import transition_plan_contract as transitions\n"
+            "path = sys.argv[1]\n"
+            "original = transitions.apply_transition\n"
+            "def broken(contract, transition, *, graph=None):\n"
+            "    errors = original(contract, transition, graph=graph)\n"
+            "    contract['state']['next_task_id'] = 'task-missing'\n"
+            "    return errors\n"
+            "transitions.apply_transition = broken\n"
+            "outcomes = []\n"
+            "for flags in ([], ['--journal']):\n"
+            "    before = open(path, encoding='utf-8').read()\n"
+            "    sys.argv = ['transition', '--path', path, '--kind', 'start', *flags]\n"
+            "    payload, code = transitions.build_result(transitions.parse_args())\n"
+            "    after = open(path, encoding='utf-8').read()\n"
+            "    outcomes.append([code, payload['ok'], after == before])\n"
+            "print(json.dumps(outcomes))\n"
+        )
+        rejected_proc = subprocess.run(
+            ["python3", "-c", rejected_check, str(rejected_plan)],
+            cwd=TRANSITIONER.parent,
+            text=True,
+            capture_output=True,
+            check=True,
+        )
+        assert_equal(
+            json.loads(rejected_proc.stdout),
+            [[2, False, True], [2, False, True]],
+            "states the validator rejects should fail before the snapshot or journal is written",
+        )
+        assert_true(
+            not rejected_plan.with_suffix(".jsonl").exists(),
+            "a rejected journaled transition should not create a journal",
+        )
+        print("OK: incremental transitions advance runtime state and keep the contract valid")
+
+        journal_plan = temp_root / "docs" / "plans" / "2026-03-13_journaled.json"
+        write_plan(journal_plan, build_contract())
+        snapshot_text = journal_plan.read_text(encoding="utf-8")
+        journal_cmd = ["python3", str(TRANSITIONER), "--path", str(journal_plan)]
+        run([*journal_cmd, "--journal", "--kind", "start", "--last-updated", "2026-03-13T02:00:00Z"])
+        run([*journal_cmd, "--kind", "complete", "--evidence", "journaled evidence"])
+        assert_equal(
+            journal_plan.read_text(encoding="utf-8"),
+            snapshot_text,
+            "journaled transitions should not rewrite the snapshot",
+        )
+        journal_file = journal_plan.with_suffix(".jsonl")
+        assert_equal(len(journal_file.read_text(encoding="utf-8").splitlines()), 2, "journal lines")
+        with journal_file.open("a", encoding="utf-8") as handle:
+            handle.write('{"base": "torn')
+        journal_payload = json.loads(run(["python3", str(READER), "--path", str(journal_plan)]).stdout)
+        assert_equal(journal_payload["journal_entries"], 2, "reader should replay the journal")
+        assert_equal(journal_payload["next_task_id"], "task-2", "replayed state should be current")
+        assert_equal(
+            journal_payload["contract"]["state"]["evidence"],
+            ["journaled evidence"],
+            "replayed evidence should be visible to the reader",
+        )
+        rewrite_proc = run(
+            [
+                "python3",
+                str(PLAN_WRITER),
+                "--path",
+                str(journal_plan),
+                "--expect-hash",
+                journal_payload["content_hash"],
+            ],
+            input_text=json.dumps(build_contract()),
+            check=False,
+        )
+        assert_equal(rewrite_proc.returncode, 2, "plan rewrites should wait for journal compaction")
+        compacted = json.loads(
+            run(
+                [
+                    "python3",
+                    str(COMPACTOR),
+                    "--path",
+                    str(journal_plan),
+                    "--expect-hash",
+                    journal_payload["content_hash"],
+                ]
+            ).stdout
+        )
+        assert_equal(compacted["compacted_entries"], 2, "compaction should fold every entry")
+        assert_true(not journal_file.exists(), "compaction should remove the journal")
+        compacted_payload = json.loads(
+            run(["python3", str(READER), "--path", str(journal_plan), "--no-cache"]).stdout
+        )
+        assert_equal(
+            compacted_payload["contract"],
+            journal_payload["contract"],
+            "compaction should preserve the replayed contract",
+        )
+        race_plan = temp_root / "race" / "2026-03-13_race.json"
+        twin_plan = temp_root / "race-twin" / race_plan.name
+        write_plan(race_plan, build_contract())
+        twin_plan.parent.mkdir()
+        twin_plan.write_bytes(race_plan.read_bytes())
+        race_hash = json.loads(run(["python3", str(READER), "--path", str(race_plan)]).stdout)[
+            "content_hash"
+        ]
+        # The twin has the same snapshot, so its journal line is a valid append for race_plan.
+        run(["python3", str(TRANSITIONER), "--path", str(twin_plan), "--journal", "--kind", "start"])
+        lock_fd = os.open(race_plan.parent, os.O_RDONLY)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            racing_writer = subprocess.Popen(
+                ["python3", str(PLAN_WRITER), "--path", str(race_plan), "--expect-hash", race_hash],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            racing_writer.stdin.write(json.dumps(build_contract()))
+            racing_writer.stdin.close()
+            time.sleep(0.5)
+            # A journaled transition lands while the writer waits for the lock.
+            race_plan.with_suffix(".jsonl").write_bytes(twin_plan.with_suffix(".jsonl").read_bytes())
+        finally:
+            os.close(lock_fd)
+        racing_output = racing_writer.stdout.read()
+        racing_writer.wait(timeout=30)
+        assert_equal(racing_writer.returncode, 2, "a writer must not rewrite over a fresh journal")
+        assert_contains(racing_output, "uncompacted transition journal")
+        race_payload = json.loads(run(["python3", str(READER), "--path", str(race_plan)]).stdout)
+        assert_equal(
+            (race_payload["journal_entries"], race_payload["phase"]),
+            (1, "executing"),
+            "the journal appended during the race should still replay",
+        )
+        print("OK: transition journal appends, replays, and compacts back into the snapshot")
+
+        assert_equal(
+            run(["python3", str(READER), "--path", str(transition_path), "--stream"]).stdout,
+            run(["python3", str(READER), "--path", str(transition_path), "--no-cache"]).stdout,
+            "--stream should produce the same reader payload",
+        )
+        capped_proc = run(
+            ["python3", str(READER), "--path", str(transition_path), "--max-bytes", "64"],
+            check=False,
+        )
+        assert_equal(capped_proc.returncode, 2, "plans over --max-bytes should fail")
+        assert_contains(json.loads(capped_proc.stdout)["errors"][0], "exceeds the 64-byte limit")
+        print("OK: reader --stream matches the default payload and enforces the byte cap")
+
+        full_payload = json.loads(run(["python3", str(READER), "--path", str(transition_path)]).stdout)
+        projected = run(
+            [
+                "python3",
+                str(READER),
+                "--path",
+                str(transition_path),
+                "--fields",
+                "phase,next_task_id,task_ids",
+                "--compact",
+            ]
+        ).stdout
+        assert_equal(projected.count("\n"), 1, "--compact should emit a single line")
+        assert_equal(
+            json.loads(projected),
+            {
+                field: full_payload[field]
+                for field in ("errors", "next_task_id", "ok", "phase", "task_ids")
+            },
+            "--fields should project the payload and always keep ok and errors",
+        )
+        ndjson_lines = run(
+            [
+                "python3",
+                str(READER),
+                "--ndjson",
+                "--path",
+                str(transition_path),
+                "--path",
+                str(journal_plan),
+                "--path",
+                str(temp_root / "docs" / "plans" / "missing.json"),
+                "--fields",
+                "path,phase",
+            ],
+            check=False,
+        )
+        assert_equal(ndjson_lines.returncode, 2, "a failed plan should fail the NDJSON batch")
+        records = [json.loads(line) for line in ndjson_lines.stdout.splitlines()]
+        assert_equal(
+            [(record["ok"], Path(record["path"]).name) for record in records],
+            [
+                (True, transition_path.name),
+                (True, journal_plan.name),
+                (False, "missing.json"),
+            ],
+            "--ndjson should emit one line per plan in order",
+        )
+        unknown_field = run(
+            ["python3", str(READER), "--path", str(transition_path), "--fields", "bogus"],
+            check=False,
+        )
+        assert_equal(unknown_field.returncode, 2, "unknown --fields should be rejected")
+        print("OK: reader projects --fields and emits --compact and --ndjson output")
+
+        summary_fields = [
+            "ok",
+            "schema",
+            "plan_id",
+            "phase",
+            "current_task_id",
+            "current_task_ids",
+            "next_task_id",
+            "content_hash",
+            "state_fingerprint",
+        ]
+        summary_payload = json.loads(
+            run(["python3", str(READER), "--path", str(transition_path), "--summary"]).stdout
+        )
+        assert_true(summary_payload["summary"], "canonical plans should take the state-only path")
+        assert_equal(
+            {field: summary_payload[field] for field in summary_fields},
+            {field: full_payload[field] for field in summary_fields},
+            "the state-only read should agree with a full read on every state field",
+        )
+        compact_path = temp_root / "docs" / "plans" / "2026-03-13_compact-layout.json"
+        compact_path.write_text(json.dumps(build_contract()), encoding="utf-8")
+        summary_journal_path = temp_root / "docs" / "plans" / "2026-03-13_summary-journal.json"
+        write_plan(summary_journal_path, build_contract())
+        run(
+            [
+                "python3",
+                str(TRANSITIONER),
+                "--path",
+                str(summary_journal_path),
+                "--journal",
+                "--kind",
+                "start",
+            ]
+        )
+        for fallback_path, phase in ((compact_path, "ready"), (summary_journal_path, "executing")):
+            fallback_payload = json.loads(
+                run(["python3", str(READER), "--path", str(fallback_path), "--summary"]).stdout
+            )
+            assert_equal(
+                (fallback_payload["summary"], fallback_payload["ok"], fallback_payload["phase"]),
+                (False, True, phase),
+                f"{fallback_path.name} should fall back to a full read",
+            )
+        canonical_contract = json.loads(transition_path.read_text(encoding="utf-8"))
+        for key, value in (("next_task_id", "does-not-exist"), ("phase", ["ready"])):
+            broken_contract = copy.deepcopy(canonical_contract)
+            broken_contract["state"][key] = value
+            broken_path = temp_root / "docs" / "plans" / f"2026-03-13_summary-{key}.json"
+            broken_path.write_text(json.dumps(broken_contract, indent=2) + "\n", encoding="utf-8")
+            broken_proc = run(
+                ["python3", str(READER), "--path", str(broken_path), "--summary"], check=False
+            )
+            broken_payload = json.loads(broken_proc.stdout)
+            assert_equal(
+                (broken_proc.returncode, broken_payload["summary"], broken_payload["ok"]),
+                (2, False, False),
+                f"a canonical plan with a bad state.{key} should fall back to a full read",
+            )
+            assert_true(broken_payload["errors"], f"state.{key} should be reported")
+        canonical_text = transition_path.read_text(encoding="utf-8")
+        task_start = canonical_text.index('      {\n        "id": ')
+        conflicted_path = temp_root / "docs" / "plans" / "2026-03-13_summary-conflict.json"
+        conflicted_path.write_text(
+            f"{canonical_text[:task_start]}<<<<<<< HEAD\n=======\n>>>>>>> replan\n"
+            f"{canonical_text[task_start:]}",
+            encoding="utf-8",
+        )
+        conflicted_proc = run(
+            ["python3", str(READER), "--path", str(conflicted_path), "--summary"], check=False
+        )
+        conflicted_payload = json.loads(conflicted_proc.stdout)
+        assert_equal(
+            (conflicted_proc.returncode, conflicted_payload["summary"], conflicted_payload["ok"]),
+            (2, False, False),
+            "merge conflict markers inside spec.tasks should fall back to a full read",
+        )
+        print("OK: reader --summary decodes only state and falls back for other layouts and journals")
+
+        timings_file = temp_root / "reader-timings.jsonl"
+        timed_read = subprocess.run(
+            ["python3", str(READER), "--path", str(transition_path)],
+            cwd=REPO_ROOT,
+            check=True,
+            text=True,
+            capture_output=True,
+            env=dict(os.environ, PLAN_CONTRACT_TIMINGS=str(timings_file)),
+        )
+        assert_equal(
+            json.loads(timed_read.stdout),
+            full_payload,
+            "timed reads should keep the reader payload",
+        )
+        assert_equal(timed_read.stderr, "", "file timings should stay off stderr")
+        reader_stages = json.loads(timings_file.read_text(encoding="utf-8"))["timings"]["stages"]
+        assert_true(
+            {"read", "schedule", "fingerprint", "write"} <= set(reader_stages),
+            "reader timings should cover reading, scheduling, fingerprints, and output",
+        )
+        print("OK: reader timings go to the file named by PLAN_CONTRACT_TIMINGS")
+
+        index_root = temp_root / "indexed-plans"
+        index_root.mkdir()
+        index_file = temp_root / "plans-index.json"
+        write_plan(index_root / "2026-03-13_index-ready.json", build_contract())
+        write_plan(index_root / "2026-03-13_Index_Bad.json", build_contract())
+        (index_root / "2026-03-13_index-broken.json").write_text("{}", encoding="utf-8")
+        index_command = ["python3", str(INDEXER), "--root", str(index_root), "--index", str(index_file)]
+
+        def run_index(*extra: str) -> dict[str, object]:
+            return json.loads(run([*index_command, *extra]).stdout)
+
+        first_index = run_index()
+        assert_equal(
+            (first_index["indexed"], first_index["reused"], first_index["removed"]),
+            (3, 0, 0),
+            "the first run should index every plan",
+        )
+        assert_equal(
+            [plan["phase"] for plan in first_index["plans"]],
+            ["ready", None, "ready"],
+            "index entries should carry each plan's phase",
+        )
+        assert_equal(
+            run_index(),
+            {**first_index, "indexed": 0, "reused": 3},
+            "an unchanged directory should be answered entirely from the index",
+        )
+        os.utime(index_root / "2026-03-13_index-ready.json")
+        touched_index = run_index()
+        assert_equal(
+            (touched_index["indexed"], touched_index["reused"]),
+            (0, 3),
+            "a touched but unchanged plan should not be re-validated",
+        )
+        run(
+            [
+                "python3",
+                str(TRANSITIONER),
+                "--path",
+                str(index_root / "2026-03-13_index-ready.json"),
+                "--kind",
+                "start",
+            ]
+        )
+        (index_root / "2026-03-13_index-broken.json").unlink()
+        executing_index = run_index("--phase", "executing")
+        assert_equal(
+            (executing_index["indexed"], executing_index["removed"]),
+            (1, 1),
+            "changed plans are re-read and deleted ones dropped",
+        )
+        assert_equal(
+            [plan["slug"] for plan in executing_index["plans"]],
+            ["index-ready"],
+            "--phase should filter on the indexed phase",
+        )
+        violations = run_index("--naming-violations", "--no-refresh")
+        assert_equal(
+            [plan["slug"] for plan in violations["plans"]],
+            ["Index_Bad"],
+            "filenames outside the single-underscore kebab-case convention should be flagged",
+        )
+        by_id = run_index("--plan-id", str(build_contract()["spec"]["plan_id"]), "--active")
+        assert_equal(len(by_id["plans"]), 2, "--plan-id should look plans up through the index")
+        assert_equal(
+            run_index("--rebuild")["indexed"],
+            2,
+            "--rebuild should ignore the saved index",
+        )
+        unsaved_root = temp_root / "index-blocker"
+        unsaved_root.write_text("", encoding="utf-8")
+        unsaved = run_index("--index", str(unsaved_root / "index.json"))
+        assert_equal(
+            (unsaved["ok"], unsaved["errors"], unsaved["plans"]),
+            (True, [], run_index()["plans"]),
+            "an unsaved index should still answer the lookup",
+        )
+        assert_contains(unsaved["warnings"][0], "index not saved")
+        print("OK: plans index rebuilds incrementally and answers phase, plan_id, and naming queries")
+
+        broken_journal_plan = temp_root / "broken-journal.json"
+        (temp_root / "broken-journal.jsonl").mkdir()
+        run_argv = ["--path", str(transition_path.relative_to(temp_root)), "--compact"]
+        rpc_requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "validate", "params": {"path": str(plan_path)}},
+            {"jsonrpc": "2.0", "id": 2, "method": "render", "params": {"text": json.dumps(build_contract())}},
+            {"jsonrpc": "2.0", "id": 3, "method": "read", "params": {"path": str(journal_plan)}},
+            {
+                "jsonrpc": "2.0",
+                "id": 6,
+                "method": "read",
+                "params": {"text": json.dumps(build_contract()), "path": str(broken_journal_plan)},
+            },
+            {
+                "jsonrpc": "2.0",
+                "id": 7,
+                "method": "run",
+                "params": {"command": "read", "argv": run_argv, "cwd": str(temp_root)},
+            },
+            {
+                "jsonrpc": "2.0",
+                "id": 8,
+                "method": "run",
+                "params": {"command": "read", "argv": ["--stdin"], "cwd": str(temp_root)},
+            },
+            *(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": method,
+                    "params": {
+                        "text": json.dumps(build_contract()),
+                        "command": "read",
+                        "argv": [],
+                        "cwd": str(temp_root),
+                        version_field: "stale",
+                    },
+                }
+                for request_id, method, version_field in (
+                    (9, "validate", "validator_version"),
+                    (10, "render", "validator_version"),
+                    (11, "run", "helper_digest"),
+                    (12, "parse", "helper_digest"),
+                )
+            ),
+            {"jsonrpc": "2.0", "id": 4, "method": "missing"},
+            {"jsonrpc": "2.0", "method": "shutdown"},
+            {"jsonrpc": "2.0", "id": 5, "method": "validate", "params": {"text": "{}"}},
+        ]
+        rpc_proc = run(
+            ["python3", str(SERVER), "--stdio"],
+            input_text="".join(f"{json.dumps(request)}\n" for request in rpc_requests),
+        )
+        rpc_responses = [json.loads(line) for line in rpc_proc.stdout.splitlines()]
+        assert_equal(
+            [response["id"] for response in rpc_responses],
+            [1, 2, 3, 6, 7, 8, 9, 10, 11, 12, 4],
+            "stdio responses",
+        )
+        assert_true(rpc_responses[0]["result"]["ok"], "stdio validate should accept a saved plan")
+        assert_equal(
+            rpc_responses[1]["result"]["text"],
+            run(["python3", str(FORMATTER)], input_text=json.dumps(build_contract())).stdout,
+            "stdio render should match the formatter",
+        )
+        assert_equal(
+            rpc_responses[2]["result"]["payload"],
+            compacted_payload,
+            "stdio read should match the reader payload",
+        )
+        assert_equal(
+            rpc_responses[3]["error"]["code"],
+            -32603,
+            "unexpected failures should answer with an internal error and keep serving",
+        )
+        local_run = subprocess.run(
+            ["python3", str(READER), *run_argv],
+            cwd=temp_root,
+            text=True,
+            capture_output=True,
+        )
+        assert_equal(
+            (rpc_responses[4]["result"]["stdout"], rpc_responses[4]["result"]["exit_code"]),
+            (local_run.stdout, local_run.returncode),
+            "run should print what the reader prints from the client's directory",
+        )
+        assert_equal(rpc_responses[5]["error"]["code"], -32602, "run should refuse --stdin")
+        assert_equal(
+            [response["error"]["code"] for response in rpc_responses[6:10]],
+            [-32001] * 4,
+            "every method should refuse a request made against another plan_contract.py",
+        )
+        assert_equal(rpc_responses[10]["error"]["code"], -32601, "unknown methods should error")
+
+        socket_path = temp_root / "plan-contract.sock"
+        server_proc = subprocess.Popen(
+            ["python3", str(SERVER), "--socket", str(socket_path)],
+            cwd=REPO_ROOT,
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            deadline = time.monotonic() + 10
+            while not socket_path.exists():
+                assert_true(time.monotonic() < deadline, "server socket should appear")
+                assert_true(server_proc.poll() is None, "server should keep running")
+                time.sleep(0.02)
+            os.environ["PLAN_CONTRACT_SOCKET"] = str(socket_path)
+            served_read = run(["python3", str(READER), "--path", str(transition_path)])
+            served_invalid = run(["python3", str(VALIDATOR)], input_text="{}", check=False)
+            served_format = run(["python3", str(FORMATTER)], input_text=json.dumps(build_contract()))
+            uncached_read = subprocess.run(
+                ["python3", str(READER), "--path", str(transition_path), "--no-cache", "--timings"],
+                text=True,
+                capture_output=True,
+                check=True,
+            )
+            uncached_stages = json.loads(uncached_read.stderr)["timings"]["stages"]
+            assert_true(
+                "server" in uncached_stages and "validate_spec" not in uncached_stages,
+                "--no-cache reads should still be answered by the server's read method",
+            )
+            stream_read = run(["python3", str(READER), "--path", str(transition_path), "--stream"])
+            client_read = subprocess.run(
+                ["python3", str(CLIENT), "read", *run_argv],
+                cwd=temp_root,
+                text=True,
+                capture_output=True,
+            )
+            client_missing = subprocess.run(
+                ["python3", str(CLIENT), "read", "--path", "missing.json"],
+                cwd=temp_root,
+                text=True,
+                capture_output=True,
+            )
+            os.environ["PLAN_CONTRACT_SOCKET"] = str(temp_root / "missing.sock")
+            fallback_read = run(["python3", str(READER), "--path", str(transition_path)])
+            fallback_client = subprocess.run(
+                ["python3", str(CLIENT), "read", *run_argv],
+                cwd=temp_root,
+                text=True,
+                capture_output=True,
+            )
+            del os.environ["PLAN_CONTRACT_SOCKET"]
+            local_invalid = run(["python3", str(VALIDATOR)], input_text="{}", check=False)
+            assert_equal(
+                served_read.stdout,
+                run(["python3", str(READER), "--path", str(transition_path), "--no-cache"]).stdout,
+                "served reads should match local reads",
+            )
+            assert_equal(fallback_read.stdout, served_read.stdout, "unreachable servers should fall back")
+            assert_equal(uncached_read.stdout, served_read.stdout, "served reads skip no payload fields")
+            assert_equal(stream_read.stdout, served_read.stdout, "served --stream reads should match")
+            assert_equal(
+                (client_read.stdout, client_read.returncode),
+                (local_run.stdout, local_run.returncode),
+                "the client should relay the server's stdout and exit code",
+            )
+            assert_equal(
+                (fallback_client.stdout, fallback_client.returncode),
+                (local_run.stdout, local_run.returncode),
+                "the client should run the reader locally when no server answers",
+            )
+            assert_equal(
+                (client_missing.returncode, json.loads(client_missing.stdout)["ok"]),
+                (2, False),
+                "the client should keep the reader's failure exit code",
+            )
+            assert_equal(
+                (served_invalid.returncode, served_invalid.stderr),
+                (local_invalid.returncode, local_invalid.stderr),
+                "served validation should keep exit codes and messages",
+            )
+            assert_equal(
+                served_format.stdout,
+                rpc_responses[1]["result"]["text"],
+                "served formatting should keep its output",
+            )
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(str(socket_path))
+            client.sendall(b'{"jsonrpc": "2.0", "id": 1, "method": "shutdown"}\n')
+            client.recv(4096)
+            client.close()
+            server_proc.wait(timeout=10)
+        finally:
+            os.environ.pop("PLAN_CONTRACT_SOCKET", None)
+            if server_proc.poll() is None:
+                server_proc.kill()
+                server_proc.wait()
+        assert_equal(server_proc.returncode, 0, "server should exit cleanly on shutdown")
+        assert_true(not socket_path.exists(), "server should remove its socket on exit")
+        print("OK: the validation server answers JSON-RPC and helpers keep their output through it")
+
         prose_path = temp_root / "docs" / "plans" / "2026-03-13_legacy.json"
         prose_path.write_text("# Legacy prose plan\n\nNo plan contract lives here.\n", encoding="utf-8")
         prose_proc = run(
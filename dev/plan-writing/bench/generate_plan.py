@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Seeded generator of valid synthetic plan/1 contracts for benchmarking."""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import json
+import random
+import string
+import sys
+from typing import Any
+
+
+ALPHABET = string.ascii_lowercase + " "
+
+
+@dataclass(frozen=True)
+class PlanShape:
+    tasks: int = 100
+    fan_in: int = 3
+    fan_out: int = 4
+    window: int = 32
+    string_size: int = 48
+    list_items: int = 2
+    snapshot_depth: int = 3
+    snapshot_width: int = 3
+    seed: int = 0
+
+
+def random_text(rng: random.Random, size: int) -> str:
+    # Keep the first character non-blank so normalization never strips the value empty.
+    return "x" + "".join(rng.choice(ALPHABET) for _ in range(max(0, size - 1)))
+
+
+def build_snapshot(rng: random.Random, shape: PlanShape, depth: int) -> Any:
+    if depth <= 0:
+        return random_text(rng, shape.string_size)
+    return {
+        f"key-{index}": build_snapshot(rng, shape, depth - 1)
+        for index in range(shape.snapshot_width)
+    }
+
+
+def build_dependencies(
+    rng: random.Random,
+    shape: PlanShape,
+    index: int,
+    dependents: list[int],
+) -> list[str]:
+    """Pick up to `fan_in` earlier tasks inside the window that still have fan-out budget."""
+    if index == 0:
+        return []
+    start = max(0, index - shape.window)
+    candidates = [
+        candidate for candidate in range(start, index) if dependents[candidate] < shape.fan_out
+    ]
+    count = min(len(candidates), rng.randint(0, shape.fan_in))
+    chosen = sorted(rng.sample(candidates, count))
+    for candidate in chosen:
+        dependents[candidate] += 1
+    return [f"task-{candidate + 1}" for candidate in chosen]
+
+
+def generate_contract(shape: PlanShape) -> dict[str, Any]:
+    """Return a valid `ready` plan/1 contract whose first task is the next executable one."""
+    rng = random.Random(shape.seed)
+    dependents = [0] * shape.tasks
+    tasks = []
+    for index in range(shape.tasks):
+        tasks.append(
+            {
+                "id": f"task-{index + 1}",
+                "title": random_text(rng, shape.string_size),
+                "status": "pending",
+                "objective": random_text(rng, shape.string_size * 2),
+                "inputs": [random_text(rng, shape.string_size) for _ in range(shape.list_items)],
+                "outputs": [random_text(rng, shape.string_size) for _ in range(shape.list_items)],
+                "verification": [
+                    random_text(rng, shape.string_size) for _ in range(shape.list_items)
+                ],
+                "depends_on": build_dependencies(rng, shape, index, dependents),
+            }
+        )
+    return {
+        "spec": {
+            "schema": "plan/1",
+            "plan_id": f"bench-{shape.tasks}-{shape.seed}",
+            "goal": random_text(rng, shape.string_size * 2),
+            "success_criteria": [random_text(rng, shape.string_size) for _ in range(shape.list_items)],
+            "constraints": [random_text(rng, shape.string_size) for _ in range(shape.list_items)],
+            "defaults": {"owner": "main-thread"},
+            "tasks": tasks,
+            "replan_policy": {"owner": "plan-writing", "triggers": ["blocked"]},
+        },
+        "state": {
+            "phase": "ready",
+            "current_task_id": None,
+            "next_task_id": "task-1" if tasks else None,
+            "blockers": [],
+            "evidence": [],
+            "last_updated": "2026-03-13T00:00:00Z",
+            "replan_reason": None,
+            "context_snapshot": build_snapshot(rng, shape, shape.snapshot_depth),
+        },
+    }
+
+
+def add_shape_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = PlanShape()
+    parser.add_argument("--tasks", type=int, default=defaults.tasks, help="Task count.")
+    parser.add_argument("--fan-in", type=int, default=defaults.fan_in, help="Max dependencies per task.")
+    parser.add_argument("--fan-out", type=int, default=defaults.fan_out, help="Max dependents per task.")
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=defaults.window,
+        help="How many preceding tasks a dependency may reach back.",
+    )
+    parser.add_argument("--string-size", type=int, default=defaults.string_size, help="Characters per string.")
+    parser.add_argument("--list-items", type=int, default=defaults.list_items, help="Items per string list.")
+    parser.add_argument(
+        "--snapshot-depth",
+        type=int,
+        default=defaults.snapshot_depth,
+        help="Nesting depth of state.context_snapshot.",
+    )
+    parser.add_argument(
+        "--snapshot-width",
+        type=int,
+        default=defaults.snapshot_width,
+        help="Keys per context_snapshot level.",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed.")
+
+
+def shape_from_args(args: argparse.Namespace) -> PlanShape:
+    return PlanShape(
+        tasks=args.tasks,
+        fan_in=args.fan_in,
+        fan_out=args.fan_out,
+        window=args.window,
+        string_size=args.string_size,
+        list_items=args.list_items,
+        snapshot_depth=args.snapshot_depth,
+        snapshot_width=args.snapshot_width,
+        seed=args.seed,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Print a synthetic plan/1 contract as JSON.")
+    add_shape_arguments(parser)
+    contract = generate_contract(shape_from_args(parser.parse_args()))
+    json.dump(contract, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
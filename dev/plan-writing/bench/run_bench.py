@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Measure plan/1 parse, validate, and render throughput and peak memory on synthetic plans."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parents[2]
+sys.path.insert(0, str(REPO_ROOT / "plan-writing" / "scripts"))
+
+from generate_plan import PlanShape, generate_contract  # noqa: E402
+from plan_contract import (  # noqa: E402
+    parse_contract_stream,
+    parse_contract_text,
+    render_contract_json,
+    render_parse_result,
+    validate_contract_object,
+)
+
+
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+DEFAULT_THRESHOLD = 0.5
+SCENARIOS = {
+    "small": PlanShape(tasks=10),
+    "medium": PlanShape(tasks=500),
+    "large": PlanShape(tasks=5000),
+    "wide-graph": PlanShape(tasks=1000, fan_in=16, fan_out=64, window=256),
+    "deep-snapshot": PlanShape(tasks=50, snapshot_depth=8),
+    "long-strings": PlanShape(tasks=200, string_size=2048),
+}
+
+
+def build_stages(raw_text: str) -> dict[str, Callable[[], Any]]:
+    """Return the measured stages; `decode` is the json.loads floor the others normalize by.
+
+    `render` validates a bare dict again like external callers do, while `render_trusted`
+    and `format` (the formatter's parse-then-render path) reuse the parse result.
+    `validate_interpreted` runs the same validation with the compiled fast paths turned off.
+    """
+    decoded = json.loads(raw_text)
+    parsed = parse_contract_text(raw_text, from_saved_file=True)
+    if parsed.contract is None:
+        raise ValueError(f"generated contract is invalid: {parsed.errors}")
+    normalized = parsed.contract
+    return {
+        "decode": lambda: json.loads(raw_text),
+        "parse": lambda: parse_contract_text(raw_text, from_saved_file=True),
+        "stream": lambda: parse_contract_stream(raw_text, from_saved_file=True),
+        "validate": lambda: validate_contract_object(decoded),
+        "validate_interpreted": lambda: validate_contract_object(decoded, compiled=False),
+        "render": lambda: render_contract_json(normalized),
+        "render_trusted": lambda: render_parse_result(parsed),
+        "format": lambda: render_parse_result(
+            parse_contract_text(raw_text, from_saved_file=True)
+        ),
+    }
+
+
+def time_stages(stages: dict[str, Callable[[], Any]], repeat: int) -> dict[str, float]:
+    """Return the best per-call time of each stage.
+
+    Samples are interleaved across stages so machine-wide drift hits every stage alike and
+    the decode-relative ratios stay stable between runs.
+    """
+    timers = {name: timeit.Timer(stage) for name, stage in stages.items()}
+    numbers = {name: timer.autorange()[0] for name, timer in timers.items()}
+    best = dict.fromkeys(stages, float("inf"))
+    for _ in range(repeat):
+        for name, timer in timers.items():
+            best[name] = min(best[name], timer.timeit(numbers[name]) / numbers[name])
+    return best
+
+
+def peak_memory(stage: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        stage()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_scenario(shape: PlanShape, repeat: int) -> dict[str, Any]:
+    raw_text = json.dumps(generate_contract(shape), indent=2)
+    size = len(raw_text.encode("utf-8"))
+    stages = build_stages(raw_text)
+    timings = time_stages(stages, repeat)
+    floor = timings["decode"]
+    results: dict[str, Any] = {}
+    for name, stage in stages.items():
+        seconds = timings[name]
+        results[name] = {
+            "seconds": round(seconds, 9),
+            "relative": round(seconds / floor, 3),
+            "tasks_per_second": round(shape.tasks / seconds, 1),
+            "bytes_per_second": round(size / seconds, 1),
+            "peak_bytes": peak_memory(stage),
+        }
+    return {
+        "tasks": shape.tasks,
+        "input_bytes": size,
+        # End-to-end gain of the compiled task and replan-policy normalizers on validation.
+        "compiled_speedup": round(timings["validate_interpreted"] / timings["validate"], 2),
+        "stages": results,
+    }
+
+
+def compare(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+) -> list[str]:
+    """Flag stages whose decode-relative cost or peak memory grew past the threshold.
+
+    Wall-clock seconds vary across machines, so timings are compared as a multiple of the
+    json.loads time measured in the same run.
+    """
+    regressions: list[str] = []
+    for scenario, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(scenario)
+        if base is None:
+            continue
+        for stage, metrics in current["stages"].items():
+            base_metrics = base["stages"].get(stage)
+            if base_metrics is None:
+                continue
+            for metric in ("relative", "peak_bytes"):
+                limit = base_metrics[metric] * (1 + threshold)
+                if metrics[metric] > limit:
+                    regressions.append(
+                        f"{scenario}/{stage} {metric} {metrics[metric]} exceeds baseline "
+                        f"{base_metrics[metric]} by more than {threshold:.0%}"
+                    )
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run. Repeat for several; defaults to all of them.",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing samples per stage.")
+    parser.add_argument("--output", type=Path, help="Also write the results JSON to this file.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="Baseline results to compare against.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed growth over the baseline before a stage counts as a regression.",
+    )
+    parser.add_argument(
+        "--no-compare",
+        action="store_true",
+        help="Skip the baseline comparison.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Overwrite the baseline with this run instead of comparing against it.",
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be a positive integer")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    names = args.scenario or list(SCENARIOS)
+    results = {
+        "python": platform.python_version(),
+        "scenarios": {name: measure_scenario(SCENARIOS[name], args.repeat) for name in names},
+    }
+    rendered = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    sys.stdout.write(rendered)
+    if args.output is not None:
+        args.output.write_text(rendered, encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(rendered, encoding="utf-8")
+        return 0
+    if args.no_compare:
+        return 0
+    try:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as err:
+        print(f"bench baseline unreadable: {err}", file=sys.stderr)
+        return 2
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"bench regression: {regression}", file=sys.stderr)
+    return 2 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,15 +2,55 @@
 
 from __future__ import annotations
 
+import copy
 import json
+import os
 from pathlib import Path
+import random
 import subprocess
+import sys
+import tempfile
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 SKILL_PATH = REPO_ROOT / "plan-writing" / "SKILL.md"
 FORMATTER = REPO_ROOT / "plan-writing" / "scripts" / "format_plan_contract.py"
 VALIDATOR = REPO_ROOT / "plan-writing" / "scripts" / "validate_plan_contract.py"
+WRITER = REPO_ROOT / "plan-writing" / "scripts" / "write_plan_contract.py"
+GENERATOR = REPO_ROOT / "dev" / "plan-writing" / "bench" / "generate_plan.py"
+TASK_MUTATIONS = (
+    None,
+    "",
+    "   ",
+    7,
+    [],
+    ["ok", ""],
+    ["ok", 3],
+    ["  padded  "],
+    "  padded  ",
+    "unknown-status",
+    "task-1",
+    ["task-1"],
+    ["missing-task"],
+)
+
+sys.path.insert(0, str(REPO_ROOT / "plan-writing" / "scripts"))
+sys.path.insert(0, str(GENERATOR.parent))
+
+from generate_plan import PlanShape, generate_contract  # noqa: E402
+from plan_contract import (  # noqa: E402
+    ContractParseResult,
+    PlanGraph,
+    StreamLimits,
+    dumps_indented,
+    normalize_freeform,
+    parse_contract_stream,
+    parse_contract_text,
+    parse_result_from_payload,
+    render_contract_json,
+    render_parse_result,
+    validate_contract_object,
+)
 
 
 def run(
@@ -100,7 +140,45 @@ def build_contract() -> dict[str, object]:
     }
 
 
+class LabelString(str):
+    pass
+
+
+def mutate_contract(rng: random.Random, contract: dict[str, object]) -> dict[str, object]:
+    mutated = copy.deepcopy(contract)
+    tasks = mutated["spec"]["tasks"]  # type: ignore[index]
+    for _ in range(rng.randint(0, 3)):
+        records = [task for task in tasks if isinstance(task, dict) and task]
+        if not records:
+            break
+        task = rng.choice(records)
+        action = rng.randrange(5)
+        key = rng.choice(sorted(task))
+        if action == 0:
+            del task[key]
+        elif action == 1:
+            task["extra"] = "value"
+        elif action == 2:
+            task[key] = copy.deepcopy(rng.choice(TASK_MUTATIONS))
+        elif action == 3:
+            task[key] = LabelString(f" {task[key]} ") if isinstance(task[key], str) else task[key]
+        else:
+            tasks[rng.randrange(len(tasks))] = rng.choice([None, "task", dict(task)])
+    if rng.random() < 0.2:
+        mutated["spec"]["replan_policy"] = rng.choice(  # type: ignore[index]
+            [{"owner": " ", "triggers": ["blocked"]}, {"owner": "x", "triggers": []}, None]
+        )
+    return mutated
+
+
 def main() -> None:
+    with tempfile.TemporaryDirectory(prefix="plan-writing-cache-") as cache_dir:
+        # Keep contract cache entries out of the developer's real cache directory.
+        os.environ["PLAN_CONTRACT_CACHE_DIR"] = cache_dir
+        run_checks()
+
+
+def run_checks() -> None:
     skill_text = SKILL_PATH.read_text(encoding="utf-8")
     assert_contains(skill_text, "plan-local completion only")
     assert_contains(skill_text, "does not by itself certify downstream review")
@@ -185,6 +263,20 @@ def main() -> None:
     )
     print("OK: unknown dependencies are rejected")
 
+    cyclic = build_contract()
+    cyclic["spec"]["tasks"][0]["depends_on"] = ["task-2"]  # type: ignore[index]
+    cyclic_proc = run(
+        ["python3", str(VALIDATOR)],
+        input_text=json.dumps(cyclic),
+        check=False,
+    )
+    assert_equal(cyclic_proc.returncode, 2, "dependency cycles should fail")
+    assert_true(
+        "cycle among task ids: ['task-1', 'task-2']" in cyclic_proc.stderr,
+        "cycle failure should name every task in the strongly connected component",
+    )
+    print("OK: dependency cycles are rejected")
+
     non_executable_next = build_contract()
     non_executable_next["state"]["next_task_id"] = "task-2"  # type: ignore[index]
     non_executable_next_proc = run(
@@ -217,6 +309,386 @@ def main() -> None:
     )
     print("OK: multiple active tasks are rejected")
 
+    parallel = build_contract()
+    parallel["spec"]["schema"] = "plan/2"  # type: ignore[index]
+    parallel["spec"]["max_parallel"] = 2  # type: ignore[index]
+    parallel["spec"]["tasks"][1]["depends_on"] = []  # type: ignore[index]
+    parallel["spec"]["tasks"][0]["status"] = "in_progress"  # type: ignore[index]
+    parallel["spec"]["tasks"][1]["status"] = "in_progress"  # type: ignore[index]
+    parallel["state"]["phase"] = "executing"  # type: ignore[index]
+    parallel["state"]["current_task_ids"] = ["task-1", "task-2"]  # type: ignore[index]
+    parallel["state"]["next_task_id"] = None  # type: ignore[index]
+    del parallel["state"]["current_task_id"]  # type: ignore[attr-defined]
+    parallel_formatted = run(["python3", str(FORMATTER)], input_text=json.dumps(parallel))
+    parallel_state = json.loads(parallel_formatted.stdout)["state"]
+    assert_equal(
+        parallel_state["current_task_ids"],
+        ["task-1", "task-2"],
+        "plan/2 should keep every active lane in state.current_task_ids",
+    )
+    print("OK: plan/2 accepts parallel in-progress tasks up to spec.max_parallel")
+
+    parallel["spec"]["max_parallel"] = 1  # type: ignore[index]
+    over_limit_proc = run(
+        ["python3", str(VALIDATOR)],
+        input_text=json.dumps(parallel),
+        check=False,
+    )
+    assert_equal(over_limit_proc.returncode, 2, "plan/2 should enforce spec.max_parallel")
+    assert_true(
+        "spec.max_parallel allows at most 1 tasks" in over_limit_proc.stderr,
+        "max_parallel failure should mention the configured limit",
+    )
+    unknown_schema = build_contract()
+    unknown_schema["spec"]["schema"] = "plan/9"  # type: ignore[index]
+    unknown_schema_proc = run(
+        ["python3", str(VALIDATOR)],
+        input_text=json.dumps(unknown_schema),
+        check=False,
+    )
+    assert_true(
+        "spec.schema must be exactly 'plan/1'" in unknown_schema_proc.stderr,
+        "plan/1 callers should keep the original schema error",
+    )
+    parallel["spec"]["schema"] = "plan/9"  # type: ignore[index]
+    unknown_parallel_proc = run(
+        ["python3", str(VALIDATOR)],
+        input_text=json.dumps(parallel),
+        check=False,
+    )
+    assert_true(
+        "spec.schema must be one of: ['plan/1', 'plan/2']" in unknown_parallel_proc.stderr,
+        "plan/2-shaped specs should list every supported schema",
+    )
+    parallel["spec"]["schema"] = "plan/2"  # type: ignore[index]
+    parallel["spec"]["max_parallel"] = 2  # type: ignore[index]
+    parallel["state"]["current_task_ids"] = ["task-1"]  # type: ignore[index]
+    mismatched_proc = run(
+        ["python3", str(VALIDATOR)],
+        input_text=json.dumps(parallel),
+        check=False,
+    )
+    assert_equal(mismatched_proc.returncode, 2, "plan/2 lanes must match in-progress tasks")
+    assert_true(
+        "state.current_task_ids to match the in-progress tasks" in mismatched_proc.stderr,
+        "lane mismatch failure should mention state.current_task_ids",
+    )
+    print("OK: plan/2 rejects lanes beyond max_parallel or out of sync with task statuses")
+
+    with tempfile.TemporaryDirectory(prefix="plan-writing-smoke-") as tmp_dir:
+        plans_dir = Path(tmp_dir) / "docs" / "plans"
+        plans_dir.mkdir(parents=True)
+        for index in range(3):
+            (plans_dir / f"2026-03-13_batch-{index}.json").write_text(
+                formatted.stdout,
+                encoding="utf-8",
+            )
+        invalid_path = plans_dir / "2026-03-13_batch-invalid.json"
+        invalid_path.write_text(json.dumps(duplicate_ids), encoding="utf-8")
+        batch_proc = run(
+            ["python3", str(VALIDATOR), "--jobs", "2", str(plans_dir / "*.json")],
+            check=False,
+        )
+        assert_equal(batch_proc.returncode, 2, "batch mode should fail when any plan is invalid")
+        batch_results = [json.loads(line) for line in batch_proc.stdout.splitlines()]
+        assert_equal(len(batch_results), 4, "batch mode should emit one result per file")
+        assert_equal(
+            sorted(set(batch_results[0])),
+            ["elapsed", "errors", "ok", "path"],
+            "batch results should carry path, ok, errors, and elapsed",
+        )
+        invalid_results = [result for result in batch_results if not result["ok"]]
+        assert_equal(
+            [result["path"] for result in invalid_results],
+            [str(invalid_path.resolve())],
+            "batch mode should isolate the invalid plan",
+        )
+        single_proc = run(["python3", str(VALIDATOR), "--path", str(invalid_path)], check=False)
+        assert_equal(
+            [f"plan/1 invalid: {error}" for error in invalid_results[0]["errors"]],
+            single_proc.stderr.splitlines(),
+            "batch errors should match the single-file validator",
+        )
+        valid_proc = run(["python3", str(VALIDATOR), str(plans_dir / "*batch-[0-9].json")])
+        assert_equal(
+            len(valid_proc.stdout.splitlines()),
+            3,
+            "batch mode should exit cleanly when every plan validates",
+        )
+    print("OK: batch mode validates many saved plans with aggregate exit status")
+
+    with tempfile.TemporaryDirectory(prefix="plan-writing-smoke-") as tmp_dir:
+        saved_path = Path(tmp_dir) / "docs" / "plans" / "2026-03-13_cas-writer.json"
+        created = json.loads(
+            run(["python3", str(WRITER), "--path", str(saved_path)], input_text=raw_contract).stdout
+        )
+        assert_equal(
+            saved_path.read_text(encoding="utf-8"),
+            formatted.stdout,
+            "the writer should save the canonical formatter output",
+        )
+        recreate_proc = run(
+            ["python3", str(WRITER), "--path", str(saved_path)],
+            input_text=raw_contract,
+            check=False,
+        )
+        assert_equal(recreate_proc.returncode, 2, "creating over an existing plan should fail")
+        revised = build_contract()
+        revised["state"]["evidence"] = ["first writer"]  # type: ignore[index]
+        writers = [
+            subprocess.Popen(
+                [
+                    "python3",
+                    str(WRITER),
+                    "--path",
+                    str(saved_path),
+                    "--expect-hash",
+                    created["content_hash"],
+                ],
+                cwd=REPO_ROOT,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for _ in range(4)
+        ]
+        outcomes = [
+            json.loads(writer.communicate(json.dumps(revised))[0]) for writer in writers
+        ]
+        assert_equal(
+            sorted(outcome["ok"] for outcome in outcomes),
+            [False, False, False, True],
+            "exactly one concurrent writer should win the compare-and-swap",
+        )
+        assert_true(
+            all(outcome["stale"] for outcome in outcomes if not outcome["ok"]),
+            "losing writers should fail fast as stale",
+        )
+        assert_equal(
+            sorted(path.name for path in saved_path.parent.iterdir()),
+            [saved_path.name],
+            "atomic writes should not leave temp or lock files behind",
+        )
+    print("OK: compare-and-swap writer rejects stale concurrent writes")
+
+    for shape_args in (
+        ["--tasks", "40", "--seed", "7"],
+        ["--tasks", "60", "--fan-in", "8", "--fan-out", "2", "--snapshot-depth", "5"],
+    ):
+        generated = run(["python3", str(GENERATOR), *shape_args])
+        assert_equal(
+            run(["python3", str(GENERATOR), *shape_args]).stdout,
+            generated.stdout,
+            "the benchmark generator should be deterministic for a seed",
+        )
+        generated_proc = run(["python3", str(VALIDATOR)], input_text=generated.stdout)
+        assert_equal(generated_proc.stdout.strip(), "OK", "generated benchmark plans should validate")
+    print("OK: benchmark generator emits deterministic valid plans")
+
+    rng = random.Random(12)
+    rejected = 0
+    for seed in range(300):
+        base = generate_contract(PlanShape(tasks=6, fan_in=2, snapshot_depth=1, seed=seed))
+        candidate = mutate_contract(rng, base)
+        compiled_result = validate_contract_object(copy.deepcopy(candidate))
+        interpreted_result = validate_contract_object(copy.deepcopy(candidate), compiled=False)
+        assert_equal(
+            json.dumps(compiled_result, ensure_ascii=True),
+            json.dumps(interpreted_result, ensure_ascii=True),
+            f"compiled and interpreted validators should agree for seed {seed}",
+        )
+        rejected += compiled_result[0] is None
+    assert_true(0 < rejected < 300, "the differential corpus should mix valid and invalid plans")
+    print("OK: compiled validator matches the interpreter-style validator byte for byte")
+
+    rng = random.Random(13)
+    for seed in range(300):
+        base = generate_contract(PlanShape(tasks=6, fan_in=2, snapshot_depth=2, seed=seed))
+        candidate_text = json.dumps(mutate_contract(rng, base), indent=2)
+        if seed % 3 == 0:
+            candidate_text = candidate_text[: rng.randrange(len(candidate_text))]
+        assert_equal(
+            parse_contract_stream(candidate_text, from_saved_file=True),
+            parse_contract_text(candidate_text, from_saved_file=True),
+            f"streaming and full parses should agree for seed {seed}",
+        )
+    wide_contract = generate_contract(PlanShape(tasks=3, seed=5))
+    wide_contract["spec"]["goal"] = "é" * 200  # type: ignore[index]
+    wide_text = json.dumps(wide_contract, ensure_ascii=False)
+    wide_bytes = len(wide_text.encode("utf-8"))
+    assert_true(
+        not parse_contract_stream(
+            wide_text, from_saved_file=True, limits=StreamLimits(max_bytes=len(wide_text))
+        ).ok,
+        "the byte cap should count UTF-8 bytes, not characters",
+    )
+    assert_true(
+        parse_contract_stream(
+            wide_text, from_saved_file=True, limits=StreamLimits(max_bytes=wide_bytes)
+        ).ok,
+        "input exactly at the byte cap should parse",
+    )
+    print("OK: streaming parse matches the full parse on valid, invalid, and truncated plans")
+
+    large_plan = run(["python3", str(GENERATOR), "--tasks", "300", "--snapshot-depth", "4"]).stdout
+    streamed = run(["python3", str(FORMATTER), "--stream", "--no-cache"], input_text=large_plan)
+    assert_equal(
+        streamed.stdout,
+        run(["python3", str(FORMATTER), "--no-cache"], input_text=large_plan).stdout,
+        "--stream should render the same canonical JSON",
+    )
+    too_large = run(
+        ["python3", str(FORMATTER), "--max-bytes", "1024"],
+        input_text=large_plan,
+        check=False,
+    )
+    assert_equal(too_large.returncode, 2, "input over --max-bytes should fail")
+    assert_contains(too_large.stderr, "exceeds the 1024-byte limit")
+    too_deep = run(
+        ["python3", str(FORMATTER), "--max-depth", "4"],
+        input_text=large_plan,
+        check=False,
+    )
+    assert_equal(too_deep.returncode, 2, "input over --max-depth should fail")
+    assert_contains(too_deep.stderr, "nests deeper than the limit of 4 levels")
+    print("OK: formatter --stream matches the default output and enforces byte and depth caps")
+
+    canonical_snapshot = json.loads(
+        json.dumps(generate_contract(PlanShape(tasks=1, snapshot_depth=6)), sort_keys=True)
+    )
+    assert_true(
+        normalize_freeform(canonical_snapshot) is canonical_snapshot,
+        "already-sorted freeform data should be returned without a copy",
+    )
+    unsorted_snapshot = {"b": [{"d": 1, "c": 2}], "a": {"keep": ["x"]}}
+    assert_equal(
+        json.dumps(normalize_freeform(unsorted_snapshot)),
+        '{"a": {"keep": ["x"]}, "b": [{"c": 2, "d": 1}]}',
+        "freeform normalization should sort keys at every level",
+    )
+    for depth, message in (
+        (300, "state.context_snapshot nests deeper than the limit of 256 levels"),
+        (5000, "plan/1 block nests too deeply to decode"),
+    ):
+        nested_text = json.dumps(build_contract()).replace(
+            '"context_snapshot": {"source": "smoke"}',
+            '"context_snapshot": ' + '{"x": ' * depth + "1" + "}" * depth,
+        )
+        nested_proc = run(
+            ["python3", str(VALIDATOR), "--no-cache"],
+            input_text=nested_text,
+            check=False,
+        )
+        assert_equal(nested_proc.returncode, 2, f"a {depth}-level context_snapshot should fail")
+        assert_contains(nested_proc.stderr, message)
+    print("OK: freeform normalization is iterative, depth-limited, and copy-free when canonical")
+
+    rng = random.Random(14)
+    for seed in range(100):
+        contract = generate_contract(PlanShape(tasks=4, snapshot_depth=3, seed=seed))
+        contract["state"]["context_snapshot"]["mixed"] = [  # type: ignore[index]
+            rng.choice([0.1, -3, True, None, "é\n\"", [], {}, ["a", "b"], {"z": [1.5e300]}])
+            for _ in range(rng.randint(0, 6))
+        ]
+        assert_equal(
+            dumps_indented(contract),
+            json.dumps(contract, indent=2, ensure_ascii=True),
+            f"the indented writer should match json.dumps for seed {seed}",
+        )
+        parsed = parse_contract_text(json.dumps(contract), from_saved_file=True)
+        assert_equal(
+            render_parse_result(parsed),
+            render_contract_json(contract),
+            f"trusted and validating renders should agree for seed {seed}",
+        )
+    unvalidated = ContractParseResult(
+        ok=False, contract=None, tail="", errors=["bad plan"], migration_required=False
+    )
+    try:
+        render_parse_result(unvalidated)
+    except ValueError as err:
+        assert_equal(str(err), "bad plan", "trusted render should surface the parse errors")
+    else:
+        raise AssertionError("trusted render should refuse a failed parse result")
+    cached = parse_result_from_payload(
+        {"ok": True, "contract": contract, "tail": "", "errors": [], "migration_required": False}
+    )
+    assert_equal(
+        render_parse_result(cached),
+        render_contract_json(contract),
+        "results rebuilt from cache payloads should still render",
+    )
+    forged_contract = copy.deepcopy(contract)
+    forged_contract["state"]["phase"] = "not-a-phase"  # type: ignore[index]
+    forged = ContractParseResult(
+        ok=True, contract=forged_contract, tail="", errors=[], migration_required=False
+    )
+    try:
+        render_parse_result(forged)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("results without the parse token should be validated before render")
+    print("OK: trusted render reuses the parse result and matches json.dumps byte for byte")
+
+    graph_tasks = [
+        {"id": f"task-{index}", "status": "pending", "depends_on": []} for index in range(1, 5)
+    ]
+    graph = PlanGraph(graph_tasks)
+    for task_id in ("task-3", "task-1", "task-4"):
+        graph.set_status(task_id, "in_progress")
+    assert_equal(
+        graph.ids_with_status("in_progress"),
+        ["task-1", "task-3", "task-4"],
+        "status buckets should keep task order however tasks arrive",
+    )
+    graph.set_status("task-3", "done")
+    assert_equal(
+        [task["status"] for task in graph_tasks],
+        ["in_progress", "pending", "done", "in_progress"],
+        "set_status should write the task dicts the graph indexes",
+    )
+    assert_equal(
+        [graph.status(task["id"]) for task in graph_tasks],
+        [task["status"] for task in graph_tasks],
+        "graph status lookups should read the task dicts",
+    )
+    print("OK: PlanGraph keeps task status in one place and buckets in task order")
+
+    timed = run(["python3", str(FORMATTER), "--no-cache", "--timings"], input_text=large_plan)
+    assert_equal(
+        timed.stdout,
+        streamed.stdout,
+        "--timings should leave the formatter output untouched",
+    )
+    timings = json.loads(timed.stderr)["timings"]
+    assert_equal(
+        sorted(timings["stages"]),
+        ["decode", "read", "render", "validate_spec", "validate_state", "write"],
+        "formatter timings should cover every stage",
+    )
+    assert_true(
+        all(
+            stage["calls"] == 1 and stage["wall_seconds"] >= 0
+            for stage in timings["stages"].values()
+        ),
+        "each stage should report its wall time and call count",
+    )
+    with tempfile.TemporaryDirectory() as profile_dir:
+        profile_path = Path(profile_dir) / "validate.prof.txt"
+        profiled = run(
+            ["python3", str(VALIDATOR), "--no-cache", "--profile", str(profile_path)],
+            input_text=large_plan,
+        )
+        assert_equal((profiled.stdout, profiled.stderr), ("OK\n", ""), "--profile keeps stdout")
+        profile_text = profile_path.read_text(encoding="utf-8")
+        assert_true(
+            profile_text.startswith("tracemalloc peak bytes: ")
+            and "validate_contract_object" in profile_text,
+            "the profile should record the tracemalloc peak and cProfile statistics",
+        )
+    print("OK: --timings and --profile report stages off stdout")
+
 
 if __name__ == "__main__":
     main()
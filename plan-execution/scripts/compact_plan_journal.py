@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Fold a saved plan's transition journal back into its canonical plan/1 JSON."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+from typing import Any
+
+from plan_contract import (
+    StaleContractError,
+    content_hash,
+    journal_path,
+    open_contract_cache,
+    parse_contract_text_cached,
+    plan_write_lock,
+    replace_contract_file,
+    serialize_contract,
+)
+from plan_journal import effective_hash, parse_journal, read_journal_text, replay_journal
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fold a saved plan's <plan>.jsonl transition journal into the plan file."
+    )
+    parser.add_argument("--path", type=Path, required=True, help="Saved plan file to compact.")
+    parser.add_argument(
+        "--expect-hash",
+        help="Fail unless the plan plus journal still has this content hash from a previous read.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the content-hash cache of parsed plan/1 contracts.",
+    )
+    return parser.parse_args()
+
+
+def empty_result(*, path: str) -> dict[str, Any]:
+    return {
+        "ok": False,
+        "path": path,
+        "compacted_entries": 0,
+        "content_hash": None,
+        "stale": False,
+        "errors": [],
+    }
+
+
+def compact_locked(args: argparse.Namespace, path: Path, result: dict[str, Any]) -> int:
+    raw_text = path.read_text(encoding="utf-8")
+    journal_text = read_journal_text(path)
+    current_hash = effective_hash(raw_text, journal_text)
+    if args.expect_hash is not None and args.expect_hash != current_hash:
+        raise StaleContractError(
+            f"plan file changed since it was read: expected {args.expect_hash}, "
+            f"found {current_hash}"
+        )
+    if not journal_text:
+        result["ok"] = True
+        result["content_hash"] = current_hash
+        return 0
+
+    parsed = parse_contract_text_cached(
+        raw_text,
+        from_saved_file=True,
+        cache=open_contract_cache(enabled=not args.no_cache),
+    )
+    if not parsed.ok or parsed.contract is None:
+        result["errors"] = parsed.errors
+        return 2
+    transitions, errors = parse_journal(journal_text, content_hash(raw_text))
+    if not errors:
+        errors = replay_journal(parsed.contract, transitions)
+    if errors:
+        result["errors"] = errors
+        return 2
+
+    result["content_hash"] = replace_contract_file(
+        path,
+        serialize_contract(parsed.contract),
+        expected_hash=content_hash(raw_text),
+    )
+    # Entries carry the old snapshot hash, so a crash before this unlink is detected on read.
+    journal_path(path).unlink()
+    result["compacted_entries"] = len(transitions)
+    result["ok"] = True
+    return 0
+
+
+def build_result(args: argparse.Namespace) -> tuple[dict[str, Any], int]:
+    path = args.path.resolve()
+    result = empty_result(path=str(path))
+    if path.suffix != ".json":
+        result["errors"] = [f"saved plan path must use a .json suffix: {path}"]
+        return result, 2
+    try:
+        with plan_write_lock(path):
+            return result, compact_locked(args, path, result)
+    except StaleContractError as err:
+        result["stale"] = True
+        result["errors"] = [str(err)]
+        return result, 2
+    except OSError as err:
+        result["errors"] = [str(err)]
+        return result, 2
+
+
+def main() -> int:
+    args = parse_args()
+    payload, exit_code = build_result(args)
+    json.dump(payload, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Index the saved plans in a plans directory and answer lookups from the index.
+
+The index maps every `*.json` file to its plan_id, date, phase, current and next tasks,
+task counts, and fingerprints, and flags names outside the `YYYY-MM-DD_<feature-slug>.json`
+convention. Each run re-stats the directory and
+re-reads only plans whose file or journal changed size or mtime, and fully re-validates only
+those whose content hash moved too, so repeat lookups cost a stat per file.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+import datetime
+from functools import partial
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import tempfile
+from typing import Any, Callable
+
+from plan_contract import (
+    PHASES,
+    ContractParseResult,
+    default_cache_dir,
+    journal_path,
+    open_contract_cache,
+    parse_contract_text_cached,
+    validator_version,
+)
+from plan_journal import effective_hash, read_journal_text
+from read_plan_contract import empty_result, read_contract
+
+
+INDEX_VERSION = 1
+PLAN_FILENAME = re.compile(r"(?P<date>\d{4}-\d{2}-\d{2})_(?P<slug>.+)\.json")
+KEBAB_SLUG = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+ENTRY_FIELDS = (
+    "ok",
+    "errors",
+    "schema",
+    "plan_id",
+    "phase",
+    "current_task_ids",
+    "next_task_id",
+    "content_hash",
+    "spec_fingerprint",
+    "state_fingerprint",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Incrementally index saved plan/1 files and query them by plan_id, phase, "
+            "or filename convention."
+        )
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path("docs/plans"),
+        help="Plans directory to index. Defaults to docs/plans.",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        help="Index file. Defaults to a per-directory file under the plan-contract cache dir.",
+    )
+    parser.add_argument(
+        "--plan-id",
+        action="append",
+        help="Only report plans with this plan_id. Repeat for several.",
+    )
+    parser.add_argument(
+        "--phase",
+        action="append",
+        choices=sorted(PHASES),
+        help="Only report plans in this phase. Repeat for several.",
+    )
+    parser.add_argument(
+        "--active",
+        action="store_true",
+        help="Only report valid plans whose phase is not done.",
+    )
+    parser.add_argument(
+        "--naming-violations",
+        action="store_true",
+        help="Only report files that break the YYYY-MM-DD_<kebab-case-slug>.json convention.",
+    )
+    parser.add_argument(
+        "--invalid",
+        action="store_true",
+        help="Only report plans that fail validation.",
+    )
+    refresh = parser.add_mutually_exclusive_group()
+    refresh.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the existing index and re-read every plan.",
+    )
+    refresh.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="Answer from the saved index without checking the directory for changes.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the content-hash cache of parsed plan/1 contracts.",
+    )
+    return parser.parse_args()
+
+
+def naming_errors(name: str) -> tuple[str | None, str | None, list[str]]:
+    """Return the filename's date, slug, and any breaks from the plan naming convention."""
+    match = PLAN_FILENAME.fullmatch(name)
+    if match is None:
+        return None, None, ["filename must match YYYY-MM-DD_<feature-slug>.json"]
+    date, slug = match["date"], match["slug"]
+    errors: list[str] = []
+    try:
+        datetime.date.fromisoformat(date)
+    except ValueError:
+        errors.append(f"filename date {date!r} is not a calendar date")
+    if "_" in slug:
+        errors.append("filename must use exactly one underscore, between the date and the slug")
+    elif not KEBAB_SLUG.fullmatch(slug):
+        errors.append(f"feature slug {slug!r} must be kebab-case")
+    return date, slug, errors
+
+
+def default_index_path(root: Path) -> Path:
+    digest = hashlib.sha256(str(root).encode("utf-8")).hexdigest()[:16]
+    return default_cache_dir() / "index" / f"{digest}.json"
+
+
+def stat_signature(path: Path) -> list[int | None]:
+    """Size and mtime of the plan and its journal; a match means the entry is still fresh."""
+    plan_stat = path.stat()
+    try:
+        journal_stat = journal_path(path).stat()
+    except FileNotFoundError:
+        return [plan_stat.st_size, plan_stat.st_mtime_ns, None, None]
+    return [
+        plan_stat.st_size,
+        plan_stat.st_mtime_ns,
+        journal_stat.st_size,
+        journal_stat.st_mtime_ns,
+    ]
+
+
+def load_index(index_path: Path, root: Path) -> dict[str, Any]:
+    """Return the saved entries, or none when the index is missing, foreign, or stale."""
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(index, dict)
+        or index.get("version") != INDEX_VERSION
+        or index.get("validator_version") != validator_version()
+        or index.get("root") != str(root)
+        or not isinstance(index.get("plans"), dict)
+    ):
+        return {}
+    return index["plans"]
+
+
+def save_index(index_path: Path, index: dict[str, Any]) -> None:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{index_path.name}.", dir=index_path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(index, handle, sort_keys=True, separators=(",", ":"))
+        os.replace(temp_name, index_path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def index_plan(
+    path: Path,
+    signature: list[int | None],
+    previous: dict[str, Any] | None,
+    *,
+    parse: Callable[[str], ContractParseResult],
+) -> tuple[dict[str, Any], bool]:
+    """Return the entry for `path` and whether it had to be re-validated."""
+    try:
+        raw_text = path.read_text(encoding="utf-8")
+    except (OSError, ValueError) as err:
+        payload = empty_result(path=str(path))
+        payload["errors"] = [f"plan file is unreadable: {err}"]
+        return build_entry(path, signature, payload), True
+    if previous is not None and previous["content_hash"] == effective_hash(
+        raw_text, read_journal_text(path)
+    ):
+        # Touched but unchanged, so only the stat signature moves.
+        return {**previous, "stat": signature}, False
+
+    payload, _ = read_contract(raw_text, str(path), parse=parse)
+    return build_entry(path, signature, payload), True
+
+
+def build_entry(
+    path: Path,
+    signature: list[int | None],
+    payload: dict[str, Any],
+) -> dict[str, Any]:
+    date, slug, filename_errors = naming_errors(path.name)
+    contract = payload["contract"]
+    tasks = contract["spec"]["tasks"] if contract is not None else []
+    entry = {field: payload[field] for field in ENTRY_FIELDS}
+    entry.update(
+        {
+            "path": str(path),
+            "date": date,
+            "slug": slug,
+            "naming_errors": filename_errors,
+            "task_count": len(tasks),
+            "task_status_counts": dict(sorted(Counter(task["status"] for task in tasks).items())),
+            "stat": signature,
+        }
+    )
+    return entry
+
+
+def refresh_index(
+    root: Path,
+    previous: dict[str, Any],
+    *,
+    parse: Callable[[str], ContractParseResult],
+) -> tuple[dict[str, Any], dict[str, int]]:
+    plans: dict[str, Any] = {}
+    counts = {"indexed": 0, "reused": 0, "removed": 0}
+    for path in sorted(root.glob("*.json")):
+        if not path.is_file():
+            continue
+        signature = stat_signature(path)
+        entry = previous.get(path.name)
+        if entry is not None and entry.get("stat") == signature:
+            plans[path.name] = entry
+            counts["reused"] += 1
+            continue
+        plans[path.name], revalidated = index_plan(path, signature, entry, parse=parse)
+        counts["indexed" if revalidated else "reused"] += 1
+    counts["removed"] = len(previous.keys() - plans.keys())
+    return plans, counts
+
+
+def plan_id_index(plans: dict[str, Any]) -> dict[str, list[str]]:
+    by_id: dict[str, list[str]] = {}
+    for name, entry in plans.items():
+        if entry["plan_id"] is not None:
+            by_id.setdefault(entry["plan_id"], []).append(name)
+    return by_id
+
+
+def select_plans(args: argparse.Namespace, index: dict[str, Any]) -> list[dict[str, Any]]:
+    plans = index["plans"]
+    if args.plan_id:
+        by_id = index["plan_ids"]
+        names = sorted({name for plan_id in args.plan_id for name in by_id.get(plan_id, [])})
+    else:
+        names = sorted(plans)
+    selected = []
+    for name in names:
+        entry = plans[name]
+        if args.phase and entry["phase"] not in args.phase:
+            continue
+        if args.active and (not entry["ok"] or entry["phase"] == "done"):
+            continue
+        if args.naming_violations and not entry["naming_errors"]:
+            continue
+        if args.invalid and entry["ok"]:
+            continue
+        selected.append({key: value for key, value in entry.items() if key != "stat"})
+    return selected
+
+
+def build_result(args: argparse.Namespace) -> tuple[dict[str, Any], int]:
+    root = args.root.resolve()
+    index_path = (args.index or default_index_path(root)).resolve()
+    result: dict[str, Any] = {
+        "ok": False,
+        "root": str(root),
+        "index": str(index_path),
+        "indexed": 0,
+        "reused": 0,
+        "removed": 0,
+        "plans": [],
+        "errors": [],
+        "warnings": [],
+    }
+    if not root.is_dir():
+        result["errors"] = [f"plans directory does not exist: {root}"]
+        return result, 2
+
+    previous = {} if args.rebuild else load_index(index_path, root)
+    if args.no_refresh and previous:
+        plans, counts = previous, {"indexed": 0, "reused": len(previous), "removed": 0}
+    else:
+        cache = open_contract_cache(enabled=not args.no_cache)
+        parse = partial(parse_contract_text_cached, from_saved_file=True, cache=cache)
+        try:
+            plans, counts = refresh_index(root, previous, parse=parse)
+        except OSError as err:
+            result["errors"] = [str(err)]
+            return result, 2
+    index = {
+        "version": INDEX_VERSION,
+        "validator_version": validator_version(),
+        "root": str(root),
+        "plans": plans,
+        "plan_ids": plan_id_index(plans),
+    }
+    if counts["indexed"] or counts["removed"] or plans != previous:
+        try:
+            save_index(index_path, index)
+        except OSError as err:
+            # A read-only cache only costs the next run its incremental head start.
+            result["warnings"] = [f"index not saved: {err}"]
+    result.update(counts)
+    result["ok"] = True
+    result["plans"] = select_plans(args, index)
+    return result, 0
+
+
+def main() -> int:
+    args = parse_args()
+    payload, exit_code = build_result(args)
+    json.dump(payload, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
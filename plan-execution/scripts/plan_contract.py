@@ -2,12 +2,34 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
-from typing import Any
+import marshal
+import math
+import os
+import re
+import socket
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from json.encoder import encode_basestring_ascii
+from operator import lt
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX runtimes write without the advisory lock
+    fcntl = None  # type: ignore[assignment]
 
 
 SCHEMA = "plan/1"
+# plan/2 is plan/1 plus `spec.max_parallel` and a `state.current_task_ids` list that
+# replaces `state.current_task_id`, so independent branches can run in parallel lanes.
+PARALLEL_SCHEMA = "plan/2"
+SCHEMAS = {SCHEMA, PARALLEL_SCHEMA}
 PHASES = {
     "planning",
     "ready",
@@ -44,6 +66,7 @@ TASK_KEYS = {
     "verification",
     "depends_on",
 }
+PARALLEL_SPEC_KEYS = SPEC_KEYS | {"max_parallel"}
 REPLAN_POLICY_KEYS = {"owner", "triggers"}
 STATE_KEYS = {
     "phase",
@@ -55,6 +78,138 @@ STATE_KEYS = {
     "replan_reason",
     "context_snapshot",
 }
+PARALLEL_STATE_KEYS = (STATE_KEYS - {"current_task_id"}) | {"current_task_ids"}
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_ENTRY_SUFFIX = ".marshal"
+SERVER_SOCKET_ENV = "PLAN_CONTRACT_SOCKET"
+STREAM_MAX_BYTES = 256 * 1024 * 1024
+STREAM_MAX_DEPTH = 256
+UTF8_LENGTH_CHUNK = 1 << 20
+FREEFORM_MAX_DEPTH = 256
+SERVER_TIMEOUT_SECONDS = 5.0
+TIMINGS_ENV = "PLAN_CONTRACT_TIMINGS"
+PROFILE_ENV = "PLAN_CONTRACT_PROFILE"
+PROFILE_STATS_LIMIT = 40
+
+
+class StageTimings:
+    """Wall and CPU seconds spent in each named stage; nested stages count inclusively."""
+
+    def __init__(self) -> None:
+        self.stages: dict[str, list[float]] = {}
+        self.started = (time.perf_counter(), time.process_time())
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.stages.setdefault(name, [0.0, 0.0, 0])
+            totals[0] += time.perf_counter() - wall
+            totals[1] += time.process_time() - cpu
+            totals[2] += 1
+
+    def report(self) -> dict[str, Any]:
+        wall, cpu = self.started
+        return {
+            "total": {
+                "wall_seconds": round(time.perf_counter() - wall, 6),
+                "cpu_seconds": round(time.process_time() - cpu, 6),
+            },
+            "stages": {
+                name: {
+                    "wall_seconds": round(stage_wall, 6),
+                    "cpu_seconds": round(stage_cpu, 6),
+                    "calls": int(calls),
+                }
+                for name, (stage_wall, stage_cpu, calls) in self.stages.items()
+            },
+        }
+
+
+_STAGE_TIMINGS: StageTimings | None = None
+_NO_STAGE = nullcontext()
+
+
+def timed_stage(name: str) -> Any:
+    """Time the enclosed block under `name` while `instrumented` is active; free otherwise."""
+    if _STAGE_TIMINGS is None:
+        return _NO_STAGE
+    return _STAGE_TIMINGS.stage(name)
+
+
+def write_report(destination: str, text: str, *, label: str, mode: str = "a") -> None:
+    # "1" lets `PLAN_CONTRACT_TIMINGS=1` mean stderr like `--timings` without a path does.
+    if destination in {"-", "1"}:
+        sys.stderr.write(text)
+        return
+    try:
+        with open(destination, mode, encoding="utf-8") as handle:
+            handle.write(text)
+    except OSError as err:
+        print(f"plan/1 {label} not written: {err}", file=sys.stderr)
+
+
+@contextmanager
+def instrumented(*, timings: str | None, profile: str | None) -> Iterator[None]:
+    """Collect per-stage timings and an optional cProfile and tracemalloc report.
+
+    `timings` is "-" for stderr or a file that gets one JSON line appended per run;
+    `profile` is "-" for stderr or a file overwritten with the cProfile statistics and
+    tracemalloc peak. Either
+    defaults to `$PLAN_CONTRACT_TIMINGS` or `$PLAN_CONTRACT_PROFILE`. Nothing is written to
+    stdout, so every helper keeps its output contract.
+    """
+    global _STAGE_TIMINGS
+    timings = timings or os.environ.get(TIMINGS_ENV) or None
+    profile = profile or os.environ.get(PROFILE_ENV) or None
+    if timings is None and profile is None:
+        yield
+        return
+
+    previous = _STAGE_TIMINGS
+    _STAGE_TIMINGS = StageTimings()
+    profiler = None
+    if profile is not None:
+        # Imported here so uninstrumented runs do not pay for them at startup.
+        import cProfile
+        import tracemalloc
+
+        tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            write_profile(profile, profiler)
+        if timings is not None:
+            report = {"timings": _STAGE_TIMINGS.report()}
+            write_report(timings, f"{json.dumps(report, sort_keys=True)}\n", label="timings")
+        _STAGE_TIMINGS = previous
+
+
+def write_profile(destination: str, profiler: Any) -> None:
+    import io
+    import pstats
+    import tracemalloc
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("cumulative").print_stats(PROFILE_STATS_LIMIT)
+    report = f"tracemalloc peak bytes: {peak}\n{stream.getvalue()}"
+    write_report(destination, report, label="profile", mode="w")
+
+
+# Only the parse functions in this module hold this token, so a result carrying it was
+# validated in this process rather than rebuilt from cache bytes or a server reply.
+_VALIDATED = object()
+
+
 @dataclass(frozen=True)
 class ContractParseResult:
     ok: bool
@@ -62,14 +217,80 @@ class ContractParseResult:
     tail: str
     errors: list[str]
     migration_required: bool
+    validated_by: object = field(default=None, repr=False, compare=False)
 
 
-def normalize_freeform(value: Any) -> Any:
-    if isinstance(value, dict):
-        return {key: normalize_freeform(value[key]) for key in sorted(value)}
-    if isinstance(value, list):
-        return [normalize_freeform(item) for item in value]
-    return value
+PARSE_RESULT_FIELDS = ("ok", "contract", "tail", "errors", "migration_required")
+
+
+def parse_result_from_payload(payload: Any) -> ContractParseResult | None:
+    """Rebuild a result from cache or server data; it never counts as validated here."""
+    if not isinstance(payload, dict) or set(payload) != set(PARSE_RESULT_FIELDS):
+        return None
+    return ContractParseResult(**payload)
+
+
+def normalize_freeform(value: Any, *, max_depth: int = FREEFORM_MAX_DEPTH) -> Any:
+    """Return `value` with every object's keys sorted, reusing already-canonical containers.
+
+    Walks an explicit stack instead of recursing and raises ValueError past `max_depth`
+    levels. Input whose keys already come back in order is returned as-is without a copy;
+    otherwise only the containers that need a change are rebuilt.
+    """
+    if not isinstance(value, (dict, list)):
+        return value
+    containers: list[Any] = []
+    stack = [(value, 1)]
+    canonical = True
+    while stack:
+        node, depth = stack.pop()
+        if depth > max_depth:
+            raise ValueError(f"nests deeper than the limit of {max_depth} levels")
+        containers.append(node)
+        if isinstance(node, dict):
+            if canonical:
+                keys = list(node)
+                canonical = all(map(lt, keys, keys[1:]))
+            children = node.values()
+        else:
+            children = node
+        stack.extend((child, depth + 1) for child in children if isinstance(child, (dict, list)))
+    if canonical:
+        return value
+
+    # Pre-order reversed visits every child container before its parent. Only containers
+    # are keyed here, so `get(id(child), child)` passes scalars through unchanged.
+    normalized: dict[int, Any] = {}
+    get = normalized.get
+    for node in reversed(containers):
+        if isinstance(node, dict):
+            keys = list(node)
+            if all(map(lt, keys, keys[1:])) and all(get(id(c), c) is c for c in node.values()):
+                normalized[id(node)] = node
+            else:
+                normalized[id(node)] = {key: get(id(node[key]), node[key]) for key in sorted(keys)}
+        elif all(get(id(child), child) is child for child in node):
+            normalized[id(node)] = node
+        else:
+            normalized[id(node)] = [get(id(child), child) for child in node]
+    return normalized[id(value)]
+
+
+def normalize_freeform_object(
+    value: Any,
+    label: str,
+    errors: list[str],
+    *,
+    max_depth: int = FREEFORM_MAX_DEPTH,
+) -> dict[str, Any] | None:
+    if not isinstance(value, dict):
+        errors.append(f"{label} must be a JSON object")
+        return None
+    try:
+        return normalize_freeform(value, max_depth=max_depth)
+    except ValueError as err:
+        errors.append(f"{label} {err}")
+        return None
 
 
 def normalize_string(value: Any, label: str, errors: list[str]) -> str | None:
@@ -201,10 +422,340 @@ def validate_task(task: Any, index: int, errors: list[str]) -> dict[str, Any] |
     }
 
 
-def validate_spec(value: Any, errors: list[str]) -> dict[str, Any] | None:
-    obj = expect_exact_keys(value, "spec", SPEC_KEYS, errors)
-    if obj is None:
+# Ordered (key, kind, allowed values) rules the compiled fast paths are generated from. Kinds:
+# "string" is a non-empty string, "list" an array of non-empty strings, "non_empty_list" the
+# same with at least one item. Output dicts follow rule order, matching the validators above.
+TASK_FIELD_RULES: tuple[tuple[str, str, frozenset[str] | None], ...] = (
+    ("id", "string", None),
+    ("title", "string", None),
+    ("status", "string", frozenset(TASK_STATUSES)),
+    ("objective", "string", None),
+    ("inputs", "list", None),
+    ("outputs", "list", None),
+    ("verification", "non_empty_list", None),
+    ("depends_on", "list", None),
+)
+REPLAN_POLICY_FIELD_RULES: tuple[tuple[str, str, frozenset[str] | None], ...] = (
+    ("owner", "string", None),
+    ("triggers", "non_empty_list", None),
+)
+
+
+def compile_record_normalizer(
+    name: str,
+    rules: tuple[tuple[str, str, frozenset[str] | None], ...],
+) -> Callable[[Any], dict[str, Any] | None]:
+    """Compile field rules into a straight-line normalizer for records that are fully valid.
+
+    The generated function formats no labels and records no errors: it returns None as soon
+    as anything is off (including dict subclasses), and callers rerun the interpreter-style
+    validator to report the exact errors.
+    """
+    namespace: dict[str, Any] = {}
+    lines = [
+        f"def {name}(obj):",
+        f"    if obj.__class__ is not dict or len(obj) != {len(rules)}:",
+        "        return None",
+        # str.strip raises TypeError for anything that is not a string, as a missing key
+        # raises KeyError; either way the record falls back to the labeled validator.
+        "    try:",
+    ]
+    for index, (key, kind, choices) in enumerate(rules):
+        value = f"v{index}"
+        if kind == "string":
+            lines.extend(
+                [
+                    f"        {value} = str.strip(obj[{key!r}])",
+                    f"        if not {value}:",
+                    "            return None",
+                ]
+            )
+            if choices is not None:
+                namespace[f"choices_{index}"] = choices
+                lines.extend([f"        if {value} not in choices_{index}:", "            return None"])
+        elif kind in {"list", "non_empty_list"}:
+            lines.extend(
+                [
+                    f"        {value} = obj[{key!r}]",
+                    f"        if {value}.__class__ is not list:",
+                    "            return None",
+                    f"        {value} = list(map(str.strip, {value}))",
+                    f"        if '' in {value}:",
+                    "            return None",
+                ]
+            )
+            if kind == "non_empty_list":
+                lines.extend([f"        if not {value}:", "            return None"])
+        else:
+            raise ValueError(f"unknown field rule kind: {kind}")
+    lines.extend(["    except (KeyError, TypeError):", "        return None"])
+    fields = ", ".join(f"{key!r}: v{index}" for index, (key, _, _) in enumerate(rules))
+    lines.append(f"    return {{{fields}}}")
+    exec(compile("\n".join(lines), f"<compiled {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+# Only tasks repeat enough to repay compilation. `state` is one record per parse and takes
+# about 25 microseconds of a 5000-task validation, so it keeps the interpreted validator.
+compiled_task = compile_record_normalizer("compiled_task", TASK_FIELD_RULES)
+compiled_replan_policy = compile_record_normalizer(
+    "compiled_replan_policy",
+    REPLAN_POLICY_FIELD_RULES,
+)
+
+
+def dependency_cycles(
+    nodes: list[str],
+    dependents: dict[str, list[str]],
+    position: dict[str, int],
+) -> list[list[str]]:
+    # Iterative Tarjan so deep dependency chains cannot hit the recursion limit.
+    members = set(nodes)
+    index_of: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    cycles: list[list[str]] = []
+    for root in nodes:
+        if root in index_of:
+            continue
+        index_of[root] = lowlink[root] = len(index_of)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(dependents[root]))]
+        while work:
+            node, edges = work[-1]
+            descended = False
+            for target in edges:
+                if target not in members:
+                    continue
+                if target not in index_of:
+                    index_of[target] = lowlink[target] = len(index_of)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(dependents[target])))
+                    descended = True
+                    break
+                if target in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[target])
+            if descended:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] != index_of[node]:
+                continue
+            component: list[str] = []
+            while True:
+                member = stack.pop()
+                on_stack.discard(member)
+                component.append(member)
+                if member == node:
+                    break
+            if len(component) > 1:
+                cycles.append(sorted(component, key=position.__getitem__))
+    cycles.sort(key=lambda component: position[component[0]])
+    return cycles
+
+
+class PlanGraph:
+    """Index over a normalized task list, built once and queried in O(1) per lookup.
+
+    Holds status buckets, forward and reverse dependency edges, per-task counters of
+    dependencies that are not yet done, and the set of pending tasks that are executable.
+    Each task dict's `status` stays the one authoritative copy; `set_status` writes it and
+    keeps every view in step so schedulers can advance the graph incrementally. Buckets
+    keep task order, so listing one never sorts.
+    """
+
+    def __init__(self, tasks: list[dict[str, Any]]) -> None:
+        self.tasks = tasks
+        self.task_by_id = {task["id"]: task for task in tasks}
+        self.position = {task["id"]: index for index, task in enumerate(tasks)}
+        self.by_status: dict[str, dict[str, None]] = {status: {} for status in TASK_STATUSES}
+        self.dependencies: dict[str, list[str]] = {}
+        self.dependents: dict[str, list[str]] = {task_id: [] for task_id in self.task_by_id}
+        self.unsatisfied_count: dict[str, int] = {}
+        self.ready: dict[str, None] = {}
+        by_status = self.by_status
+        task_by_id = self.task_by_id
+        dependents_by_id = self.dependents
+        for task in tasks:
+            task_id = task["id"]
+            status = task["status"]
+            by_status.setdefault(status, {})[task_id] = None
+            dependencies = list(dict.fromkeys(task["depends_on"]))
+            self.dependencies[task_id] = dependencies
+            unsatisfied = 0
+            for dependency in dependencies:
+                dependents = dependents_by_id.get(dependency)
+                if dependents is not None:
+                    dependents.append(task_id)
+                # Unknown ids never become done, so they stay unsatisfied like the spec error says.
+                dependency_task = task_by_id.get(dependency)
+                if dependency_task is None or dependency_task["status"] != "done":
+                    unsatisfied += 1
+            self.unsatisfied_count[task_id] = unsatisfied
+            if status == "pending" and unsatisfied == 0:
+                self.ready[task_id] = None
+
+    def status(self, task_id: str) -> str | None:
+        task = self.task_by_id.get(task_id)
+        return None if task is None else task["status"]
+
+    def count(self, status: str) -> int:
+        return len(self.by_status.get(status, ()))
+
+    def ids_with_status(self, status: str) -> list[str]:
+        return list(self.by_status.get(status, ()))
+
+    def dependents_of(self, task_id: str) -> list[str]:
+        return self.dependents.get(task_id, [])
+
+    def unsatisfied_dependencies(self, task_id: str) -> list[str]:
+        if self.unsatisfied_count[task_id] == 0:
+            return []
+        return [
+            dependency
+            for dependency in self.task_by_id[task_id]["depends_on"]
+            if self.status(dependency) != "done"
+        ]
+
+    def is_executable(self, task_id: str) -> bool:
+        return task_id in self.ready
+
+    def ready_ids(self) -> list[str]:
+        return sorted(self.ready, key=self.position.__getitem__)
+
+    def set_status(self, task_id: str, status: str) -> list[str]:
+        """Move one task to `status` and return the pending tasks this made executable."""
+        task = self.task_by_id[task_id]
+        previous = task["status"]
+        if previous == status:
+            return []
+        del self.by_status[previous][task_id]
+        self.add_to_bucket(status, task_id)
+        task["status"] = status
+        if previous == "pending":
+            self.ready.pop(task_id, None)
+        elif status == "pending" and self.unsatisfied_count[task_id] == 0:
+            self.ready[task_id] = None
+
+        unblocked: list[str] = []
+        if status == "done":
+            for dependent in self.dependents[task_id]:
+                self.unsatisfied_count[dependent] -= 1
+                if (
+                    self.unsatisfied_count[dependent] == 0
+                    and self.task_by_id[dependent]["status"] == "pending"
+                ):
+                    self.ready[dependent] = None
+                    unblocked.append(dependent)
+        elif previous == "done":
+            for dependent in self.dependents[task_id]:
+                self.unsatisfied_count[dependent] += 1
+                self.ready.pop(dependent, None)
+        return unblocked
+
+    def add_to_bucket(self, status: str, task_id: str) -> None:
+        bucket = self.by_status.setdefault(status, {})
+        position = self.position
+        if bucket and position[next(reversed(bucket))] > position[task_id]:
+            # Rare: a task moved back behind a later one; rebuild the bucket in task order.
+            ordered = sorted([*bucket, task_id], key=position.__getitem__)
+            self.by_status[status] = dict.fromkeys(ordered)
+        else:
+            bucket[task_id] = None
+
+    def topological_order(self) -> tuple[list[str], list[list[str]]]:
+        """Return task ids in deterministic dependency order plus every dependency cycle.
+
+        Unknown and self-referencing dependencies are ignored here because `validate_spec`
+        reports them separately. Tasks inside or downstream of a cycle are left out of the
+        order.
+        """
+        edges: dict[str, list[str]] = {task_id: [] for task_id in self.task_by_id}
+        remaining = dict.fromkeys(self.task_by_id, 0)
+        for task_id, dependents in self.dependents.items():
+            for dependent in dependents:
+                if dependent == task_id:
+                    continue
+                edges[task_id].append(dependent)
+                remaining[dependent] += 1
+
+        queue = deque(task_id for task_id in self.task_by_id if remaining[task_id] == 0)
+        order: list[str] = []
+        while queue:
+            task_id = queue.popleft()
+            order.append(task_id)
+            for dependent in edges[task_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        if len(order) == len(self.task_by_id):
+            return order, []
+
+        unresolved = [task_id for task_id in self.task_by_id if remaining[task_id] > 0]
+        return order, dependency_cycles(unresolved, edges, self.position)
+
+
+def topological_task_order(tasks: list[dict[str, Any]]) -> tuple[list[str], list[list[str]]]:
+    return PlanGraph(tasks).topological_order()
+
+
+def declared_schema(spec: Any) -> str:
+    """Return the schema a raw spec claims, falling back to plan/1 for unknown values."""
+    if isinstance(spec, dict):
+        schema = spec.get("schema")
+        if isinstance(schema, str) and schema.strip() in SCHEMAS:
+            return schema.strip()
+    return SCHEMA
+
+
+def validate_max_parallel(value: Any, errors: list[str]) -> int | None:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        errors.append("spec.max_parallel must be a positive integer")
         return None
+    return value
+
+
+def validate_spec(
+    value: Any,
+    errors: list[str],
+    *,
+    compiled: bool = True,
+    prenormalized: bool = False,
+    max_depth: int = FREEFORM_MAX_DEPTH,
+) -> dict[str, Any] | None:
+    return validate_spec_graph(
+        value,
+        errors,
+        compiled=compiled,
+        prenormalized=prenormalized,
+        max_depth=max_depth,
+    )[0]
+
+
+def validate_spec_graph(
+    value: Any,
+    errors: list[str],
+    *,
+    compiled: bool = True,
+    prenormalized: bool = False,
+    max_depth: int = FREEFORM_MAX_DEPTH,
+) -> tuple[dict[str, Any] | None, PlanGraph | None]:
+    """Validate `spec` and also return the dependency graph built for the cycle check."""
+    graph: PlanGraph | None = None
+    parallel = declared_schema(value) == PARALLEL_SCHEMA
+    obj = expect_exact_keys(
+        value,
+        "spec",
+        PARALLEL_SPEC_KEYS if parallel else SPEC_KEYS,
+        errors,
+    )
+    if obj is None:
+        return None, None
 
     schema = normalize_string(obj.get("schema"), "spec.schema", errors)
     plan_id = normalize_string(obj.get("plan_id"), "spec.plan_id", errors)
@@ -222,11 +773,12 @@ def validate_spec(value: Any, errors: list[str]) -> dict[str, Any] | None:
         allow_empty=True,
     )
     defaults_obj = obj.get("defaults")
-    if not isinstance(defaults_obj, dict):
-        errors.append("spec.defaults must be a JSON object")
-        defaults = None
+    if prenormalized and isinstance(defaults_obj, dict):
+        defaults = defaults_obj
     else:
-        defaults = normalize_freeform(defaults_obj)
+        defaults = normalize_freeform_object(
+            defaults_obj, "spec.defaults", errors, max_depth=max_depth
+        )
     tasks_obj = obj.get("tasks")
     if not isinstance(tasks_obj, list):
         errors.append("spec.tasks must be an array")
@@ -235,7 +787,12 @@ def validate_spec(value: Any, errors: list[str]) -> dict[str, Any] | None:
         tasks = []
         seen_ids: set[str] = set()
         for index, task in enumerate(tasks_obj):
-            normalized_task = validate_task(task, index, errors)
+            if prenormalized:
+                normalized_task = task
+            else:
+                normalized_task = compiled_task(task) if compiled else None
+            if normalized_task is None:
+                normalized_task = validate_task(task, index, errors)
             if normalized_task is None:
                 continue
             task_id = normalized_task["id"]
@@ -258,10 +815,23 @@ def validate_spec(value: Any, errors: list[str]) -> dict[str, Any] | None:
                         errors.append(
                             f"spec.tasks[{index}].depends_on must not reference its own task id"
                         )
+            graph = PlanGraph(tasks)
+            _, cycles = graph.topological_order()
+            for cycle in cycles:
+                errors.append(
+                    f"spec.tasks depends_on must be acyclic; cycle among task ids: {cycle}"
+                )
 
-    replan_policy = validate_replan_policy(obj.get("replan_policy"), errors)
-    if schema is not None and schema != SCHEMA:
-        errors.append(f"spec.schema must be exactly {SCHEMA!r}")
+    max_parallel = validate_max_parallel(obj.get("max_parallel"), errors) if parallel else 1
+    replan_policy = compiled_replan_policy(obj.get("replan_policy")) if compiled else None
+    if replan_policy is None:
+        replan_policy = validate_replan_policy(obj.get("replan_policy"), errors)
+    if schema is not None and schema not in SCHEMAS:
+        # Only specs already shaped like plan/2 hear about it; plan/1 keeps its message.
+        if "max_parallel" in obj:
+            errors.append(f"spec.schema must be one of: {sorted(SCHEMAS)}")
+        else:
+            errors.append(f"spec.schema must be exactly {SCHEMA!r}")
 
     if None in (
         schema,
@@ -270,36 +840,64 @@ def validate_spec(value: Any, errors: list[str]) -> dict[str, Any] | None:
         success_criteria,
         constraints,
         defaults,
+        max_parallel,
         tasks,
         replan_policy,
     ):
-        return None
+        return None, None
 
-    return {
+    normalized: dict[str, Any] = {
         "schema": schema,
         "plan_id": plan_id,
         "goal": goal,
         "success_criteria": success_criteria,
         "constraints": constraints,
         "defaults": defaults,
-        "tasks": tasks,
-        "replan_policy": replan_policy,
     }
+    if parallel:
+        normalized["max_parallel"] = max_parallel
+    normalized["tasks"] = tasks
+    normalized["replan_policy"] = replan_policy
+    return normalized, graph
 
 
 def validate_state(
     value: Any,
     tasks: list[dict[str, Any]],
     errors: list[str],
+    *,
+    schema: str = SCHEMA,
+    max_parallel: int = 1,
+    graph: PlanGraph | None = None,
+    prenormalized: bool = False,
+    max_depth: int = FREEFORM_MAX_DEPTH,
 ) -> dict[str, Any] | None:
-    obj = expect_exact_keys(value, "state", STATE_KEYS, errors)
+    parallel = schema == PARALLEL_SCHEMA
+    obj = expect_exact_keys(
+        value,
+        "state",
+        PARALLEL_STATE_KEYS if parallel else STATE_KEYS,
+        errors,
+    )
     if obj is None:
         return None
 
     phase = normalize_string(obj.get("phase"), "state.phase", errors)
-    current_task_id = normalize_optional_string(
-        obj.get("current_task_id"), "state.current_task_id", errors
-    )
+    if parallel:
+        current_label = "state.current_task_ids"
+        current_cleared = "to be empty"
+        current_task_ids = normalize_string_list(
+            obj.get("current_task_ids"), current_label, errors, allow_empty=True
+        )
+        if current_task_ids is not None and len(set(current_task_ids)) != len(current_task_ids):
+            errors.append("state.current_task_ids must not contain duplicate task ids")
+    else:
+        current_label = "state.current_task_id"
+        current_cleared = "to be null"
+        current_task_id = normalize_optional_string(
+            obj.get("current_task_id"), current_label, errors
+        )
+        current_task_ids = [] if current_task_id is None else [current_task_id]
     next_task_id = normalize_optional_string(
         obj.get("next_task_id"), "state.next_task_id", errors
     )
@@ -314,17 +912,19 @@ def validate_state(
         obj.get("replan_reason"), "state.replan_reason", errors
     )
     context_snapshot_obj = obj.get("context_snapshot")
-    if not isinstance(context_snapshot_obj, dict):
-        errors.append("state.context_snapshot must be a JSON object")
-        context_snapshot = None
+    if prenormalized and isinstance(context_snapshot_obj, dict):
+        context_snapshot = context_snapshot_obj
     else:
-        context_snapshot = normalize_freeform(context_snapshot_obj)
+        context_snapshot = normalize_freeform_object(
+            context_snapshot_obj, "state.context_snapshot", errors, max_depth=max_depth
+        )
 
     if phase is not None and phase not in PHASES:
         errors.append(f"state.phase must be one of: {sorted(PHASES)}")
 
     if None in (
         phase,
+        current_task_ids,
         blockers,
         evidence,
         last_updated,
@@ -332,40 +932,45 @@ def validate_state(
     ):
         return None
 
-    task_by_id = {task["id"]: task for task in tasks}
-
-    def unsatisfied_dependencies(task_id: str) -> list[str]:
-        task = task_by_id[task_id]
-        return [
-            dependency
-            for dependency in task["depends_on"]
-            if task_by_id[dependency]["status"] != "done"
-        ]
-
-    in_progress_ids = [task["id"] for task in tasks if task["status"] == "in_progress"]
-    blocked_ids = [task["id"] for task in tasks if task["status"] == "blocked"]
-    pending_ids = [task["id"] for task in tasks if task["status"] == "pending"]
+    if graph is None:
+        graph = PlanGraph(tasks)
+    task_by_id = graph.task_by_id
+    in_progress_ids = graph.ids_with_status("in_progress")
+    blocked_ids = graph.ids_with_status("blocked")
+    has_pending = graph.count("pending") > 0
     terminal_statuses = {"done", "cancelled"}
 
-    if len(in_progress_ids) > 1:
+    current_labels = [
+        f"{current_label}[{index}]" if parallel else current_label
+        for index in range(len(current_task_ids))
+    ]
+
+    if parallel and len(in_progress_ids) > max_parallel:
+        errors.append(
+            f"spec.max_parallel allows at most {max_parallel} tasks with status 'in_progress'"
+        )
+    elif not parallel and len(in_progress_ids) > 1:
         errors.append("spec.tasks may contain at most one task with status 'in_progress'")
-    if current_task_id is not None and current_task_id not in task_by_id:
-        errors.append("state.current_task_id must reference an existing task id")
+    for label, current_task_id in zip(current_labels, current_task_ids):
+        if current_task_id not in task_by_id:
+            errors.append(f"{label} must reference an existing task id")
     if next_task_id is not None and next_task_id not in task_by_id:
         errors.append("state.next_task_id must reference an existing task id")
     if next_task_id is not None and next_task_id in task_by_id:
         next_status = task_by_id[next_task_id]["status"]
         if next_status in terminal_statuses:
             errors.append("state.next_task_id must not reference a terminal task")
-    if current_task_id is not None and current_task_id in task_by_id:
+    for label, current_task_id in zip(current_labels, current_task_ids):
+        if current_task_id not in task_by_id:
+            continue
         current_status = task_by_id[current_task_id]["status"]
         if current_status in terminal_statuses:
-            errors.append("state.current_task_id must not reference a terminal task")
+            errors.append(f"{label} must not reference a terminal task")
         elif phase in {"executing", "blocked", "needs_replan"}:
-            unsatisfied = unsatisfied_dependencies(current_task_id)
+            unsatisfied = graph.unsatisfied_dependencies(current_task_id)
             if unsatisfied:
                 errors.append(
-                    "state.current_task_id must reference a task whose dependencies are done; "
+                    f"{label} must reference a task whose dependencies are done; "
                     f"unsatisfied dependencies: {unsatisfied}"
                 )
 
@@ -374,8 +979,8 @@ def validate_state(
             errors.append("state.phase 'planning' cannot have in-progress tasks")
         if blocked_ids:
             errors.append("state.phase 'planning' cannot have blocked tasks")
-        if current_task_id is not None:
-            errors.append("state.phase 'planning' requires state.current_task_id to be null")
+        if current_task_ids:
+            errors.append(f"state.phase 'planning' requires {current_label} {current_cleared}")
         if blockers:
             errors.append("state.phase 'planning' requires state.blockers to be empty")
         if replan_reason is not None:
@@ -385,19 +990,22 @@ def validate_state(
             errors.append("state.phase 'ready' cannot have in-progress tasks")
         if blocked_ids:
             errors.append("state.phase 'ready' cannot have blocked tasks")
-        if current_task_id is not None:
-            errors.append("state.phase 'ready' requires state.current_task_id to be null")
+        if current_task_ids:
+            errors.append(f"state.phase 'ready' requires {current_label} {current_cleared}")
         if blockers:
             errors.append("state.phase 'ready' requires state.blockers to be empty")
         if replan_reason is not None:
             errors.append("state.phase 'ready' requires state.replan_reason to be null")
-        if pending_ids:
+        if has_pending:
             if next_task_id is None:
                 errors.append("state.phase 'ready' requires state.next_task_id")
+            elif next_task_id not in task_by_id:
+                # Already reported as an unknown task id above.
+                pass
             elif task_by_id[next_task_id]["status"] != "pending":
                 errors.append("state.phase 'ready' requires state.next_task_id to reference a pending task")
             else:
-                unsatisfied = unsatisfied_dependencies(next_task_id)
+                unsatisfied = graph.unsatisfied_dependencies(next_task_id)
                 if unsatisfied:
                     errors.append(
                         "state.phase 'ready' requires state.next_task_id to reference an executable task; "
@@ -406,9 +1014,17 @@ def validate_state(
         else:
             errors.append("state.phase 'ready' requires at least one pending task")
     elif phase == "executing":
-        if len(in_progress_ids) != 1:
+        if parallel:
+            if not in_progress_ids:
+                errors.append("state.phase 'executing' requires at least one in-progress task")
+            elif set(current_task_ids) != set(in_progress_ids):
+                errors.append(
+                    "state.phase 'executing' requires state.current_task_ids to match the "
+                    "in-progress tasks"
+                )
+        elif len(in_progress_ids) != 1:
             errors.append("state.phase 'executing' requires exactly one in-progress task")
-        elif current_task_id != in_progress_ids[0]:
+        elif current_task_ids != in_progress_ids:
             errors.append(
                 "state.phase 'executing' requires state.current_task_id to match the in-progress task"
             )
@@ -423,11 +1039,15 @@ def validate_state(
             errors.append("state.phase 'blocked' cannot have in-progress tasks")
         if not blocked_ids:
             errors.append("state.phase 'blocked' requires at least one blocked task")
-        if current_task_id is None:
-            errors.append("state.phase 'blocked' requires state.current_task_id")
-        elif current_task_id in task_by_id and task_by_id[current_task_id]["status"] != "blocked":
+        if not current_task_ids:
+            errors.append(f"state.phase 'blocked' requires {current_label}")
+        elif any(
+            task_id in task_by_id and task_by_id[task_id]["status"] != "blocked"
+            for task_id in current_task_ids
+        ):
             errors.append(
-                "state.phase 'blocked' requires state.current_task_id to reference a blocked task"
+                f"state.phase 'blocked' requires {current_label} to reference "
+                + ("blocked tasks" if parallel else "a blocked task")
             )
         if not blockers:
             errors.append("state.phase 'blocked' requires at least one blocker reason")
@@ -441,8 +1061,8 @@ def validate_state(
                 "state.phase 'needs_replan' requires blocker evidence or a blocked task"
             )
     elif phase == "done":
-        if current_task_id is not None:
-            errors.append("state.phase 'done' requires state.current_task_id to be null")
+        if current_task_ids:
+            errors.append(f"state.phase 'done' requires {current_label} {current_cleared}")
         if next_task_id is not None:
             errors.append("state.phase 'done' requires state.next_task_id to be null")
         if blockers:
@@ -450,7 +1070,9 @@ def validate_state(
         if replan_reason is not None:
             errors.append("state.phase 'done' requires state.replan_reason to be null")
         unfinished = [
-            task["id"] for task in tasks if task["status"] not in terminal_statuses
+            task_id
+            for task_id in graph.task_by_id
+            if graph.status(task_id) not in terminal_statuses
         ]
         if unfinished:
             errors.append(
@@ -458,27 +1080,61 @@ def validate_state(
                 + ", ".join(unfinished)
             )
 
-    return {
-        "phase": phase,
-        "current_task_id": current_task_id,
-        "next_task_id": next_task_id,
-        "blockers": blockers,
-        "evidence": evidence,
-        "last_updated": last_updated,
-        "replan_reason": replan_reason,
-        "context_snapshot": context_snapshot,
-    }
+    normalized: dict[str, Any] = {"phase": phase}
+    if parallel:
+        normalized["current_task_ids"] = current_task_ids
+    else:
+        normalized["current_task_id"] = current_task_id
+    normalized["next_task_id"] = next_task_id
+    normalized["blockers"] = blockers
+    normalized["evidence"] = evidence
+    normalized["last_updated"] = last_updated
+    normalized["replan_reason"] = replan_reason
+    normalized["context_snapshot"] = context_snapshot
+    return normalized
 
 
-def validate_contract_object(obj: Any) -> tuple[dict[str, Any] | None, list[str]]:
+def validate_contract_object(
+    obj: Any,
+    *,
+    compiled: bool = True,
+    prenormalized: bool = False,
+    max_depth: int = FREEFORM_MAX_DEPTH,
+) -> tuple[dict[str, Any] | None, list[str]]:
+    """Validate and normalize a decoded contract.
+
+    `compiled=False` skips the compiled fast paths and runs only the interpreter-style
+    validators; both modes produce identical output and errors. `prenormalized=True` is for
+    `parse_contract_stream`, whose `spec.tasks` items and freeform objects are already in
+    normalized form and are kept as-is instead of being copied again. `spec.defaults` and
+    `state.context_snapshot` nested deeper than `max_depth` levels are rejected.
+    Already-canonical freeform objects are shared with `obj` rather than copied.
+    """
     errors: list[str] = []
     top = expect_exact_keys(obj, "plan/1", TOP_LEVEL_KEYS, errors)
     if top is None:
         return None, errors
 
-    spec = validate_spec(top.get("spec"), errors)
+    with timed_stage("validate_spec"):
+        spec, graph = validate_spec_graph(
+            top.get("spec"),
+            errors,
+            compiled=compiled,
+            prenormalized=prenormalized,
+            max_depth=max_depth,
+        )
     tasks = spec["tasks"] if spec is not None else []
-    state = validate_state(top.get("state"), tasks, errors)
+    with timed_stage("validate_state"):
+        state = validate_state(
+            top.get("state"),
+            tasks,
+            errors,
+            schema=declared_schema(top.get("spec")),
+            max_parallel=spec.get("max_parallel", 1) if spec is not None else 1,
+            graph=graph if spec is not None else None,
+            prenormalized=prenormalized,
+            max_depth=max_depth,
+        )
     if spec is None or state is None or errors:
         return None, errors
     return {"spec": spec, "state": state}, errors
@@ -531,7 +1187,8 @@ def parse_contract_text(
         )
 
     try:
-        obj = json.loads(contract_text)
+        with timed_stage("decode"):
+            obj = json.loads(contract_text)
     except json.JSONDecodeError as err:
         return ContractParseResult(
             ok=False,
@@ -540,6 +1197,14 @@ def parse_contract_text(
             errors=[f"plan/1 block is not valid JSON: {err}"],
             migration_required=False,
         )
+    except RecursionError:
+        return ContractParseResult(
+            ok=False,
+            contract=None,
+            tail="",
+            errors=["plan/1 block nests too deeply to decode"],
+            migration_required=False,
+        )
 
     contract, validation_errors = validate_contract_object(obj)
     if contract is None:
@@ -557,7 +1222,711 @@ def parse_contract_text(
         tail="",
         errors=[],
         migration_required=False,
+        validated_by=_VALIDATED,
+    )
+
+
+@dataclass(frozen=True)
+class StreamLimits:
+    max_bytes: int = STREAM_MAX_BYTES
+    max_depth: int = STREAM_MAX_DEPTH
+
+
+def stream_limits(
+    *,
+    max_bytes: int | None = None,
+    max_depth: int | None = None,
+    environ: Mapping[str, str] | None = None,
+) -> StreamLimits:
+    """Resolve streaming caps from explicit values, then the environment, then defaults.
+
+    `environ` defaults to this process's environment; the server passes the client's.
+    """
+    environ = os.environ if environ is None else environ
+    resolved: dict[str, int] = {}
+    for name, explicit, env_name in (
+        ("max_bytes", max_bytes, "PLAN_CONTRACT_MAX_BYTES"),
+        ("max_depth", max_depth, "PLAN_CONTRACT_MAX_DEPTH"),
+    ):
+        if explicit is not None:
+            resolved[name] = explicit
+            continue
+        override = environ.get(env_name)
+        if override:
+            try:
+                resolved[name] = max(0, int(override))
+            except ValueError:
+                pass
+    return StreamLimits(**resolved)
+
+
+def limit_params(limits: StreamLimits) -> dict[str, int]:
+    """Return the caps as the `max_bytes`/`max_depth` params of a server request."""
+    return {"max_bytes": limits.max_bytes, "max_depth": limits.max_depth}
+
+
+def utf8_length_exceeds(text: str, limit: int) -> bool:
+    """Return whether `text` encodes to more than `limit` UTF-8 bytes, without one big copy."""
+    if len(text) > limit:
+        return True
+    if text.isascii() or len(text) * 4 <= limit:
+        return False
+    total = 0
+    for start in range(0, len(text), UTF8_LENGTH_CHUNK):
+        total += len(text[start : start + UTF8_LENGTH_CHUNK].encode("utf-8", "surrogatepass"))
+        if total > limit:
+            return True
+    return False
+
+
+def read_limited_text(path: Path | None, *, max_bytes: int) -> str:
+    """Read a plan file (or stdin when `path` is None), refusing input over `max_bytes`."""
+    if path is None:
+        data = sys.stdin.buffer.read(max_bytes + 1)
+    else:
+        if path.stat().st_size > max_bytes:
+            raise ValueError(f"plan input exceeds the {max_bytes}-byte limit: {path}")
+        data = path.read_bytes()
+    if len(data) > max_bytes:
+        raise ValueError(f"plan input exceeds the {max_bytes}-byte limit")
+    return data.decode("utf-8")
+
+
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+JSON_DECODER = json.JSONDecoder()
+# Object keys come back sorted, so freeform values decode straight into normalized form.
+SORTED_JSON_DECODER = json.JSONDecoder(
+    object_pairs_hook=lambda pairs: {key: value for key, value in sorted(dict(pairs).items())}
+)
+
+
+def json_nesting_exceeds(value: Any, max_depth: int) -> bool:
+    """Return whether decoded arrays and objects nest deeper than `max_depth` levels."""
+    stack = [(value, 1)]
+    while stack:
+        current, depth = stack.pop()
+        children = current.values() if isinstance(current, dict) else current
+        if depth > max_depth:
+            return True
+        stack.extend(
+            (child, depth + 1) for child in children if isinstance(child, (dict, list))
+        )
+    return False
+
+
+class StreamFallback(ValueError):
+    """The streaming decoder hit input it does not handle; reparse it the regular way."""
+
+
+def stream_skip(text: str, pos: int) -> int:
+    return JSON_WHITESPACE.match(text, pos).end()
+
+
+def stream_object(
+    text: str,
+    pos: int,
+    decode_value: Callable[[str, str, int], tuple[Any, int]],
+) -> tuple[dict[str, Any], int]:
+    """Decode the JSON object at `pos`, handing each member to `decode_value` by key."""
+    if text[pos : pos + 1] != "{":
+        raise StreamFallback
+    obj: dict[str, Any] = {}
+    pos = stream_skip(text, pos + 1)
+    if text[pos : pos + 1] == "}":
+        return obj, pos + 1
+    while True:
+        if text[pos : pos + 1] != '"':
+            raise StreamFallback
+        key, pos = JSON_DECODER.raw_decode(text, pos)
+        pos = stream_skip(text, pos)
+        if text[pos : pos + 1] != ":":
+            raise StreamFallback
+        value, pos = decode_value(key, text, stream_skip(text, pos + 1))
+        obj[key] = value
+        pos = stream_skip(text, pos)
+        delimiter = text[pos : pos + 1]
+        pos = stream_skip(text, pos + 1)
+        if delimiter == "}":
+            return obj, pos
+        if delimiter != ",":
+            raise StreamFallback
+
+
+def stream_tasks(text: str, pos: int) -> tuple[list[dict[str, Any]], int]:
+    """Decode `spec.tasks` one element at a time, keeping only each normalized task."""
+    if text[pos : pos + 1] != "[":
+        raise StreamFallback
+    tasks: list[dict[str, Any]] = []
+    pos = stream_skip(text, pos + 1)
+    if text[pos : pos + 1] == "]":
+        return tasks, pos + 1
+    while True:
+        raw_task, pos = JSON_DECODER.raw_decode(text, pos)
+        task = compiled_task(raw_task)
+        if task is None:
+            raise StreamFallback
+        tasks.append(task)
+        pos = stream_skip(text, pos)
+        delimiter = text[pos : pos + 1]
+        pos = stream_skip(text, pos + 1)
+        if delimiter == "]":
+            return tasks, pos
+        if delimiter != ",":
+            raise StreamFallback
+
+
+def stream_spec_member(key: str, text: str, pos: int) -> tuple[Any, int]:
+    if key == "tasks":
+        return stream_tasks(text, pos)
+    return SORTED_JSON_DECODER.raw_decode(text, pos)
+
+
+def stream_top_member(key: str, text: str, pos: int) -> tuple[Any, int]:
+    if key == "spec":
+        return stream_object(text, pos, stream_spec_member)
+    return SORTED_JSON_DECODER.raw_decode(text, pos)
+
+
+def parse_contract_stream(
+    raw_text: str,
+    *,
+    from_saved_file: bool,
+    limits: StreamLimits | None = None,
+) -> ContractParseResult:
+    """Parse like `parse_contract_text`, but without a second copy of tasks or freeform data.
+
+    Despite the name this is a lower-copy full parse, not incremental decoding: `raw_text`
+    is held whole, as the content hash needs it anyway, and the whole document is decoded
+    before the contract is validated. Each task is only normalized as it is decoded, and
+    freeform objects decode already sorted, so peak memory stays near one normalized tree
+    plus the input text. Input whose UTF-8 encoding is over the byte cap is rejected before
+    decoding and input over the nesting cap before validation. Anything the streaming
+    decoder does not expect, including every invalid task, is reparsed by
+    `parse_contract_text` so errors match it.
+    """
+    limits = limits or StreamLimits()
+    if utf8_length_exceeds(raw_text, limits.max_bytes):
+        return ContractParseResult(
+            ok=False,
+            contract=None,
+            tail="",
+            errors=[f"plan input exceeds the {limits.max_bytes}-byte limit"],
+            migration_required=False,
+        )
+    contract_text, errors, migration_required = extract_contract_text(
+        raw_text,
+        from_saved_file=from_saved_file,
+    )
+    if contract_text is None:
+        return ContractParseResult(
+            ok=False,
+            contract=None,
+            tail="",
+            errors=errors,
+            migration_required=migration_required,
+        )
+    too_deep = ContractParseResult(
+        ok=False,
+        contract=None,
+        tail="",
+        errors=[f"plan/1 JSON nests deeper than the limit of {limits.max_depth} levels"],
+        migration_required=False,
+    )
+    try:
+        with timed_stage("stream_decode"):
+            obj, end = stream_object(contract_text, 0, stream_top_member)
+        if end != len(contract_text):
+            raise StreamFallback
+    except RecursionError:
+        return too_deep
+    except (StreamFallback, json.JSONDecodeError):
+        # Error path: decode once more only to apply the depth cap before the full parse.
+        try:
+            fallback = json.loads(contract_text)
+        except RecursionError:
+            return too_deep
+        except json.JSONDecodeError:
+            fallback = None
+        if fallback is not None and json_nesting_exceeds(fallback, limits.max_depth):
+            return too_deep
+        return parse_contract_text(raw_text, from_saved_file=from_saved_file)
+    if json_nesting_exceeds(obj, limits.max_depth):
+        return too_deep
+
+    contract, validation_errors = validate_contract_object(obj, prenormalized=True)
+    if contract is None:
+        return ContractParseResult(
+            ok=False,
+            contract=None,
+            tail="",
+            errors=validation_errors,
+            migration_required=False,
+        )
+    return ContractParseResult(
+        ok=True,
+        contract=contract,
+        tail="",
+        errors=[],
+        migration_required=False,
+        validated_by=_VALIDATED,
+    )
+
+
+def default_cache_dir() -> Path:
+    override = os.environ.get("PLAN_CONTRACT_CACHE_DIR")
+    if override:
+        return Path(override)
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    base = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return base / "plan-contract"
+
+
+_HELPER_DIGEST: str | None = None
+
+
+def helper_digest() -> str:
+    """Return the SHA-256 of this helper's source, which clients compare against a server."""
+    global _HELPER_DIGEST
+    if _HELPER_DIGEST is None:
+        _HELPER_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    return _HELPER_DIGEST
+
+
+def validator_version() -> str:
+    # The helper source is part of the key so cached results never outlive a rule change.
+    return f"{SCHEMA}:{helper_digest()}"
+
+
+@dataclass(frozen=True)
+class ContractCache:
+    root: Path
+    max_bytes: int = CACHE_MAX_BYTES
+
+    def key(self, raw_text: str, *, from_saved_file: bool) -> str:
+        digest = hashlib.sha256()
+        digest.update(validator_version().encode("utf-8"))
+        digest.update(b"\0saved\0" if from_saved_file else b"\0raw\0")
+        digest.update(raw_text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        return self.root / f"{key}{CACHE_ENTRY_SUFFIX}"
+
+    def load(self, key: str) -> ContractParseResult | None:
+        path = self.entry_path(key)
+        try:
+            payload = marshal.loads(path.read_bytes())
+            os.utime(path)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return parse_result_from_payload(payload)
+
+    def store(self, key: str, result: ContractParseResult) -> None:
+        payload = {name: getattr(result, name) for name in PARSE_RESULT_FIELDS}
+        path = self.entry_path(key)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(marshal.dumps(payload))
+            os.replace(temp_path, path)
+        except (OSError, ValueError):
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        entries: list[tuple[float, int, str]] = []
+        total = 0
+        try:
+            with os.scandir(self.root) as scan:
+                for entry in scan:
+                    if not entry.name.endswith(CACHE_ENTRY_SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return
+        if total <= self.max_bytes:
+            return
+        # Hits refresh mtime, so the oldest mtime is the least recently used entry.
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                return
+
+
+def open_contract_cache(*, enabled: bool) -> ContractCache | None:
+    if not enabled:
+        return None
+    max_bytes = CACHE_MAX_BYTES
+    override = os.environ.get("PLAN_CONTRACT_CACHE_MAX_BYTES")
+    if override:
+        try:
+            max_bytes = max(0, int(override))
+        except ValueError:
+            pass
+    return ContractCache(root=default_cache_dir(), max_bytes=max_bytes)
+
+
+def contract_server_configured() -> bool:
+    return bool(os.environ.get(SERVER_SOCKET_ENV))
+
+
+def request_contract_server(method: str, params: dict[str, Any]) -> Any | None:
+    """Call the plan-contract server named by `$PLAN_CONTRACT_SOCKET`.
+
+    Returns None whenever no server is configured or reachable, or it answers with an error,
+    so callers fall back to doing the work in-process.
+    """
+    socket_path = os.environ.get(SERVER_SOCKET_ENV)
+    if not socket_path:
+        return None
+    request = json.dumps(
+        {"jsonrpc": "2.0", "id": 1, "method": method, "params": params},
+        ensure_ascii=True,
     )
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(SERVER_TIMEOUT_SECONDS)
+            client.connect(socket_path)
+            client.sendall(f"{request}\n".encode("ascii"))
+            with client.makefile("rb") as reader:
+                line = reader.readline()
+        response = json.loads(line)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(response, dict) or "result" not in response:
+        return None
+    return response["result"]
+
+
+def load_cached_parse(
+    raw_text: str,
+    *,
+    from_saved_file: bool,
+    cache: ContractCache | None,
+) -> ContractParseResult | None:
+    if cache is None:
+        return None
+    with timed_stage("cache_load"):
+        return cache.load(cache.key(raw_text, from_saved_file=from_saved_file))
+
+
+def parse_contract_text_cached(
+    raw_text: str,
+    *,
+    from_saved_file: bool,
+    cache: ContractCache | None,
+    server: bool = True,
+    limits: StreamLimits | None = None,
+) -> ContractParseResult:
+    """Parse through the on-disk cache, then the plan-contract server, then in-process.
+
+    The disk cache is checked first because loading a marshal entry beats a socket round
+    trip. `cache=None` (`--no-cache`) skips only the disk cache; the server is used whenever
+    `$PLAN_CONTRACT_SOCKET` names one, unless `server=False`. With `limits`, the caps go to
+    the server and the in-process fallback is `parse_contract_stream`.
+    """
+    cached = load_cached_parse(raw_text, from_saved_file=from_saved_file, cache=cache)
+    if cached is not None:
+        return cached
+    result = None
+    if server and contract_server_configured():
+        params: dict[str, Any] = {
+            "text": raw_text,
+            "from_saved_file": from_saved_file,
+            "validator_version": validator_version(),
+        }
+        if limits is not None:
+            params.update(limit_params(limits))
+        with timed_stage("server"):
+            remote = request_contract_server("parse", params)
+        result = parse_result_from_payload(remote)
+    if result is None and limits is not None:
+        result = parse_contract_stream(raw_text, from_saved_file=from_saved_file, limits=limits)
+    elif result is None:
+        result = parse_contract_text(raw_text, from_saved_file=from_saved_file)
+    if cache is not None:
+        with timed_stage("cache_store"):
+            cache.store(cache.key(raw_text, from_saved_file=from_saved_file), result)
+    return result
+
+
+class IndentFallback(ValueError):
+    """The fast indented writer met a value it does not encode; use json.dumps instead."""
+
+
+def json_scalar(value: Any) -> str:
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float) and math.isfinite(value):
+        return float.__repr__(value)
+    raise IndentFallback
+
+
+def write_indented(value: Any, write: Callable[[str], Any], indent: str) -> None:
+    if isinstance(value, dict):
+        if not value:
+            write("{}")
+            return
+        inner = indent + "  "
+        separator = "{" + inner
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise IndentFallback
+            write(separator)
+            write(encode_basestring_ascii(key))
+            write(": ")
+            if isinstance(item, (dict, list)):
+                write_indented(item, write, inner)
+            else:
+                write(json_scalar(item))
+            separator = "," + inner
+        write(indent + "}")
+    elif isinstance(value, list):
+        if not value:
+            write("[]")
+            return
+        inner = indent + "  "
+        if all(type(item) is str for item in value):
+            write("[" + inner)
+            write(("," + inner).join(map(encode_basestring_ascii, value)))
+            write(indent + "]")
+            return
+        separator = "[" + inner
+        for item in value:
+            write(separator)
+            if isinstance(item, (dict, list)):
+                write_indented(item, write, inner)
+            else:
+                write(json_scalar(item))
+            separator = "," + inner
+        write(indent + "]")
+    else:
+        write(json_scalar(value))
+
+
+def dumps_indented(value: Any) -> str:
+    """Return `json.dumps(value, indent=2, ensure_ascii=True)`, byte for byte.
+
+    json.dumps drops to its pure-Python encoder whenever `indent` is set; this writer keeps
+    string escaping in the C encoder and joins string lists in one call.
+    """
+    pieces: list[str] = []
+    try:
+        write_indented(value, pieces.append, "\n")
+    except IndentFallback:
+        return json.dumps(value, indent=2, ensure_ascii=True)
+    return "".join(pieces)
+
+
+def serialize_contract(contract: dict[str, Any]) -> str:
+    """Serialize an already normalized contract without validating it again."""
+    with timed_stage("render"):
+        return f"{dumps_indented(contract)}\n"
+
+
+# `serialize_contract` output opens with the spec schema and plan id and ends with state.
+# JSON strings cannot hold a raw newline, so the two-space-indented "state" key can only
+# be the top-level one.
+CANONICAL_SPEC_START = len('{\n  "spec": ')
+CANONICAL_HEAD = re.compile(
+    r'\{\n  "spec": \{\n    "schema": ("[^"\\]*"),\n    "plan_id": ("(?:[^"\\]|\\.)*"),\n'
+)
+CANONICAL_STATE_KEY = '\n  "state": '
+# Only spec.tasks holds objects at the third indent level, and each opens with its id.
+CANONICAL_TASK_ID = re.compile(r'\n      \{\n        "id": ("(?:[^"\\]|\\.)*"),\n')
+CANONICAL_TAIL = "\n}\n"
+
+
+def decode_canonical_state(raw_text: str) -> tuple[str, str, dict[str, Any]] | None:
+    """Return `(schema, plan_id, state)` from text laid out exactly like `serialize_contract`.
+
+    Only the state object and the two leading spec strings are kept. The rest of spec is
+    decoded, so a merge conflict or stray edit inside it is caught, but never validated.
+    Returns None for any other layout or for spec that is not JSON, so callers can fall
+    back to a full parse.
+    """
+    head = CANONICAL_HEAD.match(raw_text)
+    if head is None or not raw_text.endswith(CANONICAL_TAIL):
+        return None
+    offset = raw_text.rfind(CANONICAL_STATE_KEY)
+    if offset < head.end():
+        return None
+    try:
+        # The C decoder checks spec's syntax at a fraction of what validating it costs.
+        _, spec_end = JSON_DECODER.raw_decode(raw_text, CANONICAL_SPEC_START)
+        state, end = JSON_DECODER.raw_decode(raw_text, offset + len(CANONICAL_STATE_KEY))
+        schema = json.loads(head.group(1))
+        plan_id = json.loads(head.group(2))
+    except json.JSONDecodeError:
+        return None
+    if spec_end != offset - 1 or raw_text[spec_end] != ",":
+        return None
+    if end != len(raw_text) - len(CANONICAL_TAIL) or not isinstance(state, dict):
+        return None
+    return schema, plan_id, state
+
+
+def canonical_task_ids(raw_text: str) -> set[str] | None:
+    """Return the task ids of text laid out like `serialize_contract`, without decoding spec.
+
+    Returns None when no task id can be found, so callers fall back to a full parse.
+    """
+    spec_end = raw_text.rfind(CANONICAL_STATE_KEY)
+    try:
+        task_ids = {
+            json.loads(match.group(1))
+            for match in CANONICAL_TASK_ID.finditer(raw_text, 0, max(spec_end, 0))
+        }
+    except json.JSONDecodeError:
+        return None
+    return task_ids or None
+
+
+def section_fingerprint(section: dict[str, Any]) -> str:
+    digest = hashlib.sha256(dumps_indented(section).encode("ascii"))
+    return f"sha256:{digest.hexdigest()}"
+
+
+def contract_fingerprints(contract: dict[str, Any]) -> dict[str, str]:
+    """Return the spec and state fingerprints of a normalized contract.
+
+    Each hashes the canonical rendering of one section, so equal fingerprints mean an
+    unchanged section without comparing whole documents. Task statuses live in spec, so
+    the spec fingerprint moves with task progress as well as with plan edits.
+    """
+    return {
+        "spec_fingerprint": section_fingerprint(contract["spec"]),
+        "state_fingerprint": section_fingerprint(contract["state"]),
+    }
+
+
+class StaleContractError(ValueError):
+    """Raised when a saved plan changed since the caller last read it."""
+
+
+class JournalPendingError(ValueError):
+    """Raised when a snapshot rewrite would strand an uncompacted transition journal."""
+
+
+def content_hash(raw_text: str) -> str:
+    return f"sha256:{hashlib.sha256(raw_text.encode('utf-8', 'surrogatepass')).hexdigest()}"
+
+
+def journal_path(path: Path) -> Path:
+    """Return the append-only transition journal that sits next to a saved plan."""
+    return path.with_suffix(".jsonl")
+
+
+@contextmanager
+def plan_write_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on the directory that contains `path`.
+
+    Locking the directory instead of the file survives the rename in
+    `replace_contract_file` and leaves no lock files next to saved plans.
+    """
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def replace_contract_file(path: Path, text: str, *, expected_hash: str | None) -> str:
+    """Atomically replace `path` with `text` if it still has `expected_hash`.
+
+    `expected_hash=None` means the file must not exist yet. Callers must hold
+    `plan_write_lock(path)`. Returns the content hash of the new file.
+    """
+    try:
+        current_hash: str | None = content_hash(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        current_hash = None
+    if current_hash != expected_hash:
+        if expected_hash is None:
+            raise StaleContractError(f"plan file already exists: {path}")
+        if current_hash is None:
+            raise StaleContractError(f"plan file no longer exists: {path}")
+        raise StaleContractError(
+            f"plan file changed since it was read: expected {expected_hash}, found {current_hash}"
+        )
+
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+    if os.name != "nt":
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return content_hash(text)
+
+
+def write_contract_file(path: Path, text: str, *, expected_hash: str | None) -> str:
+    """Replace `path` under the plan lock, refusing plans with a transition journal.
+
+    Journaled transitions append under the same lock without changing the snapshot hash, so
+    the journal check has to happen inside it; otherwise an append landing before the lock
+    would be stranded with a `base` that no longer matches the rewritten snapshot.
+    """
+    with plan_write_lock(path):
+        if journal_path(path).exists():
+            raise JournalPendingError(
+                f"plan has an uncompacted transition journal: {journal_path(path)}; "
+                "compact it with plan-execution before rewriting the plan"
+            )
+        return replace_contract_file(path, text, expected_hash=expected_hash)
+
+
+def render_parse_result(result: ContractParseResult) -> str:
+    """Serialize the contract of a successful parse, validating it again only if needed.
+
+    Results that `parse_contract_text` or `parse_contract_stream` validated in this process
+    carry a private token and render directly. Results rebuilt from the cache or a server
+    reply lack it, so they go through `render_contract_json`, as bare contract dicts do.
+    """
+    if not result.ok or result.contract is None:
+        joined = "; ".join(result.errors) if result.errors else "contract was not validated"
+        raise ValueError(joined)
+    if result.validated_by is not _VALIDATED:
+        return render_contract_json(result.contract)
+    return serialize_contract(result.contract)
 
 
 def render_contract_json(contract: dict[str, Any]) -> str:
@@ -566,5 +1935,4 @@ def render_contract_json(contract: dict[str, Any]) -> str:
         joined = "; ".join(errors) if errors else "unknown validation error"
         raise ValueError(joined)
 
-    body = json.dumps(normalized_contract, indent=2, ensure_ascii=True)
-    return f"{body}\n"
+    return serialize_contract(normalized_contract)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Run a plan helper command line through the plan-contract server.
+
+`plan_contract_client.py read [ARGS...]` forwards ARGS to the server named by
+`$PLAN_CONTRACT_SOCKET` and relays the reader's stdout and exit code. Only the standard
+library is imported, so a served call skips loading the plan helpers in this process. When
+no server answers, or it rejects the command line, `read_plan_contract.py` runs locally
+with the same arguments, so output and exit codes match either way.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import socket
+import sys
+from typing import Any
+
+
+COMMANDS = {"read": "read_plan_contract.py"}
+SERVER_SOCKET_ENV = "PLAN_CONTRACT_SOCKET"
+SERVER_TIMEOUT_SECONDS = 5.0
+# Stream caps read from the environment are the caller's, so they travel with the request.
+FORWARDED_ENV = ("PLAN_CONTRACT_MAX_BYTES", "PLAN_CONTRACT_MAX_DEPTH")
+# Timings and profiles describe the calling process, so these force a local run.
+LOCAL_ENV = ("PLAN_CONTRACT_TIMINGS", "PLAN_CONTRACT_PROFILE")
+
+
+def request_run(command: str, argv: list[str]) -> dict[str, Any] | None:
+    """Ask the server to run `command`; None means run it locally instead."""
+    socket_path = os.environ.get(SERVER_SOCKET_ENV)
+    if not socket_path or any(os.environ.get(name) for name in LOCAL_ENV):
+        return None
+    try:
+        helper_source = Path(__file__).with_name("plan_contract.py").read_bytes()
+    except OSError:
+        return None
+    params = {
+        "command": command,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": {name: os.environ[name] for name in FORWARDED_ENV if name in os.environ},
+        "helper_digest": hashlib.sha256(helper_source).hexdigest(),
+    }
+    request = json.dumps(
+        {"jsonrpc": "2.0", "id": 1, "method": "run", "params": params},
+        ensure_ascii=True,
+    )
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(SERVER_TIMEOUT_SECONDS)
+            client.connect(socket_path)
+            client.sendall(f"{request}\n".encode("ascii"))
+            with client.makefile("rb") as reader:
+                line = reader.readline()
+        response = json.loads(line)
+    except (OSError, ValueError):
+        return None
+    result = response.get("result") if isinstance(response, dict) else None
+    if (
+        not isinstance(result, dict)
+        or not isinstance(result.get("stdout"), str)
+        or result.get("exit_code") not in (0, 2)
+    ):
+        return None
+    return result
+
+
+def main() -> int:
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print(
+            f"usage: plan_contract_client.py {{{','.join(sorted(COMMANDS))}}} [ARGS...]",
+            file=sys.stderr,
+        )
+        return 2
+    command, argv = sys.argv[1], sys.argv[2:]
+    result = request_run(command, argv)
+    if result is not None:
+        sys.stdout.write(result["stdout"])
+        return result["exit_code"]
+    script = Path(__file__).with_name(COMMANDS[command])
+    os.execv(sys.executable, [sys.executable, str(script), *argv])
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
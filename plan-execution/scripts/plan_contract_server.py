@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""Long-lived plan/1 validation server speaking line-delimited JSON-RPC 2.0.
+
+One process keeps parsed contracts in memory and answers `parse`, `validate`, `render`,
+`read`, and `run` requests over stdin/stdout or a Unix socket. Point `$PLAN_CONTRACT_SOCKET`
+at the socket and every helper CLI routes its parse through the server while keeping its
+own output and exit codes; helpers fall back to in-process parsing whenever the server is
+absent, unreachable, or running a different validator version. `plan_contract_client.py`
+sends a whole reader command line through `run`.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import OrderedDict
+from functools import partial
+import json
+import marshal
+from pathlib import Path
+import socket
+import socketserver
+import sys
+import threading
+from typing import Any, Callable, Iterable, NoReturn
+
+from plan_contract import (
+    PARSE_RESULT_FIELDS,
+    ContractParseResult,
+    StreamLimits,
+    helper_digest,
+    parse_contract_stream,
+    parse_contract_text,
+    parse_result_from_payload,
+    serialize_contract,
+    stream_limits,
+    validator_version,
+)
+from read_plan_contract import (
+    build_parser,
+    parse_args as parse_reader_args,
+    parse_fields,
+    read_contract,
+    read_plans,
+    read_saved_path,
+)
+
+
+SERVER_CACHE_ENTRIES = 256
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+VERSION_MISMATCH = -32001
+RUN_COMMANDS = ("read",)
+# These need the client's own stdin or stderr, so the client runs them in-process.
+CLIENT_ONLY_FLAGS = "--stdin, --timings, and --profile"
+
+
+class RequestError(ValueError):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class RequestArgumentParser(argparse.ArgumentParser):
+    """Report a forwarded command line's usage errors to the client instead of exiting."""
+
+    def error(self, message: str) -> NoReturn:
+        raise RequestError(INVALID_PARAMS, message)
+
+
+def parse_result_payload(result: ContractParseResult) -> dict[str, Any]:
+    return {name: getattr(result, name) for name in PARSE_RESULT_FIELDS}
+
+
+def check_version(params: dict[str, Any]) -> None:
+    """Refuse a request made against a different `plan_contract.py` than the server loaded.
+
+    In-process helpers send `validator_version` and the client sends `helper_digest`;
+    requests without either are answered as is.
+    """
+    version = params.get("validator_version")
+    digest = params.get("helper_digest")
+    if (version is not None and version != validator_version()) or (
+        digest is not None and digest != helper_digest()
+    ):
+        raise RequestError(VERSION_MISMATCH, "server runs a different plan_contract.py")
+
+
+def limits_param(params: dict[str, Any]) -> StreamLimits | None:
+    """Return the streaming caps a request asks for, or None for a regular parse."""
+    if "max_bytes" not in params and "max_depth" not in params:
+        return None
+    for name in ("max_bytes", "max_depth"):
+        value = params.get(name)
+        if value is not None and (type(value) is not int or value < 1):
+            raise RequestError(INVALID_PARAMS, f"params.{name} must be a positive integer")
+    return stream_limits(
+        max_bytes=params.get("max_bytes"),
+        max_depth=params.get("max_depth"),
+        environ={},
+    )
+
+
+def string_list_param(params: dict[str, Any], name: str) -> list[str]:
+    value = params.get(name)
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise RequestError(INVALID_PARAMS, f"params.{name} must be an array of strings")
+    return value
+
+
+def text_param(params: dict[str, Any]) -> tuple[str, bool]:
+    """Return the contract text and whether it comes from a saved file.
+
+    Requests carry either inline `text` (with an optional `from_saved_file` flag) or a saved
+    plan `path` that the server reads itself.
+    """
+    if "path" in params:
+        if not isinstance(params["path"], str):
+            raise RequestError(INVALID_PARAMS, "params.path must be a string")
+        try:
+            raw_text, _ = read_saved_path(Path(params["path"]))
+        except (OSError, ValueError) as err:
+            raise RequestError(INVALID_PARAMS, str(err)) from err
+        return raw_text, True
+    if not isinstance(params.get("text"), str):
+        raise RequestError(INVALID_PARAMS, "params must include a text or path string")
+    from_saved_file = params.get("from_saved_file", False)
+    if not isinstance(from_saved_file, bool):
+        raise RequestError(INVALID_PARAMS, "params.from_saved_file must be a boolean")
+    return params["text"], from_saved_file
+
+
+class ContractService:
+    """Dispatch JSON-RPC requests against an in-memory LRU of parsed contracts."""
+
+    def __init__(self, *, max_entries: int = SERVER_CACHE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict[
+            tuple[bool, StreamLimits | None, str], ContractParseResult
+        ] = OrderedDict()
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.methods: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "parse": self.handle_parse,
+            "validate": self.handle_validate,
+            "render": self.handle_render,
+            "read": self.handle_read,
+            "run": self.handle_run,
+            "shutdown": self.handle_shutdown,
+        }
+
+    def parse(
+        self,
+        raw_text: str,
+        *,
+        from_saved_file: bool,
+        limits: StreamLimits | None = None,
+    ) -> ContractParseResult:
+        key = (from_saved_file, limits, raw_text)
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is not None:
+                self.entries.move_to_end(key)
+                return cached
+        if limits is None:
+            result = parse_contract_text(raw_text, from_saved_file=from_saved_file)
+        else:
+            result = parse_contract_stream(
+                raw_text, from_saved_file=from_saved_file, limits=limits
+            )
+        with self.lock:
+            self.entries[key] = result
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return result
+
+    def parse_copy(
+        self,
+        raw_text: str,
+        *,
+        limits: StreamLimits | None = None,
+    ) -> ContractParseResult:
+        # `read` replays journals in place, so hand it a private copy of the cached contract.
+        result = self.parse(raw_text, from_saved_file=True, limits=limits)
+        payload = marshal.loads(marshal.dumps(parse_result_payload(result)))
+        copied = parse_result_from_payload(payload)
+        if copied is None:
+            raise RequestError(INTERNAL_ERROR, "parse result did not survive copying")
+        return copied
+
+    def handle_parse(self, params: dict[str, Any]) -> dict[str, Any]:
+        check_version(params)
+        raw_text, from_saved_file = text_param(params)
+        result = self.parse(raw_text, from_saved_file=from_saved_file, limits=limits_param(params))
+        return parse_result_payload(result)
+
+    def handle_validate(self, params: dict[str, Any]) -> dict[str, Any]:
+        check_version(params)
+        raw_text, from_saved_file = text_param(params)
+        result = self.parse(raw_text, from_saved_file=from_saved_file)
+        return {"ok": result.ok, "errors": result.errors}
+
+    def handle_render(self, params: dict[str, Any]) -> dict[str, Any]:
+        check_version(params)
+        raw_text, from_saved_file = text_param(params)
+        result = self.parse(raw_text, from_saved_file=from_saved_file)
+        if not result.ok or result.contract is None:
+            return {"ok": False, "text": None, "errors": result.errors}
+        return {"ok": True, "text": serialize_contract(result.contract), "errors": []}
+
+    def handle_read(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Build the reader payload; given both `text` and `path`, `path` locates the journal."""
+        check_version(params)
+        if "text" in params:
+            raw_text, _ = text_param({"text": params["text"]})
+        else:
+            raw_text, _ = text_param(params)
+        path = params.get("path")
+        if path is not None and not isinstance(path, str):
+            raise RequestError(INVALID_PARAMS, "params.path must be a string")
+        resolved = str(Path(path).resolve()) if path is not None else None
+        fields = None
+        if params.get("fields") is not None:
+            try:
+                fields = parse_fields(",".join(string_list_param(params, "fields")))
+            except ValueError as err:
+                raise RequestError(INVALID_PARAMS, str(err)) from err
+        payload, exit_code = read_contract(
+            raw_text,
+            resolved,
+            parse=partial(self.parse_copy, limits=limits_param(params)),
+            fields=fields,
+        )
+        return {"payload": payload, "exit_code": exit_code}
+
+    def handle_run(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Run a reader command line for `plan_contract_client.py` and return its stdout."""
+        check_version(params)
+        if params.get("command") not in RUN_COMMANDS:
+            raise RequestError(
+                INVALID_PARAMS, f"params.command must be one of: {list(RUN_COMMANDS)}"
+            )
+        argv = string_list_param(params, "argv")
+        cwd = params.get("cwd")
+        if not isinstance(cwd, str) or not Path(cwd).is_absolute():
+            raise RequestError(INVALID_PARAMS, "params.cwd must be an absolute path")
+        env = params.get("env", {})
+        if not isinstance(env, dict) or not all(isinstance(value, str) for value in env.values()):
+            raise RequestError(INVALID_PARAMS, "params.env must map names to strings")
+        parser = build_parser(parser_class=RequestArgumentParser, add_help=False)
+        args = parse_reader_args(argv, parser=parser)
+        if args.stdin or args.timings or args.profile is not None:
+            raise RequestError(INVALID_PARAMS, f"{CLIENT_ONLY_FLAGS} run only in the client")
+        limits = stream_limits(max_bytes=args.max_bytes, max_depth=args.max_depth, environ=env)
+        chunks: list[str] = []
+        exit_code = read_plans(
+            args,
+            limits=limits,
+            parse=partial(self.parse_copy, limits=limits if args.stream else None),
+            cwd=Path(cwd),
+            write=chunks.append,
+        )
+        return {"stdout": "".join(chunks), "exit_code": exit_code}
+
+    def handle_shutdown(self, params: dict[str, Any]) -> None:
+        check_version(params)
+        self.stopping.set()
+        return None
+
+    def respond(self, line: str) -> str | None:
+        """Answer one request line; notifications without an id get no response."""
+        request_id: Any = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as err:
+                raise RequestError(PARSE_ERROR, f"request is not valid JSON: {err}") from err
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                raise RequestError(INVALID_REQUEST, "request must be an object with a method")
+            request_id = request.get("id")
+            handler = self.methods.get(request["method"])
+            if handler is None:
+                raise RequestError(METHOD_NOT_FOUND, f"unknown method: {request['method']}")
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "params must be an object")
+            response: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "result": handler(params)}
+            if "id" not in request:
+                return None
+        except RequestError as err:
+            response = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": err.code, "message": str(err)},
+            }
+        except Exception as err:
+            # One bad request must not take down a server other helpers depend on.
+            response = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": INTERNAL_ERROR, "message": f"{type(err).__name__}: {err}"},
+            }
+        # Contracts keep their canonical key order, which trusted renders depend on.
+        return json.dumps(response, ensure_ascii=True)
+
+    def serve_lines(self, lines: Iterable[str], write: Callable[[str], None]) -> None:
+        for line in lines:
+            if not line.strip():
+                continue
+            response = self.respond(line)
+            if response is not None:
+                write(f"{response}\n")
+            if self.stopping.is_set():
+                return
+
+
+def serve_stdio(service: ContractService) -> None:
+    def write(text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    service.serve_lines(sys.stdin, write)
+
+
+def claim_socket_path(path: Path) -> None:
+    if not path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        # Nobody is listening, so the file is left over from a server that did not exit cleanly.
+        path.unlink()
+        return
+    finally:
+        probe.close()
+    raise ValueError(f"a plan-contract server is already listening on {path}")
+
+
+class ContractSocketServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, service: ContractService) -> None:
+        self.service = service
+        super().__init__(str(path), ContractRequestHandler)
+
+
+class ContractRequestHandler(socketserver.StreamRequestHandler):
+    server: ContractSocketServer
+
+    def handle(self) -> None:
+        def write(text: str) -> None:
+            self.wfile.write(text.encode("ascii"))
+            self.wfile.flush()
+
+        service = self.server.service
+        lines = (raw.decode("utf-8", "surrogateescape") for raw in self.rfile)
+        service.serve_lines(lines, write)
+        if service.stopping.is_set():
+            # shutdown() waits for serve_forever, so it cannot run on a handler thread.
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+def serve_socket(service: ContractService, path: Path) -> None:
+    claim_socket_path(path)
+    with ContractSocketServer(path, service) as server:
+        try:
+            server.serve_forever()
+        finally:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve plan/1 parse, validate, render, read, and run requests as line-delimited "
+            "JSON-RPC 2.0."
+        )
+    )
+    transport = parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument(
+        "--stdio",
+        action="store_true",
+        help="Read requests from stdin and write responses to stdout.",
+    )
+    transport.add_argument(
+        "--socket",
+        type=Path,
+        help="Listen on this Unix socket. Export it as PLAN_CONTRACT_SOCKET for the helpers.",
+    )
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        default=SERVER_CACHE_ENTRIES,
+        help="Parsed contracts kept in memory.",
+    )
+    args = parser.parse_args()
+    if args.max_entries < 1:
+        parser.error("--max-entries must be a positive integer")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    service = ContractService(max_entries=args.max_entries)
+    if args.stdio:
+        serve_stdio(service)
+        return 0
+    try:
+        serve_socket(service, args.socket.resolve())
+    except (OSError, ValueError) as err:
+        print(f"plan-contract server failed: {err}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Append-only transition journal kept next to a saved plan/1 snapshot.
+
+Each line records one `apply_transition` payload plus the content hash of the snapshot it
+was recorded against. Readers replay the lines over the snapshot; compaction folds them back
+into the canonical JSON and removes the journal.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from plan_contract import PlanGraph, content_hash, journal_path
+from plan_transitions import apply_transition
+
+
+def read_journal_text(path: Path) -> str:
+    try:
+        return journal_path(path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ""
+
+
+def effective_hash(snapshot_text: str, journal_text: str) -> str:
+    """Hash the snapshot plus any journal so compare-and-swap covers appended transitions."""
+    if not journal_text:
+        return content_hash(snapshot_text)
+    return content_hash(f"{content_hash(snapshot_text)}\n{journal_text}")
+
+
+def parse_journal(journal_text: str, base_hash: str) -> tuple[list[dict[str, Any]], list[str]]:
+    transitions: list[dict[str, Any]] = []
+    errors: list[str] = []
+    lines = journal_text.split("\n")
+    # A final line without a newline is a torn append from an interrupted writer.
+    for index, line in enumerate(lines[:-1], start=1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as err:
+            errors.append(f"plan journal line {index} is not valid JSON: {err}")
+            continue
+        if not isinstance(entry, dict) or not isinstance(entry.get("transition"), dict):
+            errors.append(f"plan journal line {index} must be an object with a transition")
+            continue
+        if entry.get("base") != base_hash:
+            errors.append(
+                f"plan journal line {index} was recorded against a different snapshot; "
+                "compact or remove the journal before reading"
+            )
+            continue
+        transitions.append(entry["transition"])
+    return transitions, errors
+
+
+def replay_journal(
+    contract: dict[str, Any],
+    transitions: list[dict[str, Any]],
+    *,
+    graph: PlanGraph | None = None,
+) -> list[str]:
+    if graph is None:
+        graph = PlanGraph(contract["spec"]["tasks"])
+    for index, transition in enumerate(transitions, start=1):
+        errors = apply_transition(contract, transition, graph=graph)
+        if errors:
+            return [f"plan journal transition {index}: {error}" for error in errors]
+    return []
+
+
+def trim_torn_entry(path: Path, journal_text: str) -> str:
+    """Drop a torn final line left by an interrupted append; callers hold `plan_write_lock`."""
+    if not journal_text or journal_text.endswith("\n"):
+        return journal_text
+    kept = journal_text[: journal_text.rfind("\n") + 1]
+    os.truncate(journal_path(path), len(kept.encode("utf-8")))
+    return kept
+
+
+def append_journal_entry(path: Path, base_hash: str, transition: dict[str, Any]) -> str:
+    """Append one transition with a single O_APPEND write and return the appended line.
+
+    Callers hold `plan_write_lock` and have already trimmed any torn final line.
+    """
+    line = json.dumps(
+        {"base": base_hash, "transition": transition},
+        ensure_ascii=True,
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    fd = os.open(journal_path(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, f"{line}\n".encode("ascii"))
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return f"{line}\n"
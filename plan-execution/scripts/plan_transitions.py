@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Runtime state transitions for validated plan/1 contracts."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from plan_contract import (
+    PARALLEL_SCHEMA,
+    PlanGraph,
+    normalize_freeform_object,
+    normalize_optional_string,
+    normalize_string_list,
+)
+from plan_scheduler import ranked_ready_queue
+
+
+TRANSITIONS = {
+    "start": "ready -> executing",
+    "block": "executing -> blocked",
+    "complete": "executing -> done",
+    "replan": "blocked -> needs_replan",
+}
+TERMINAL_STATUSES = {"done", "cancelled"}
+
+
+def utc_timestamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def current_lanes(state: dict[str, Any]) -> list[str]:
+    if "current_task_ids" in state:
+        return list(state["current_task_ids"])
+    return [] if state["current_task_id"] is None else [state["current_task_id"]]
+
+
+def set_current_lanes(state: dict[str, Any], lanes: list[str]) -> None:
+    if "current_task_ids" in state:
+        state["current_task_ids"] = lanes
+    else:
+        state["current_task_id"] = lanes[0] if lanes else None
+
+
+def pick_next_task(graph: PlanGraph, requested: str | None, errors: list[str]) -> str | None:
+    if requested is not None:
+        if not graph.is_executable(requested):
+            errors.append("transition.next_task_id must reference an executable pending task")
+        return requested
+    queue = ranked_ready_queue(graph)
+    return queue[0]["id"] if queue else None
+
+
+def apply_transition(
+    contract: dict[str, Any],
+    transition: dict[str, Any],
+    *,
+    graph: PlanGraph | None = None,
+) -> list[str]:
+    """Apply `transition` to a validated, normalized contract in place.
+
+    Only the invariants the transition can affect are re-checked: the touched task's
+    status and dependencies, the phase pair, and the runtime fields being written. The
+    contract is left untouched when any error is returned. Pass a `graph` built from the
+    same contract to reuse its index across several transitions.
+    """
+    errors: list[str] = []
+    spec = contract["spec"]
+    state = contract["state"]
+    if graph is None:
+        graph = PlanGraph(spec["tasks"])
+    parallel = spec["schema"] == PARALLEL_SCHEMA
+    max_parallel = spec.get("max_parallel", 1)
+
+    kind = transition.get("kind")
+    if kind not in TRANSITIONS:
+        return [f"transition.kind must be one of: {sorted(TRANSITIONS)}"]
+    task_id = normalize_optional_string(transition.get("task_id"), "transition.task_id", errors)
+    next_task_id = normalize_optional_string(
+        transition.get("next_task_id"), "transition.next_task_id", errors
+    )
+    blockers = normalize_string_list(
+        transition.get("blockers", []), "transition.blockers", errors, allow_empty=True
+    )
+    evidence = normalize_string_list(
+        transition.get("evidence", []), "transition.evidence", errors, allow_empty=True
+    )
+    replan_reason = normalize_optional_string(
+        transition.get("replan_reason"), "transition.replan_reason", errors
+    )
+    last_updated = normalize_optional_string(
+        transition.get("last_updated"), "transition.last_updated", errors
+    )
+    context_snapshot = transition.get("context_snapshot")
+    if context_snapshot is not None:
+        context_snapshot = normalize_freeform_object(
+            context_snapshot, "transition.context_snapshot", errors
+        )
+    if errors:
+        return errors
+
+    phase = state["phase"]
+    lanes = current_lanes(state)
+    expected_phase, new_phase = TRANSITIONS[kind].split(" -> ")
+    if kind == "start" and parallel and phase == "executing":
+        expected_phase = new_phase = "executing"
+    if phase != expected_phase:
+        return [f"transition {kind!r} requires state.phase {expected_phase!r}, found {phase!r}"]
+    if blockers and kind not in {"block", "replan"}:
+        return [f"transition {kind!r} does not accept blocker reasons"]
+    if replan_reason is not None and kind != "replan":
+        return [f"transition {kind!r} does not accept a replan reason"]
+
+    new_lanes = lanes
+    new_next = state["next_task_id"]
+    new_blockers = [*state["blockers"], *blockers]
+    new_replan_reason = state["replan_reason"]
+    if kind == "replan":
+        if replan_reason is None:
+            return ["transition 'replan' requires transition.replan_reason"]
+        new_replan_reason = replan_reason
+        task_id = None
+    else:
+        if task_id is None:
+            task_id = state["next_task_id"] if kind == "start" else None
+            if kind != "start" and len(lanes) == 1:
+                task_id = lanes[0]
+        if task_id is None:
+            return [f"transition {kind!r} requires transition.task_id"]
+        if task_id not in graph.task_by_id:
+            return ["transition.task_id must reference an existing task id"]
+        if kind == "start":
+            if not graph.is_executable(task_id):
+                return ["transition 'start' requires an executable pending task"]
+            if len(lanes) >= max_parallel:
+                return [f"transition 'start' would exceed {max_parallel} in-progress task(s)"]
+            new_lanes = [*lanes, task_id]
+        else:
+            if graph.status(task_id) != "in_progress" or task_id not in lanes:
+                return [f"transition {kind!r} requires an in-progress current task"]
+            if kind == "block":
+                if len(lanes) > 1:
+                    return ["transition 'block' requires every other lane to stop first"]
+                if not blockers:
+                    return ["transition 'block' requires at least one blocker reason"]
+            else:
+                new_lanes = [lane for lane in lanes if lane != task_id]
+
+    previous_status = None if task_id is None else graph.status(task_id)
+    new_status = {"start": "in_progress", "block": "blocked", "complete": "done"}.get(kind)
+    if task_id is not None and new_status is not None:
+        graph.set_status(task_id, new_status)
+
+    if kind == "complete" and not new_lanes:
+        if graph.count("pending") + graph.count("blocked") + graph.count("in_progress") == 0:
+            new_next = None
+        else:
+            new_phase = "ready"
+            new_next = pick_next_task(graph, next_task_id, errors)
+            if new_next is None and not errors:
+                errors.append(
+                    "transition 'complete' leaves no executable pending task; "
+                    "record a blocker and route to plan-writing"
+                )
+    elif kind in {"start", "complete"}:
+        if kind == "complete":
+            new_phase = "executing"
+        if next_task_id is not None:
+            new_next = pick_next_task(graph, next_task_id, errors)
+        elif new_next is not None and graph.status(new_next) != "pending":
+            new_next = None
+    elif next_task_id is not None:
+        if graph.status(next_task_id) in (None, *TERMINAL_STATUSES):
+            errors.append("transition.next_task_id must reference an existing non-terminal task")
+        new_next = next_task_id
+    if errors:
+        if task_id is not None and previous_status is not None:
+            graph.set_status(task_id, previous_status)
+        return errors
+
+    state["phase"] = new_phase
+    set_current_lanes(state, new_lanes)
+    state["next_task_id"] = new_next
+    state["blockers"] = new_blockers
+    state["replan_reason"] = new_replan_reason
+    if evidence:
+        state["evidence"] = [*state["evidence"], *evidence]
+    state["last_updated"] = last_updated or utc_timestamp()
+    if context_snapshot is not None:
+        state["context_snapshot"] = context_snapshot
+    return []
@@ -4,43 +4,208 @@
 from __future__ import annotations
 
 import argparse
+from functools import partial
 import json
 from pathlib import Path
 import sys
-from typing import Any
+from typing import Any, Callable
 
-from plan_contract import parse_contract_text
+from plan_contract import (
+    ContractCache,
+    ContractParseResult,
+    PlanGraph,
+    PARALLEL_SCHEMA,
+    PARALLEL_STATE_KEYS,
+    PHASES,
+    SCHEMAS,
+    STATE_KEYS,
+    StreamLimits,
+    canonical_task_ids,
+    content_hash,
+    contract_fingerprints,
+    contract_server_configured,
+    decode_canonical_state,
+    instrumented,
+    limit_params,
+    load_cached_parse,
+    normalize_freeform_object,
+    normalize_optional_string,
+    normalize_string,
+    normalize_string_list,
+    open_contract_cache,
+    parse_contract_text_cached,
+    read_limited_text,
+    request_contract_server,
+    section_fingerprint,
+    stream_limits,
+    timed_stage,
+    validator_version,
+)
+from plan_journal import effective_hash, parse_journal, read_journal_text, replay_journal
+from plan_scheduler import ranked_ready_queue
+from plan_transitions import current_lanes
 
 
-def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(
-        description="Read and validate a saved plan/1 contract from a plan file."
+ALWAYS_FIELDS = frozenset({"ok", "errors"})
+FINGERPRINT_FIELDS = frozenset({"spec_fingerprint", "state_fingerprint"})
+
+
+def build_parser(
+    *,
+    parser_class: type[argparse.ArgumentParser] = argparse.ArgumentParser,
+    add_help: bool = True,
+) -> argparse.ArgumentParser:
+    parser = parser_class(
+        description="Read and validate a saved plan/1 contract from a plan file.",
+        add_help=add_help,
     )
     parser.add_argument(
         "--path",
         type=Path,
-        help="Plan file to inspect. Required unless --stdin is used.",
+        action="append",
+        help=(
+            "Plan file to inspect. Required unless --stdin is used. "
+            "Repeat with --ndjson to read several plans."
+        ),
     )
     parser.add_argument(
         "--stdin",
         action="store_true",
         help="Read the saved plan file content from stdin instead of --path.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the content-hash cache of parsed plan/1 contracts.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Run a lower-copy full parse under byte and nesting caps. Nothing is parsed "
+            "incrementally: the input is read and decoded whole before the contract is "
+            "validated, and only the second copy of tasks is skipped. Bypasses the cache; "
+            "a plan-contract server applies the same caps."
+        ),
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        help="Byte cap for --stream. Implies --stream. Defaults to $PLAN_CONTRACT_MAX_BYTES or 256 MiB.",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="Nesting cap for --stream. Implies --stream. Defaults to $PLAN_CONTRACT_MAX_DEPTH or 256.",
+    )
+    parser.add_argument(
+        "--fields",
+        help=(
+            "Comma-separated payload fields to emit, such as phase,next_task_id,task_ids. "
+            "ok and errors are always included; unrequested fields are not computed."
+        ),
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help=(
+            "Read only the top-level state of canonically formatted plans, checking spec is "
+            "well-formed JSON without validating it. Falls back to a full read for other "
+            "layouts, malformed spec, or journaled plans."
+        ),
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Emit the payload on one line without indentation.",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Emit one compact JSON line per plan. Allows repeating --path.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help=(
+            "Report per-stage wall and CPU seconds as one JSON line on stderr. "
+            "$PLAN_CONTRACT_TIMINGS=<file> appends them to a file instead."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help=(
+            "Write cProfile statistics and the tracemalloc peak to PATH, or - for stderr. "
+            "Defaults to $PLAN_CONTRACT_PROFILE."
+        ),
+    )
+    return parser
+
+
+def parse_args(
+    argv: list[str] | None = None,
+    *,
+    parser: argparse.ArgumentParser | None = None,
+) -> argparse.Namespace:
+    parser = parser or build_parser()
+    args = parser.parse_args(argv)
+    for flag, value in (("--max-bytes", args.max_bytes), ("--max-depth", args.max_depth)):
+        if value is not None and value < 1:
+            parser.error(f"{flag} must be a positive integer")
+    args.stream = args.stream or args.max_bytes is not None or args.max_depth is not None
+    if args.path is not None and len(args.path) > 1 and not args.ndjson:
+        parser.error("--path can only be repeated with --ndjson")
+    try:
+        args.fields = parse_fields(args.fields)
+    except ValueError as err:
+        parser.error(str(err))
+    return args
+
+
+def parse_fields(raw_fields: str | None) -> frozenset[str] | None:
+    if raw_fields is None:
+        return None
+    fields = frozenset(field.strip() for field in raw_fields.split(",") if field.strip())
+    unknown = sorted(fields - set(empty_result(path=None)))
+    if unknown:
+        raise ValueError(
+            f"--fields has unknown fields {unknown}; choose from {sorted(empty_result(path=None))}"
+        )
+    return fields | ALWAYS_FIELDS
 
 
-def read_input(args: argparse.Namespace) -> tuple[str, str | None]:
+def read_input(
+    args: argparse.Namespace,
+    raw_path: Path | None,
+    *,
+    max_bytes: int | None = None,
+    cwd: Path | None = None,
+) -> tuple[str, str | None]:
     if args.stdin:
+        if max_bytes is not None:
+            return read_limited_text(None, max_bytes=max_bytes), None
         return sys.stdin.read(), None
-    if args.path is None:
+    if raw_path is None:
         raise ValueError("--path is required unless --stdin is used")
-    path = args.path.resolve()
+    return read_saved_path(raw_path, max_bytes=max_bytes, cwd=cwd)
+
+
+def read_saved_path(
+    raw_path: Path,
+    *,
+    max_bytes: int | None = None,
+    cwd: Path | None = None,
+) -> tuple[str, str]:
+    path = (raw_path if cwd is None else cwd / raw_path).resolve()
     if path.suffix != ".json":
         raise ValueError(f"saved plan path must use a .json suffix: {path}")
     if not path.exists():
         raise ValueError(f"plan file path does not exist: {path}")
     if not path.is_file():
         raise ValueError(f"plan file path is not a file: {path}")
+    if max_bytes is not None:
+        return read_limited_text(path, max_bytes=max_bytes), str(path)
     return path.read_text(encoding="utf-8"), str(path)
 
 
@@ -48,28 +213,242 @@ def empty_result(*, path: str | None) -> dict[str, object]:
     return {
         "ok": False,
         "path": path,
+        "schema": None,
         "plan_id": None,
+        "max_parallel": None,
         "phase": None,
         "current_task_id": None,
+        "current_task_ids": [],
         "next_task_id": None,
         "task_ids": [],
+        "ready_task_ids": [],
+        "ready_queue": [],
+        "content_hash": None,
+        "spec_fingerprint": None,
+        "state_fingerprint": None,
+        "journal_entries": 0,
         "tail_present": False,
         "migration_required": False,
+        "summary": False,
         "contract": None,
         "errors": [],
     }
 
 
-def build_result(args: argparse.Namespace) -> tuple[dict[str, Any], int]:
+def build_result(
+    args: argparse.Namespace,
+    raw_path: Path | None = None,
+    *,
+    limits: StreamLimits | None = None,
+    parse: Callable[[str], ContractParseResult] | None = None,
+    cwd: Path | None = None,
+) -> tuple[dict[str, Any], int]:
+    """Build one plan's payload.
+
+    `parse` replaces the cache and server chain, which is how the server itself runs the
+    reader; `cwd` resolves relative `--path` values for a client in another directory.
+    """
+    if limits is None:
+        limits = stream_limits(max_bytes=args.max_bytes, max_depth=args.max_depth)
     try:
-        raw_text, path = read_input(args)
+        with timed_stage("read"):
+            raw_text, path = read_input(
+                args,
+                raw_path,
+                max_bytes=limits.max_bytes if args.stream else None,
+                cwd=cwd,
+            )
     except ValueError as err:
-        result = empty_result(path=None)
+        # In --ndjson batches the path is what ties an error line back to its plan.
+        failed_path = str(raw_path) if args.ndjson and raw_path is not None else None
+        result = empty_result(path=failed_path)
         result["errors"] = [str(err)]
-        return result, 2
+        return project_result(result, args.fields), 2
+
+    if args.summary:
+        with timed_stage("summary"):
+            summary = summarize_contract(raw_text, path, fields=args.fields)
+        if summary is not None:
+            return project_result(summary, args.fields), 0
+    if parse is not None:
+        return read_contract(raw_text, path, parse=parse, fields=args.fields)
+    return read_saved_contract(
+        raw_text,
+        path,
+        fields=args.fields,
+        cache=None if args.stream else open_contract_cache(enabled=not args.no_cache),
+        limits=limits if args.stream else None,
+    )
+
+
+def read_saved_contract(
+    raw_text: str,
+    path: str | None,
+    *,
+    fields: frozenset[str] | None,
+    cache: ContractCache | None,
+    limits: StreamLimits | None,
+) -> tuple[dict[str, Any], int]:
+    """Read through the on-disk cache, then the server's `read` method, then in-process.
+
+    A cache hit builds the payload locally, since loading a marshal entry beats a socket
+    round trip. Otherwise the server parses, replays the journal, and builds the payload in
+    one request, and only when it does not answer is the plan parsed here.
+    """
+    cached = load_cached_parse(raw_text, from_saved_file=True, cache=cache)
+    if cached is not None:
+        return read_contract(raw_text, path, parse=lambda _: cached, fields=fields)
+    served = read_through_server(raw_text, path, fields=fields, limits=limits)
+    if served is not None:
+        return served
+    parse = partial(
+        parse_contract_text_cached,
+        from_saved_file=True,
+        cache=cache,
+        server=False,
+        limits=limits,
+    )
+    return read_contract(raw_text, path, parse=parse, fields=fields)
+
+
+def read_through_server(
+    raw_text: str,
+    path: str | None,
+    *,
+    fields: frozenset[str] | None,
+    limits: StreamLimits | None,
+) -> tuple[dict[str, Any], int] | None:
+    if not contract_server_configured():
+        return None
+    params: dict[str, Any] = {"text": raw_text, "validator_version": validator_version()}
+    if path is not None:
+        params["path"] = path
+    if fields is not None:
+        params["fields"] = sorted(fields)
+    if limits is not None:
+        params.update(limit_params(limits))
+    with timed_stage("server"):
+        served = request_contract_server("read", params)
+    if not isinstance(served, dict):
+        return None
+    payload, exit_code = served.get("payload"), served.get("exit_code")
+    if not isinstance(payload, dict) or exit_code not in (0, 2):
+        return None
+    return payload, exit_code
+
+
+def summarize_contract(
+    raw_text: str,
+    path: str | None,
+    *,
+    fields: frozenset[str] | None,
+) -> dict[str, Any] | None:
+    """Build a state-only payload from a canonical saved plan, or None to read it in full.
+
+    Spec-derived fields stay empty because spec is only checked to be JSON, never
+    validated; `summary` marks the payload so callers can tell it apart from a validated
+    read. State fields still go
+    through the state normalizers, and task references are checked against the spec's
+    task ids; anything they reject is left to the full read to report.
+    """
+    if path is not None and read_journal_text(Path(path)):
+        return None
+    decoded = decode_canonical_state(raw_text)
+    if decoded is None:
+        return None
+    schema, plan_id, state = decoded
+    expected_keys = PARALLEL_STATE_KEYS if schema == PARALLEL_SCHEMA else STATE_KEYS
+    if schema not in SCHEMAS or set(state) != expected_keys:
+        return None
+    normalized = normalize_summary_state(state, parallel=schema == PARALLEL_SCHEMA)
+    if normalized is None:
+        return None
+    phase, current_task_ids, next_task_id = normalized
+    task_ids = canonical_task_ids(raw_text)
+    if task_ids is None or not task_ids.issuperset(current_task_ids):
+        return None
+    if next_task_id is not None and next_task_id not in task_ids:
+        return None
+
+    result = empty_result(path=path)
+    result["ok"] = True
+    result["summary"] = True
+    result["schema"] = schema
+    result["plan_id"] = plan_id
+    result["phase"] = phase
+    result["current_task_ids"] = current_task_ids
+    result["current_task_id"] = current_task_ids[0] if len(current_task_ids) == 1 else None
+    result["next_task_id"] = next_task_id
+    if fields is None or "content_hash" in fields:
+        result["content_hash"] = content_hash(raw_text)
+    if fields is None or "state_fingerprint" in fields:
+        result["state_fingerprint"] = section_fingerprint(state)
+    return result
+
+
+def normalize_summary_state(
+    state: dict[str, Any],
+    *,
+    parallel: bool,
+) -> tuple[str, list[str], str | None] | None:
+    """Run the state field normalizers and return phase, lanes, and next task, or None."""
+    errors: list[str] = []
+    phase = normalize_string(state["phase"], "state.phase", errors)
+    if parallel:
+        current_task_ids = normalize_string_list(
+            state["current_task_ids"], "state.current_task_ids", errors, allow_empty=True
+        )
+    else:
+        current_task_id = normalize_optional_string(
+            state["current_task_id"], "state.current_task_id", errors
+        )
+        current_task_ids = [] if current_task_id is None else [current_task_id]
+    next_task_id = normalize_optional_string(state["next_task_id"], "state.next_task_id", errors)
+    normalize_string_list(state["blockers"], "state.blockers", errors, allow_empty=True)
+    normalize_string_list(state["evidence"], "state.evidence", errors, allow_empty=True)
+    normalize_string(state["last_updated"], "state.last_updated", errors)
+    normalize_optional_string(state["replan_reason"], "state.replan_reason", errors)
+    normalize_freeform_object(state["context_snapshot"], "state.context_snapshot", errors)
+    if errors or phase not in PHASES or current_task_ids is None:
+        return None
+    if len(set(current_task_ids)) != len(current_task_ids):
+        return None
+    return phase, current_task_ids, next_task_id
+
+
+def project_result(result: dict[str, Any], fields: frozenset[str] | None) -> dict[str, Any]:
+    if fields is None:
+        return result
+    return {field: value for field, value in result.items() if field in fields}
+
+
+def read_contract(
+    raw_text: str,
+    path: str | None,
+    *,
+    parse: Callable[[str], ContractParseResult],
+    fields: frozenset[str] | None = None,
+) -> tuple[dict[str, Any], int]:
+    """Build the reader payload for saved-file text, replaying any journal next to `path`.
+
+    `fields` limits the payload to those keys and skips computing the costly ones, such as
+    the ranked ready queue and the fingerprints, when they were not asked for.
+    """
+    payload, exit_code = build_payload(raw_text, path, parse=parse, fields=fields)
+    return project_result(payload, fields), exit_code
+
 
+def build_payload(
+    raw_text: str,
+    path: str | None,
+    *,
+    parse: Callable[[str], ContractParseResult],
+    fields: frozenset[str] | None,
+) -> tuple[dict[str, Any], int]:
     result = empty_result(path=path)
-    parsed = parse_contract_text(raw_text, from_saved_file=True)
+    journal_text = read_journal_text(Path(path)) if path is not None else ""
+    result["content_hash"] = effective_hash(raw_text, journal_text)
+    parsed = parse(raw_text)
     result["tail_present"] = bool(parsed.tail.strip())
     result["migration_required"] = parsed.migration_required
     if not parsed.ok or parsed.contract is None:
@@ -77,24 +456,85 @@ def build_result(args: argparse.Namespace) -> tuple[dict[str, Any], int]:
         return result, 2
 
     contract = parsed.contract
+    graph = PlanGraph(contract["spec"]["tasks"])
+    if journal_text:
+        with timed_stage("journal"):
+            transitions, errors = parse_journal(journal_text, content_hash(raw_text))
+            if not errors:
+                errors = replay_journal(contract, transitions, graph=graph)
+        if errors:
+            result["errors"] = errors
+            return result, 2
+        result["journal_entries"] = len(transitions)
+
     spec = contract["spec"]
     state = contract["state"]
     result["ok"] = True
+    result["schema"] = spec["schema"]
     result["plan_id"] = spec["plan_id"]
+    result["max_parallel"] = spec.get("max_parallel", 1)
     result["phase"] = state["phase"]
-    result["current_task_id"] = state["current_task_id"]
+    current_task_ids = current_lanes(state)
+    result["current_task_ids"] = current_task_ids
+    # A single active lane still reports through the plan/1 field for existing consumers.
+    result["current_task_id"] = current_task_ids[0] if len(current_task_ids) == 1 else None
     result["next_task_id"] = state["next_task_id"]
-    result["task_ids"] = [task["id"] for task in spec["tasks"]]
+    result["task_ids"] = list(graph.task_by_id)
+    result["ready_task_ids"] = graph.ready_ids()
+    if fields is None or "ready_queue" in fields:
+        with timed_stage("schedule"):
+            result["ready_queue"] = ranked_ready_queue(graph)
+    if fields is None or not fields.isdisjoint(FINGERPRINT_FIELDS):
+        with timed_stage("fingerprint"):
+            result.update(contract_fingerprints(contract))
     result["contract"] = contract
     return result, 0
 
 
+def write_payload(
+    payload: dict[str, Any],
+    *,
+    compact: bool,
+    write: Callable[[str], Any],
+) -> None:
+    with timed_stage("write"):
+        if compact:
+            write(json.dumps(payload, sort_keys=True, separators=(",", ":")))
+        else:
+            write(json.dumps(payload, indent=2, sort_keys=True))
+        write("\n")
+
+
+def read_plans(
+    args: argparse.Namespace,
+    *,
+    limits: StreamLimits | None = None,
+    parse: Callable[[str], ContractParseResult] | None = None,
+    cwd: Path | None = None,
+    write: Callable[[str], Any] | None = None,
+) -> int:
+    """Write one payload per plan and return the worst exit code.
+
+    The server passes its own `parse`, `cwd`, `write`, and `limits` to run a client's
+    command line; a local run uses the cache and server chain and writes to stdout.
+    """
+    write = write or sys.stdout.write
+    exit_code = 0
+    for raw_path in args.path or [None]:
+        payload, path_exit_code = build_result(
+            args, raw_path, limits=limits, parse=parse, cwd=cwd
+        )
+        write_payload(payload, compact=args.compact or args.ndjson, write=write)
+        exit_code = max(exit_code, path_exit_code)
+        if args.stdin:
+            break
+    return exit_code
+
+
 def main() -> int:
     args = parse_args()
-    payload, exit_code = build_result(args)
-    json.dump(payload, sys.stdout, indent=2, sort_keys=True)
-    sys.stdout.write("\n")
-    return exit_code
+    with instrumented(timings="-" if args.timings else None, profile=args.profile):
+        return read_plans(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Apply one runtime state transition to a saved plan/1 contract."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+from typing import Any
+
+from plan_contract import (
+    ContractParseResult,
+    PlanGraph,
+    StaleContractError,
+    content_hash,
+    contract_fingerprints,
+    open_contract_cache,
+    parse_contract_text_cached,
+    plan_write_lock,
+    replace_contract_file,
+    section_fingerprint,
+    serialize_contract,
+    validate_state,
+)
+from plan_journal import (
+    append_journal_entry,
+    effective_hash,
+    parse_journal,
+    read_journal_text,
+    replay_journal,
+    trim_torn_entry,
+)
+from plan_transitions import TRANSITIONS, apply_transition, current_lanes, utc_timestamp
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Apply one runtime state transition to a saved plan/1 contract."
+    )
+    parser.add_argument("--path", type=Path, required=True, help="Saved plan file to update.")
+    parser.add_argument(
+        "--kind",
+        required=True,
+        choices=sorted(TRANSITIONS),
+        help="; ".join(f"{kind}: {phases}" for kind, phases in sorted(TRANSITIONS.items())),
+    )
+    parser.add_argument(
+        "--task-id",
+        help=(
+            "Task to transition. Defaults to state.next_task_id for start and to the only "
+            "active lane otherwise."
+        ),
+    )
+    parser.add_argument("--next-task-id", help="Replacement value for state.next_task_id.")
+    parser.add_argument(
+        "--blocker",
+        action="append",
+        default=[],
+        help="Blocker reason to append. Repeat for several reasons.",
+    )
+    parser.add_argument(
+        "--evidence",
+        action="append",
+        default=[],
+        help="Evidence entry to append. Repeat for several entries.",
+    )
+    parser.add_argument("--replan-reason", help="Replan reason for the replan transition.")
+    parser.add_argument(
+        "--last-updated",
+        help="Timestamp for state.last_updated. Defaults to the current UTC time.",
+    )
+    parser.add_argument(
+        "--context-snapshot",
+        help="JSON object that replaces state.context_snapshot.",
+    )
+    parser.add_argument(
+        "--spec-fingerprint",
+        help="Fail unless the saved spec still matches this fingerprint from a previous read.",
+    )
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help=(
+            "Append the transition to the <plan>.jsonl journal instead of rewriting the plan. "
+            "Implied while a journal already exists."
+        ),
+    )
+    parser.add_argument(
+        "--expect-hash",
+        help="Fail unless the saved file still has this content hash from a previous read.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the content-hash cache of parsed plan/1 contracts.",
+    )
+    return parser.parse_args()
+
+
+def build_transition(args: argparse.Namespace) -> dict[str, Any]:
+    transition: dict[str, Any] = {
+        "kind": args.kind,
+        "task_id": args.task_id,
+        "next_task_id": args.next_task_id,
+        "blockers": args.blocker,
+        "evidence": args.evidence,
+        "replan_reason": args.replan_reason,
+        "last_updated": args.last_updated,
+    }
+    if args.context_snapshot is not None:
+        try:
+            transition["context_snapshot"] = json.loads(args.context_snapshot)
+        except json.JSONDecodeError as err:
+            raise ValueError(f"--context-snapshot is not valid JSON: {err}") from err
+    return transition
+
+
+def empty_result(*, path: str | None) -> dict[str, Any]:
+    return {
+        "ok": False,
+        "path": path,
+        "phase": None,
+        "current_task_ids": [],
+        "next_task_id": None,
+        "content_hash": None,
+        "spec_fingerprint": None,
+        "state_fingerprint": None,
+        "stale": False,
+        "errors": [],
+    }
+
+
+def build_result(args: argparse.Namespace) -> tuple[dict[str, Any], int]:
+    path = args.path.resolve()
+    result = empty_result(path=str(path))
+    try:
+        if path.suffix != ".json":
+            raise ValueError(f"saved plan path must use a .json suffix: {path}")
+        transition = build_transition(args)
+        with plan_write_lock(path):
+            return transition_locked(args, path, transition, result)
+    except StaleContractError as err:
+        result["stale"] = True
+        result["errors"] = [str(err)]
+        return result, 2
+    except (OSError, ValueError) as err:
+        result["errors"] = [str(err)]
+        return result, 2
+
+
+def state_errors(contract: dict[str, Any], graph: PlanGraph) -> list[str]:
+    spec = contract["spec"]
+    errors: list[str] = []
+    validate_state(
+        contract["state"],
+        spec["tasks"],
+        errors,
+        schema=spec["schema"],
+        max_parallel=spec.get("max_parallel", 1),
+        graph=graph,
+        prenormalized=True,
+    )
+    return errors
+
+
+def transition_locked(
+    args: argparse.Namespace,
+    path: Path,
+    transition: dict[str, Any],
+    result: dict[str, Any],
+) -> tuple[dict[str, Any], int]:
+    raw_text = path.read_text(encoding="utf-8")
+    journal_text = read_journal_text(path)
+    current_hash = effective_hash(raw_text, journal_text)
+    if args.expect_hash is not None and args.expect_hash != current_hash:
+        raise StaleContractError(
+            f"plan file changed since it was read: expected {args.expect_hash}, "
+            f"found {current_hash}"
+        )
+    journal_text = trim_torn_entry(path, journal_text)
+    use_journal = args.journal or bool(journal_text)
+    snapshot_hash = content_hash(raw_text)
+    cache = open_contract_cache(enabled=not args.no_cache)
+    parsed = parse_contract_text_cached(raw_text, from_saved_file=True, cache=cache)
+    if not parsed.ok or parsed.contract is None:
+        result["errors"] = parsed.errors
+        return result, 2
+    contract = parsed.contract
+    graph = PlanGraph(contract["spec"]["tasks"])
+    transitions, errors = parse_journal(journal_text, snapshot_hash)
+    if not errors:
+        errors = replay_journal(contract, transitions, graph=graph)
+    if errors:
+        result["errors"] = errors
+        return result, 2
+    if args.spec_fingerprint is not None:
+        spec_fingerprint = section_fingerprint(contract["spec"])
+        if args.spec_fingerprint != spec_fingerprint:
+            result["spec_fingerprint"] = spec_fingerprint
+            result["errors"] = [
+                "saved spec no longer matches --spec-fingerprint; re-read the plan"
+            ]
+            return result, 2
+
+    # Pin the timestamp so replaying the journal reproduces the same state.
+    transition["last_updated"] = transition.get("last_updated") or utc_timestamp()
+    errors = apply_transition(contract, transition, graph=graph)
+    if not errors:
+        # The delta checks cover what the transition touched; the full state validator
+        # runs before anything is written, so a state it rejects is never persisted.
+        errors = state_errors(contract, graph)
+    if errors:
+        result["errors"] = errors
+        return result, 2
+
+    if use_journal:
+        appended = append_journal_entry(path, snapshot_hash, transition)
+        result["content_hash"] = effective_hash(raw_text, journal_text + appended)
+    else:
+        rendered = serialize_contract(contract)
+        result["content_hash"] = replace_contract_file(
+            path,
+            rendered,
+            expected_hash=current_hash,
+        )
+        if cache is not None:
+            # The state passed validate_state above, so this seeds a validated contract.
+            cache.store(
+                cache.key(rendered, from_saved_file=True),
+                ContractParseResult(
+                    ok=True,
+                    contract=contract,
+                    tail="",
+                    errors=[],
+                    migration_required=False,
+                ),
+            )
+
+    state = contract["state"]
+    result["ok"] = True
+    # Task statuses live in spec, so hand back the fingerprint the next call should present.
+    result.update(contract_fingerprints(contract))
+    result["phase"] = state["phase"]
+    result["current_task_ids"] = current_lanes(state)
+    result["next_task_id"] = state["next_task_id"]
+    return result, 0
+
+
+def main() -> int:
+    args = parse_args()
+    payload, exit_code = build_result(args)
+    json.dump(payload, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,7 +6,15 @@ import argparse
 import sys
 from pathlib import Path
 
-from plan_contract import parse_contract_text, render_contract_json
+from plan_contract import (
+    instrumented,
+    open_contract_cache,
+    parse_contract_text_cached,
+    read_limited_text,
+    render_parse_result,
+    stream_limits,
+    timed_stage,
+)
 
 
 def require_json_artifact_path(path: Path) -> Path:
@@ -25,31 +33,93 @@ def parse_args() -> argparse.Namespace:
         type=Path,
         help="Optional plan file to read. If omitted, read raw input from stdin.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the content-hash cache of parsed plan/1 contracts.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Run a lower-copy full parse under byte and nesting caps. Nothing is parsed "
+            "incrementally: the input is read and decoded whole before the contract is "
+            "validated, and only the second copy of tasks is skipped. Bypasses the cache; "
+            "a plan-contract server applies the same caps."
+        ),
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        help="Byte cap for --stream. Implies --stream. Defaults to $PLAN_CONTRACT_MAX_BYTES or 256 MiB.",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="Nesting cap for --stream. Implies --stream. Defaults to $PLAN_CONTRACT_MAX_DEPTH or 256.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help=(
+            "Report per-stage wall and CPU seconds as one JSON line on stderr. "
+            "$PLAN_CONTRACT_TIMINGS=<file> appends them to a file instead."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help=(
+            "Write cProfile statistics and the tracemalloc peak to PATH, or - for stderr. "
+            "Defaults to $PLAN_CONTRACT_PROFILE."
+        ),
+    )
+    args = parser.parse_args()
+    for flag, value in (("--max-bytes", args.max_bytes), ("--max-depth", args.max_depth)):
+        if value is not None and value < 1:
+            parser.error(f"{flag} must be a positive integer")
+    args.stream = args.stream or args.max_bytes is not None or args.max_depth is not None
+    return args
 
 
-def read_input(args: argparse.Namespace) -> str:
-    if args.path is None:
+def read_input(args: argparse.Namespace, *, max_bytes: int | None = None) -> str:
+    path = None if args.path is None else require_json_artifact_path(args.path)
+    if max_bytes is not None:
+        return read_limited_text(path, max_bytes=max_bytes)
+    if path is None:
         return sys.stdin.read()
-    path = require_json_artifact_path(args.path)
     return path.read_text(encoding="utf-8")
 
 
-def main() -> int:
-    args = parse_args()
+def format_contract(args: argparse.Namespace) -> int:
+    limits = stream_limits(max_bytes=args.max_bytes, max_depth=args.max_depth)
     try:
-        raw_text = read_input(args)
+        with timed_stage("read"):
+            raw_text = read_input(args, max_bytes=limits.max_bytes if args.stream else None)
     except (OSError, ValueError) as err:
         print(f"plan/1 invalid: {err}", file=sys.stderr)
         return 2
-    result = parse_contract_text(raw_text, from_saved_file=args.path is not None)
+    result = parse_contract_text_cached(
+        raw_text,
+        from_saved_file=args.path is not None,
+        cache=None if args.stream else open_contract_cache(enabled=not args.no_cache),
+        limits=limits if args.stream else None,
+    )
     if not result.ok or result.contract is None:
         for error in result.errors:
             print(f"plan/1 invalid: {error}", file=sys.stderr)
         return 2
-    sys.stdout.write(render_contract_json(result.contract))
+    rendered = render_parse_result(result)
+    with timed_stage("write"):
+        sys.stdout.write(rendered)
     return 0
 
 
+def main() -> int:
+    args = parse_args()
+    with instrumented(timings="-" if args.timings else None, profile=args.profile):
+        return format_contract(args)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
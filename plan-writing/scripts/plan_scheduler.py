@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Rank executable plan/1 tasks by their longest remaining downstream path."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+from typing import Any
+
+from plan_contract import PlanGraph, parse_contract_text
+
+
+TERMINAL_STATUSES = {"done", "cancelled"}
+
+
+def critical_path_lengths(graph: PlanGraph) -> dict[str, int]:
+    """Return, per task, the number of unfinished tasks on the longest chain it starts.
+
+    Terminal tasks weigh nothing, so a finished prefix does not inflate the rank of the
+    work that still depends on it. Cyclic tasks are absent from the topological order and
+    rank as zero; validated contracts never contain cycles.
+    """
+    order, _ = graph.topological_order()
+    lengths = dict.fromkeys(graph.task_by_id, 0)
+    for task_id in reversed(order):
+        downstream = max(
+            (lengths[dependent] for dependent in graph.dependents_of(task_id)),
+            default=0,
+        )
+        weight = 0 if graph.status(task_id) in TERMINAL_STATUSES else 1
+        lengths[task_id] = weight + downstream
+    return lengths
+
+
+def ranked_ready_queue(graph: PlanGraph) -> list[dict[str, Any]]:
+    """Return executable pending tasks, longest remaining path first, ties broken by id."""
+    lengths = critical_path_lengths(graph)
+    ranked = sorted(graph.ready, key=lambda task_id: (-lengths[task_id], task_id))
+    return [{"id": task_id, "critical_path": lengths[task_id]} for task_id in ranked]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Print the critical-path ranked ready queue of a plan/1 contract."
+    )
+    parser.add_argument(
+        "--path",
+        type=Path,
+        help="Optional plan file to rank. If omitted, read raw input from stdin.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        raw_text = sys.stdin.read() if args.path is None else args.path.read_text(encoding="utf-8")
+    except OSError as err:
+        print(f"plan/1 invalid: {err}", file=sys.stderr)
+        return 2
+    result = parse_contract_text(raw_text, from_saved_file=args.path is not None)
+    if not result.ok or result.contract is None:
+        for error in result.errors:
+            print(f"plan/1 invalid: {error}", file=sys.stderr)
+        return 2
+    queue = ranked_ready_queue(PlanGraph(result.contract["spec"]["tasks"]))
+    json.dump(queue, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,10 +3,23 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import glob
+import json
+import os
 import sys
+import time
 from pathlib import Path
+from typing import Any, Iterator
 
-from plan_contract import parse_contract_text
+from plan_contract import (
+    ContractCache,
+    instrumented,
+    open_contract_cache,
+    parse_contract_text_cached,
+    timed_stage,
+)
 
 
 def require_json_artifact_path(path: Path) -> Path:
@@ -25,7 +38,49 @@ def parse_args() -> argparse.Namespace:
         type=Path,
         help="Optional plan file to validate. If omitted, read input from stdin.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        metavar="PATH_OR_GLOB",
+        help=(
+            "Validate many saved plan files in one batch and emit one JSONL result per "
+            "file. Glob patterns such as 'docs/plans/*.json' are expanded."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for batch mode. Defaults to the CPU count.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the content-hash cache of parsed plan/1 contracts.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help=(
+            "Report per-stage wall and CPU seconds as one JSON line on stderr; batch mode "
+            "times only in-process work, so add --jobs 1 to include every file. "
+            "$PLAN_CONTRACT_TIMINGS=<file> appends them to a file instead."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help=(
+            "Write cProfile statistics and the tracemalloc peak to PATH, or - for stderr. "
+            "Defaults to $PLAN_CONTRACT_PROFILE."
+        ),
+    )
+    args = parser.parse_args()
+    if args.path is not None and args.targets:
+        parser.error("--path cannot be combined with batch PATH_OR_GLOB targets")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be a positive integer")
+    return args
 
 
 def read_input(args: argparse.Namespace) -> tuple[str, bool]:
@@ -35,14 +90,89 @@ def read_input(args: argparse.Namespace) -> tuple[str, bool]:
     return path.read_text(encoding="utf-8"), True
 
 
-def main() -> int:
-    args = parse_args()
+def expand_targets(targets: list[str]) -> list[str]:
+    paths: list[str] = []
+    seen: set[str] = set()
+    for target in targets:
+        if glob.has_magic(target):
+            matches = sorted(glob.glob(target, recursive=True))
+            if not matches:
+                # Keep the unmatched pattern so it reports as a failed result.
+                matches = [target]
+        else:
+            matches = [target]
+        for match in matches:
+            if match in seen:
+                continue
+            seen.add(match)
+            paths.append(match)
+    return paths
+
+
+def validate_saved_path(target: str, cache: ContractCache | None) -> dict[str, Any]:
+    started = time.perf_counter()
+    result: dict[str, Any] = {"path": target, "ok": False, "errors": []}
     try:
-        raw_text, from_saved_file = read_input(args)
+        path = require_json_artifact_path(Path(target))
+        result["path"] = str(path)
+        with timed_stage("read"):
+            raw_text = path.read_text(encoding="utf-8")
+    except (OSError, ValueError) as err:
+        result["errors"] = [str(err)]
+    else:
+        parsed = parse_contract_text_cached(raw_text, from_saved_file=True, cache=cache)
+        result["ok"] = parsed.ok
+        result["errors"] = parsed.errors
+    result["elapsed"] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def iter_batch_results(
+    paths: list[str],
+    jobs: int | None,
+    cache: ContractCache | None,
+) -> Iterator[dict[str, Any]]:
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        for path in paths:
+            yield validate_saved_path(path, cache)
+        return
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            partial(validate_saved_path, cache=cache),
+            paths,
+            chunksize=chunksize,
+        )
+
+
+def run_batch(args: argparse.Namespace, cache: ContractCache | None) -> int:
+    paths = expand_targets(args.targets)
+    exit_code = 0
+    for result in iter_batch_results(paths, args.jobs, cache):
+        if not result["ok"]:
+            exit_code = 2
+        sys.stdout.write(json.dumps(result, sort_keys=True))
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+    return exit_code
+
+
+def validate_contract(args: argparse.Namespace) -> int:
+    cache = open_contract_cache(enabled=not args.no_cache)
+    if args.targets:
+        return run_batch(args, cache)
+    try:
+        with timed_stage("read"):
+            raw_text, from_saved_file = read_input(args)
     except (OSError, ValueError) as err:
         print(f"plan/1 invalid: {err}", file=sys.stderr)
         return 2
-    result = parse_contract_text(raw_text, from_saved_file=from_saved_file)
+    result = parse_contract_text_cached(
+        raw_text,
+        from_saved_file=from_saved_file,
+        cache=cache,
+    )
     if not result.ok:
         for error in result.errors:
             print(f"plan/1 invalid: {error}", file=sys.stderr)
@@ -51,5 +181,11 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    args = parse_args()
+    with instrumented(timings="-" if args.timings else None, profile=args.profile):
+        return validate_contract(args)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Normalize a plan/1 contract and atomically compare-and-swap it into a saved plan file."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+from typing import Any
+
+from plan_contract import (
+    JournalPendingError,
+    StaleContractError,
+    open_contract_cache,
+    parse_contract_text_cached,
+    serialize_contract,
+    write_contract_file,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Validate raw plan/1 JSON from stdin and atomically write its canonical form to a "
+            "saved plan file under an advisory lock."
+        )
+    )
+    parser.add_argument("--path", type=Path, required=True, help="Saved plan file to write.")
+    parser.add_argument(
+        "--expect-hash",
+        help=(
+            "Content hash of the saved file as last read (the reader's content_hash). "
+            "Omit only when creating a new plan file."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the content-hash cache of parsed plan/1 contracts.",
+    )
+    return parser.parse_args()
+
+
+def empty_result(*, path: str) -> dict[str, Any]:
+    return {
+        "ok": False,
+        "path": path,
+        "content_hash": None,
+        "stale": False,
+        "errors": [],
+    }
+
+
+def build_result(args: argparse.Namespace) -> tuple[dict[str, Any], int]:
+    path = args.path.resolve()
+    result = empty_result(path=str(path))
+    if path.suffix != ".json":
+        result["errors"] = [f"saved plan path must use a .json suffix: {path}"]
+        return result, 2
+
+    parsed = parse_contract_text_cached(
+        sys.stdin.read(),
+        from_saved_file=False,
+        cache=open_contract_cache(enabled=not args.no_cache),
+    )
+    if not parsed.ok or parsed.contract is None:
+        result["errors"] = parsed.errors
+        return result, 2
+
+    try:
+        if args.expect_hash is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        result["content_hash"] = write_contract_file(
+            path,
+            serialize_contract(parsed.contract),
+            expected_hash=args.expect_hash,
+        )
+    except StaleContractError as err:
+        result["stale"] = True
+        result["errors"] = [str(err)]
+        return result, 2
+    except JournalPendingError as err:
+        result["errors"] = [str(err)]
+        return result, 2
+    except OSError as err:
+        result["errors"] = [f"failed to write plan file {path}: {err}"]
+        return result, 2
+    result["ok"] = True
+    return result, 0
+
+
+def main() -> int:
+    args = parse_args()
+    payload, exit_code = build_result(args)
+    json.dump(payload, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())